@@ -0,0 +1,32 @@
+import time
+
+from pyui.text import TextStore
+from pyui.text.highlight import Highlighter, PythonLexer
+from pyui.helpers import Position
+
+LINE_COUNT = 50000
+KEYSTROKES = 1000
+
+
+def make_store() -> TextStore:
+    store = TextStore()
+    store.lines = [list(f"    value_{number} = compute({number}, 'text')  # note") for number in range(LINE_COUNT)]
+    return store
+
+
+if __name__ == "__main__":
+    store = make_store()
+    highlighter = Highlighter(PythonLexer())
+    start = time.perf_counter()
+    highlighter.state_at(store, LINE_COUNT)
+    print(f"lexed {LINE_COUNT} lines in {(time.perf_counter() - start) * 1000:.1f}ms")
+    slowest = 0.0
+    start = time.perf_counter()
+    for keystroke in range(KEYSTROKES):
+        typed = time.perf_counter()
+        store.cursor = Position(4, (keystroke * 37) % LINE_COUNT)
+        store.insert_char('"' if keystroke % 2 == 0 else "x")
+        highlighter.edited(store, store.cursor.y)
+        slowest = max(slowest, time.perf_counter() - typed)
+    average = (time.perf_counter() - start) * 1000 / KEYSTROKES
+    print(f"keystroke: {average:.3f}ms on average, {slowest * 1000:.3f}ms at most")
@@ -0,0 +1,26 @@
+import timeit
+import pygame
+from dataclasses import replace
+
+from pyui.widgets.nine_patch import NinePatchData, NinePatchPieces
+from pyui.helpers import Size
+
+SIZES = [Size(32, 32), Size(128, 64), Size(400, 300), Size(1024, 768)]
+REPEATS = 200
+
+
+def time_compose(pieces: NinePatchPieces, size: Size) -> float:
+    """Average milliseconds to draw the nine patch at the size, without the cache."""
+    return timeit.timeit(lambda: pieces.compose(size), number=REPEATS) * 1000 / REPEATS
+
+
+if __name__ == "__main__":
+    pygame.init()
+    # images are converted for the display, so it needs a mode
+    pygame.display.set_mode((1, 1))
+    data = NinePatchData.from_json("frame.json")
+    scaled = NinePatchPieces(data)
+    tiled = NinePatchPieces(replace(data, tile=True))
+    print(f"{'size':>12} {'scale ms':>10} {'tile ms':>10}")
+    for size in SIZES:
+        print(f"{str(size.as_tuple):>12} {time_compose(scaled, size):>10.3f} {time_compose(tiled, size):>10.3f}")
@@ -1,6 +1,7 @@
 from pyui.window import Window
 from pyui.widgets import VBox, MenuBar, Spacer, TextEditor
 from pyui.helpers import Size, Expand
+from pyui.text import PythonLexer
 
 
 if __name__ == "__main__":
@@ -13,7 +14,7 @@ if __name__ == "__main__":
     menu.add_child(Spacer(expand=Expand.HORIZONTAL))
     menu.add_menu("Help")
 
-    text_editor = TextEditor(expand=Expand.BOTH)
+    text_editor = TextEditor(expand=Expand.BOTH, lexer=PythonLexer())
 
     box = VBox(expand=Expand.BOTH)
     box.add_child(menu)
@@ -0,0 +1,82 @@
+import io
+import json
+import mmap
+import struct
+import argparse
+from pathlib import Path
+
+# the asset folders that are packed, everything in them is included
+ASSET_KINDS = ("images", "icons", "nine_patch", "fonts")
+MAGIC = b"PYUIPAK1"
+# the magic and the length of the json index that follows it
+HEADER = struct.Struct("<8sI")
+
+
+class AssetArchive:
+    """
+    All the assets packed into a single file by pack_assets, memory mapped so
+    entries are read straight from memory instead of opening a file for each.
+    The index maps "kind/name" to the offset and length of the entry data.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.map.close()
+            raise ValueError(f"'{path}' is not an asset archive.")
+        self.index = json.loads(self.map[HEADER.size:HEADER.size + index_size])
+        self.data_start = HEADER.size + index_size
+
+    def contains(self, kind: str, name: str) -> bool:
+        return f"{kind}/{name}" in self.index
+
+    def names(self, kind: str) -> list:
+        prefix = f"{kind}/"
+        return [key[len(prefix):] for key in self.index if key.startswith(prefix)]
+
+    def read(self, kind: str, name: str) -> bytes:
+        offset, size = self.index[f"{kind}/{name}"]
+        start = self.data_start + offset
+        return self.map[start:start + size]
+
+    def open(self, kind: str, name: str) -> io.BytesIO:
+        return io.BytesIO(self.read(kind, name))
+
+    def close(self):
+        self.map.close()
+
+
+def pack_assets(folder: Path, archive_path: Path) -> int:
+    """Pack the asset folders into a single archive, returning the number of files packed."""
+    entries = []
+    for kind in ASSET_KINDS:
+        if (folder / kind).is_dir():
+            entries += [(f"{kind}/{path.name}", path.read_bytes())
+                        for path in sorted((folder / kind).iterdir()) if path.is_file()]
+    index = {}
+    offset = 0
+    for key, data in entries:
+        index[key] = [offset, len(data)]
+        offset += len(data)
+    index_bytes = json.dumps(index).encode("utf-8")
+    with open(archive_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(index_bytes)))
+        file.write(index_bytes)
+        for _, data in entries:
+            file.write(data)
+    return len(entries)
+
+
+def main():
+    from pyui.assets import ASSETS_FOLDER
+    parser = argparse.ArgumentParser(description="Pack the pyui assets into a single archive.")
+    parser.add_argument("archive", type=Path, help="the archive file to write")
+    parser.add_argument("--assets", type=Path, default=ASSETS_FOLDER, help="the assets folder to pack")
+    args = parser.parse_args()
+    count = pack_assets(args.assets, args.archive)
+    print(f"Packed {count} files into {args.archive}")
+
+
+if __name__ == "__main__":
+    main()
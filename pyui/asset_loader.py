@@ -0,0 +1,117 @@
+import time
+import pygame
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict
+
+from pyui.assets import file_cache, asset_source
+
+LOADER_THREADS = 4
+# posted when a file has been decoded, so an idle window wakes up to use it
+ASSET_LOADED = pygame.event.custom_type()
+
+
+class PendingAsset:
+    """
+    An asset that is being loaded. Until it is ready, surface is the placeholder.
+    If loading fails, error is set and the placeholder is kept.
+    """
+    def __init__(self, kind: str, name: str, placeholder: pygame.Surface):
+        self.kind = kind
+        self.name = name
+        self.surface = placeholder
+        self.ready = False
+        self.error = None
+        # seconds spent decoding and converting, 0 if it was already loaded
+        self.load_time = None
+        self.callbacks = []
+
+    def when_ready(self, callback):
+        """Call back with the loaded surface, straight away if it is already loaded."""
+        if self.ready:
+            callback(self.surface)
+        else:
+            self.callbacks.append(callback)
+
+    def finish(self, surface: pygame.Surface, load_time: float = 0.0):
+        self.surface = surface
+        self.load_time = load_time
+        self.ready = True
+        for callback in self.callbacks:
+            callback(surface)
+        self.callbacks = []
+
+
+def decode(source, name: str) -> tuple:
+    """Load the image, returning it and how long it took."""
+    start = time.perf_counter()
+    surface = pygame.image.load(source, name)
+    return surface, time.perf_counter() - start
+
+
+def post_loaded(_):
+    # only once the future is done, so update finds it, and also when decoding failed
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(ASSET_LOADED))
+
+
+class AssetLoader:
+    """
+    Decodes asset files on worker threads. Converting the surfaces for the display
+    and handing them out happens on the main thread, when the window calls update.
+    Loaded assets go into the file cache, where get_image and friends will find them.
+    """
+    def __init__(self, threads: int = LOADER_THREADS):
+        self.threads = threads
+        self.executor = None
+        self.pending: Dict[tuple, tuple] = {}
+
+    def load(self, kind: str, name: str, placeholder: pygame.Surface = None) -> PendingAsset:
+        """Start loading an asset from the folder of that kind, such as images or icons."""
+        if placeholder is None:
+            placeholder = pygame.Surface((1, 1), flags=pygame.SRCALPHA)
+        asset = PendingAsset(kind, name, placeholder)
+        cached = getattr(file_cache, kind).get(name)
+        if cached is not None:
+            asset.finish(cached)
+            return asset
+        if (kind, name) in self.pending:
+            return self.pending[(kind, name)][0]
+        source = asset_source(kind, name, "Asset")
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.threads, thread_name_prefix="pyui-loader")
+        future = self.executor.submit(decode, source, name)
+        future.add_done_callback(post_loaded)
+        self.pending[(kind, name)] = (asset, future)
+        return asset
+
+    def update(self) -> bool:
+        """Hand out the assets that finished loading, returning True if there were any."""
+        finished = [key for key, (_, future) in self.pending.items() if future.done()]
+        for key in finished:
+            asset, future = self.pending.pop(key)
+            if future.exception() is not None:
+                asset.error = future.exception()
+                continue
+            start = time.perf_counter()
+            decoded, decode_time = future.result()
+            surface = decoded.convert_alpha()
+            getattr(file_cache, asset.kind)[asset.name] = surface
+            asset.finish(surface, decode_time + time.perf_counter() - start)
+        return len(finished) > 0
+
+    def wait(self):
+        """Block until everything started has loaded, then hand it out."""
+        wait([future for _, future in self.pending.values()])
+        self.update()
+
+    @property
+    def busy(self) -> bool:
+        return len(self.pending) > 0
+
+
+asset_loader = AssetLoader()
+
+
+def get_image_async(image_name: str, placeholder: pygame.Surface = None) -> PendingAsset:
+    """Start loading an image from the assets folder, see Image.from_pending."""
+    return asset_loader.load("images", image_name, placeholder)
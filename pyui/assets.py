@@ -1,69 +1,262 @@
 import pygame
 from pathlib import Path
 from typing import Dict
+from collections import OrderedDict
 
 from pyui.helpers import Size
+from pyui.glyph_atlas import GlyphAtlas
+from pyui.asset_archive import AssetArchive
 
 
 ASSETS_FOLDER = Path(__file__).parent / "assets"
+# when set by use_archive, assets are read from it instead of ASSETS_FOLDER
+asset_archive = None
+# bytes of rendered text kept for reuse
+DEFAULT_TEXT_CACHE_BUDGET = 8 * 1024 * 1024
+# how many different strings each font remembers the size of
+MAX_MEASURED_TEXTS = 4096
+# bytes of images the file cache may hold on to
+DEFAULT_FILE_CACHE_BUDGET = 64 * 1024 * 1024
+
+
+class TextCache:
+    """
+    Rendered text shared by every widget, so the same string in the same font and
+    color is only rasterized once. The least recently used text is dropped when the
+    surfaces go over the byte budget. Cached surfaces must never be drawn on.
+    """
+    def __init__(self, budget: int = DEFAULT_TEXT_CACHE_BUDGET):
+        self.budget = budget
+        self.surfaces: OrderedDict = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> pygame.Surface:
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.surfaces.move_to_end(key)
+        return surface
+
+    def add(self, key: tuple, surface: pygame.Surface):
+        self.surfaces[key] = surface
+        self.total_bytes += surface.get_pitch() * surface.get_height()
+        # always keep the newest, even if it is larger than the budget
+        while self.total_bytes > self.budget and len(self.surfaces) > 1:
+            _, oldest = self.surfaces.popitem(last=False)
+            self.total_bytes -= oldest.get_pitch() * oldest.get_height()
+
+    def clear(self):
+        self.surfaces = OrderedDict()
+        self.total_bytes = 0
+
+
+text_cache = TextCache()
 
 
 class Font:
     """
     A class that represents a font for rendering text.
     """
-    def __init__(self, font_name: str, size: int = 16):
+    def __init__(self, font_name: str, size: int = 16, use_atlas: bool = False):
         """
         Initialize a Font object.
         Args:
             font_name: Name of the font or path to a font file
             size: Font size in points
+            use_atlas: Draw text from a glyph atlas, for text that changes often
         """
-        from pyui.assets import ASSETS_FOLDER
-        font_path = ASSETS_FOLDER / "fonts" / font_name
-        self.font = pygame.font.Font(str(font_path), size)
+        # pygame reads from the source as it needs, so keep it alive
+        self.source = asset_source("fonts", font_name, "Font")
+        self.font = pygame.font.Font(self.source, size)
+        self.name = font_name
         self.size = size
+        self.height = self.font.get_height()
+        self.measured: OrderedDict = OrderedDict()
+        self.use_atlas = use_atlas
+        self.atlases: Dict[bool, GlyphAtlas] = {}
+
+    def get_atlas(self, antialias: bool = True) -> GlyphAtlas:
+        if antialias not in self.atlases:
+            self.atlases[antialias] = GlyphAtlas(self.font, antialias)
+        return self.atlases[antialias]
 
-    def render(self, text, color=(0, 0, 0)):
-        """Render text using the font."""
-        return self.font.render(text, True, color)
+    def render(self, text, color=(0, 0, 0), antialias: bool = True) -> pygame.Surface:
+        """Render text using the font. The surface is shared, so must not be drawn on."""
+        if self.use_atlas:
+            # cheap enough to not be worth caching
+            return self.get_atlas(antialias).render(text, color)
+        key = (self.name, self.size, text, tuple(color), antialias)
+        surface = text_cache.get(key)
+        if surface is None:
+            surface = self.font.render(text, antialias, color)
+            text_cache.add(key, surface)
+        return surface
     
     def size_of(self, text) -> Size:
         """Get the size of rendered text."""
-        pygame_size = self.font.size(text)
-        return Size(pygame_size[0], pygame_size[1])
+        if self.use_atlas:
+            return self.get_atlas().size_of(text)
+        if len(text) == 0:
+            return Size(0, self.height)
+        size = self.measured.get(text)
+        if size is None:
+            size = Size(*self.font.size(text))
+            self.measured[text] = size
+            if len(self.measured) > MAX_MEASURED_TEXTS:
+                self.measured.popitem(last=False)
+        else:
+            self.measured.move_to_end(text)
+        # callers are free to change the size they get back
+        return size.copy()
+
+
+def asset_bytes(asset) -> int:
+    # only surfaces are counted, fonts are small in comparison
+    # subsurfaces share the memory of their parent, like icons in the icon atlas
+    if isinstance(asset, pygame.Surface) and asset.get_parent() is None:
+        return asset.get_pitch() * asset.get_height()
+    return 0
+
+
+class AssetDict:
+    """One kind of asset held by the FileCache, used like a dict."""
+    def __init__(self, cache, kind: str):
+        self.cache = cache
+        self.kind = kind
+
+    def __contains__(self, name) -> bool:
+        return (self.kind, name) in self.cache.assets
+
+    def __getitem__(self, name):
+        return self.cache.assets[(self.kind, name)]
+
+    def __setitem__(self, name, asset):
+        self.cache.add((self.kind, name), asset)
+
+    def __len__(self) -> int:
+        return sum(1 for kind, _ in self.cache.assets if kind == self.kind)
+
+    def get(self, name):
+        return self.cache.get((self.kind, name))
+
+    def pin(self, name):
+        self.cache.pinned.add((self.kind, name))
+
+    def unpin(self, name):
+        self.cache.pinned.discard((self.kind, name))
 
 
 class FileCache:
-    def __init__(self):
-        self.images: Dict[str, pygame.Surface] = {}
-        self.nine_patch: Dict[str, pygame.Surface] = {}
-        self.fonts: Dict[str, pygame.font.Font] = {}
-        self.icons: Dict[str, pygame.Surface] = {}
+    """
+    Everything loaded from the assets folder, by kind. The least recently used
+    assets are dropped once the surfaces go over the byte budget, unless pinned.
+    Assets still used by widgets stay alive until they are done with them, but may
+    be loaded again if asked for, so pin anything that is asked for often.
+    """
+    def __init__(self, budget: int = DEFAULT_FILE_CACHE_BUDGET):
+        self.budget = budget
+        self.images = AssetDict(self, "images")
+        self.nine_patch = AssetDict(self, "nine_patch")
+        self.fonts = AssetDict(self, "fonts")
+        self.icons = AssetDict(self, "icons")
+        self.clear()
+
+    def get(self, key: tuple):
+        asset = self.assets.get(key)
+        if asset is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.assets.move_to_end(key)
+        return asset
+
+    def add(self, key: tuple, asset):
+        if key in self.assets:
+            self.total_bytes -= asset_bytes(self.assets[key])
+        self.assets[key] = asset
+        self.assets.move_to_end(key)
+        self.total_bytes += asset_bytes(asset)
+        self.evict(keep=key)
+
+    def evict(self, keep: tuple):
+        for key in list(self.assets):
+            if self.total_bytes <= self.budget:
+                return
+            # dropping assets that take no budget, like fonts, frees nothing
+            if key != keep and key not in self.pinned and asset_bytes(self.assets[key]) > 0:
+                self.total_bytes -= asset_bytes(self.assets.pop(key))
+                self.evictions += 1
+
+    @property
+    def stats(self) -> dict:
+        return {"assets": len(self.assets), "bytes": self.total_bytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
 
     def clear(self):
-        self.images = {}
-        self.nine_patch = {}
-        self.icons = {}
-        self.fonts = {}
+        self.assets: OrderedDict = OrderedDict()
+        self.pinned = set()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
 
 file_cache = FileCache()
 
 
+def use_archive(archive_path):
+    """Read all assets from a packed archive, or from ASSETS_FOLDER again if given None."""
+    global asset_archive
+    if asset_archive is not None:
+        asset_archive.close()
+    asset_archive = None if archive_path is None else AssetArchive(archive_path)
+    file_cache.clear()
+
+
+def asset_source(kind: str, name: str, description: str):
+    """The file, or archive entry, an asset is loaded from."""
+    if asset_archive is not None:
+        if not asset_archive.contains(kind, str(name)):
+            raise FileNotFoundError(f"{description} '{name}' not found in asset archive.")
+        return asset_archive.open(kind, str(name))
+    path = ASSETS_FOLDER / kind / name
+    if not path.exists():
+        raise FileNotFoundError(f"{description} '{name}' not found in assets.")
+    return path
+
+
+def asset_names(kind: str) -> list:
+    """The names of all the assets of a kind, such as all the icons."""
+    if asset_archive is not None:
+        return asset_archive.names(kind)
+    return sorted(path.name for path in (ASSETS_FOLDER / kind).iterdir() if path.is_file())
+
+
+def read_asset(kind: str, name: str, description: str) -> bytes:
+    source = asset_source(kind, name, description)
+    if isinstance(source, Path):
+        return source.read_bytes()
+    return source.read()
+
+
+def load_surface(kind: str, name: str, description: str) -> pygame.Surface:
+    # the name tells pygame the format of archive entries
+    return pygame.image.load(asset_source(kind, name, description), name).convert_alpha()
+
+
 def get_image(image_name: str) -> pygame.Surface:
     """Get an image from the assets folder, using cache if available."""
     # Check if the image is already in the cache
-    if image_name in file_cache.images:
-        return file_cache.images[image_name]
-    
-    # Load the image if not in cache
-    image_path = ASSETS_FOLDER / "images" / image_name
-    if not image_path.exists():
-        raise FileNotFoundError(f"Image '{image_name}' not found in assets.")
+    cached = file_cache.images.get(image_name)
+    if cached is not None:
+        return cached
     
     # Load the image and store in cache
-    image = pygame.image.load(image_path).convert_alpha()
+    image = load_surface("images", image_name, "Image")
     file_cache.images[image_name] = image
     return image
 
@@ -71,16 +264,12 @@ def get_image(image_name: str) -> pygame.Surface:
 def get_icon(image_name: str) -> pygame.Surface:
     """Get an image from the assets folder, using cache if available."""
     # Check if the image is already in the cache
-    if image_name in file_cache.icons:
-        return file_cache.icons[image_name]
-    
-    # Load the image if not in cache
-    icon_path = ASSETS_FOLDER / "icons" / image_name
-    if not icon_path.exists():
-        raise FileNotFoundError(f"Icon '{image_name}' not found in assets.")
+    cached = file_cache.icons.get(image_name)
+    if cached is not None:
+        return cached
     
     # Load the image and store in cache
-    icon = pygame.image.load(icon_path).convert_alpha()
+    icon = load_surface("icons", image_name, "Icon")
     file_cache.icons[image_name] = icon
     return icon
 
@@ -88,31 +277,35 @@ def get_icon(image_name: str) -> pygame.Surface:
 def get_nine_patch(patch_name: str) -> pygame.Surface:
     """Get a nine patch from the assets folder, using cache if available."""
     # Check if the nine patch is already in the cache
-    if patch_name in file_cache.nine_patch:
-        return file_cache.nine_patch[patch_name]
-    
-    # Load the nine patch if not in cache
-    patch_path = ASSETS_FOLDER / "nine_patch" / patch_name
-    if not patch_path.exists():
-        raise FileNotFoundError(f"Nine patch '{patch_name}' not found in assets.")
+    cached = file_cache.nine_patch.get(patch_name)
+    if cached is not None:
+        return cached
     
     # Load the nine patch and store in cache
-    nine_patch = pygame.image.load(patch_path).convert_alpha()
+    nine_patch = load_surface("nine_patch", patch_name, "Nine patch")
     file_cache.nine_patch[patch_name] = nine_patch
     return nine_patch
 
 
 def get_nine_patch_data(json_name: str):
-    """Get NinePatchData from a JSON file in the assets folder."""
+    """Get NinePatchData from a JSON file in the assets folder, using cache if available."""
     from pyui.widgets.nine_patch import NinePatchData
-    return NinePatchData.from_json(json_name)
+    # kept with the nine patch images, the names differ by extension
+    cached = file_cache.nine_patch.get(json_name)
+    if cached is not None:
+        return cached
+    data = NinePatchData.from_json(json_name)
+    file_cache.nine_patch[json_name] = data
+    return data
 
 
-def get_font(font_name: str, size: int = 16) -> Font:
+def get_font(font_name: str, size: int = 16, use_atlas: bool = False) -> Font:
     font_key = f"{font_name}_{size}"
-    if font_key in file_cache.fonts:
-        return file_cache.fonts[font_key]
-    font_path = ASSETS_FOLDER / "fonts" / font_name
-    font = Font(font_path, size)
+    if use_atlas:
+        font_key += "_atlas"
+    cached = file_cache.fonts.get(font_key)
+    if cached is not None:
+        return cached
+    font = Font(font_name, size, use_atlas)
     file_cache.fonts[font_key] = font
     return font
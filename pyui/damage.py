@@ -0,0 +1,72 @@
+import pygame
+from typing import List
+
+from pyui.helpers import Size, Position
+
+# above this many rects it is cheaper to repaint and update a single bounding rect
+MAX_DAMAGE_RECTS = 8
+
+
+class DamageTracker:
+    """
+    Collects the areas of a target surface that widgets changed during a frame.
+    Damage reported against any other surface (for example a widget drawing into
+    an intermediate image) is ignored, as the owning widget reports its own area.
+    Areas damaged between frames, like where a removed widget was, are kept for the next frame.
+    """
+    def __init__(self):
+        self.target = None
+        self.rects = []
+        self.pending = []
+        # the surface being repainted a damaged area at a time, if any
+        self.repainting = None
+
+    @property
+    def tracking(self) -> bool:
+        return self.target is not None
+
+    def track(self, surface: pygame.Surface):
+        """Start collecting damage for the given surface."""
+        self.target = surface
+        self.rects = []
+        for rect in self.pending:
+            self.add(surface, rect)
+        self.pending = []
+
+    def damage(self, rect: pygame.Rect):
+        """Damage an area of the target outside of drawing, to be redrawn next frame."""
+        if rect is not None:
+            self.pending.append(rect.copy())
+
+    def add(self, destination: pygame.Surface, rect: pygame.Rect):
+        if destination is not self.target:
+            return
+        rect = rect.clip(self.target.get_rect())
+        if rect.width > 0 and rect.height > 0:
+            self.rects.append(rect)
+
+    def add_area(self, destination: pygame.Surface, position: Position, size: Size):
+        self.add(destination, pygame.Rect(position.x, position.y, size.width, size.height))
+
+    def collect(self) -> List[pygame.Rect]:
+        """Stop tracking and return the merged damage rects."""
+        rects = merge_rects(self.rects)
+        self.target = None
+        self.rects = []
+        return rects
+
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    if len(rects) == 0:
+        return []
+    if len(rects) > MAX_DAMAGE_RECTS:
+        return [rects[0].unionall(rects[1:])]
+    merged = []
+    # largest first, so smaller rects inside them can be dropped
+    for rect in sorted(rects, key=lambda r: r.width * r.height, reverse=True):
+        if not any(existing.contains(rect) for existing in merged):
+            merged.append(rect)
+    return merged
+
+
+damage_tracker = DamageTracker()
@@ -0,0 +1,78 @@
+import pygame
+from pygame import Surface
+
+from pyui.helpers import Size
+
+# width of the atlas surface, it grows downwards as glyphs are added
+ATLAS_WIDTH = 512
+ATLAS_START_ROWS = 4
+WHITE = (255, 255, 255)
+
+
+class GlyphAtlas:
+    """
+    Every glyph a font has drawn, rasterized once in white and packed into rows of
+    a single surface. Strings are put together from the glyphs with one blits call
+    and then tinted, which is much faster than rasterizing text that keeps changing.
+    Glyphs are placed by their advance, so unlike Font.render there is no kerning.
+    """
+    def __init__(self, font: pygame.font.Font, antialias: bool = True):
+        self.font = font
+        self.antialias = antialias
+        self.height = font.get_height()
+        self.surface = Surface((ATLAS_WIDTH, self.height * ATLAS_START_ROWS), flags=pygame.SRCALPHA)
+        # character: (area in the atlas, advance)
+        self.glyphs = {}
+        self.next_x = 0
+        self.next_y = 0
+
+    def get_glyph(self, character: str) -> tuple:
+        if character not in self.glyphs:
+            self.glyphs[character] = self.add_glyph(character)
+        return self.glyphs[character]
+
+    def add_glyph(self, character: str) -> tuple:
+        if self.font.size(character)[0] == 0:
+            # combining marks and the like draw nothing, and pygame will not render them
+            return pygame.Rect(0, 0, 0, self.height), 0
+        image = self.font.render(character, self.antialias, WHITE)
+        width = image.get_width()
+        if self.next_x + width > ATLAS_WIDTH:
+            self.next_x = 0
+            self.next_y += self.height
+        if self.next_y + self.height > self.surface.get_height():
+            self.grow()
+        area = pygame.Rect(self.next_x, self.next_y, width, self.height)
+        self.surface.blit(image, area)
+        self.next_x += width
+        # glyphs missing from the font have no metrics
+        advance = self.font.metrics(character)[0]
+        return area, width if advance is None else advance[4]
+
+    def grow(self):
+        surface = Surface((ATLAS_WIDTH, self.surface.get_height() * 2), flags=pygame.SRCALPHA)
+        surface.blit(self.surface, (0, 0))
+        self.surface = surface
+
+    def layout(self, text: str) -> list:
+        """Where each glyph of the text goes, as (area in the atlas, x position) pairs."""
+        placed = []
+        x = 0
+        for character in text:
+            area, advance = self.get_glyph(character)
+            placed.append((area, x))
+            x += advance
+        return placed
+
+    def size_of(self, text: str) -> Size:
+        # the last glyph may be wider than its advance
+        width = max((x + area.width for area, x in self.layout(text)), default=0)
+        return Size(width, self.height)
+
+    def render(self, text: str, color) -> Surface:
+        placed = self.layout(text)
+        width = max((x + area.width for area, x in placed), default=0)
+        text_surface = Surface((width, self.height), flags=pygame.SRCALPHA)
+        text_surface.blits([(self.surface, (x, 0), area) for area, x in placed], False)
+        text_surface.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+        return text_surface
@@ -85,6 +85,9 @@ class Size:
             return NotImplemented
         return Size(self.width - other.width, self.height - other.height)
 
+    def copy(self):
+        return Size(self.width, self.height)
+
     def __repr__(self):
         return f"Size(width={self.width}, height={self.height})"
 
@@ -162,3 +165,16 @@ class Mouse:
         self.left.update(buttons[0])
         self.middle.update(buttons[1])
         self.right.update(buttons[2])
+
+    def without_clicks(self):
+        """
+        Return a copy of the mouse at the same position, with the buttons held
+        as they are but no button just pressed or released.
+        """
+        mouse = Mouse()
+        mouse.position = self.position.copy()
+        mouse.old_position = self.old_position.copy()
+        mouse.left.state = self.left.state
+        mouse.middle.state = self.middle.state
+        mouse.right.state = self.right.state
+        return mouse
@@ -0,0 +1,90 @@
+import pygame
+from bisect import bisect_right
+
+from pyui.helpers import Size, Position
+
+
+class HitNode:
+    """
+    A widget, the area its parent gave it and the area it responds to the mouse in.
+    Children laid out in a row or column are kept sorted so they can be binary searched.
+    """
+    def __init__(self, widget, position: Position, size: Size):
+        self.widget = widget
+        self.area = pygame.Rect(position.x, position.y, size.width, size.height)
+        self.content = widget.get_content_rect(position, size)
+        self.children = []
+        # the axis children are sorted along, None if they overlap
+        self.axis = None
+        self.starts = []
+
+    def contains(self, point) -> bool:
+        # inclusive on all sides, to match Widget.is_mouse_over
+        return (self.content.left <= point[0] <= self.content.right and
+                self.content.top <= point[1] <= self.content.bottom)
+
+    def sort_children(self):
+        for axis in (0, 1):
+            ordered = sorted(self.children, key=lambda node: node.area[axis])
+            if not overlapping(ordered, axis):
+                self.children = ordered
+                self.axis = axis
+                self.starts = [node.area[axis] for node in ordered]
+                return
+
+    def child_at(self, point):
+        if self.axis is None:
+            # the last child drawn is on top, but only where it or its children respond to the mouse
+            for node in reversed(self.children):
+                if node.area.collidepoint(point) and len(node.path_to(point)) > 0:
+                    return node
+            return None
+        index = bisect_right(self.starts, point[self.axis]) - 1
+        if index >= 0 and self.children[index].area.collidepoint(point):
+            return self.children[index]
+        return None
+
+    def path_to(self, point) -> list:
+        """All widgets from this one down to the deepest one under the point."""
+        path = []
+        node = self
+        while node is not None:
+            if node.contains(point):
+                path.append(node.widget)
+            node = node.child_at(point)
+        return path
+
+
+def overlapping(nodes: list, axis: int) -> bool:
+    for first, second in zip(nodes, nodes[1:]):
+        if first.area[axis] + first.area[axis + 2] > second.area[axis]:
+            return True
+    return False
+
+
+def build_node(widget, position: Position, size: Size) -> HitNode:
+    node = HitNode(widget, position, size)
+    for child, (offset, child_size) in zip(widget.layout_children, widget.get_arrangement(size)):
+        node.children.append(build_node(child, position + offset, child_size))
+    node.sort_children()
+    return node
+
+
+class HitIndex:
+    """
+    Resolves a mouse position to the path of widgets under it, built from the
+    results of the layout pass. Top level widgets are searched from the top down.
+    """
+    def __init__(self):
+        self.roots = []
+
+    def add(self, widget, position: Position, size: Size):
+        self.roots.append(build_node(widget, position, size))
+
+    def find(self, position: Position) -> list:
+        point = position.as_tuple
+        for root in reversed(self.roots):
+            path = root.path_to(point)
+            if len(path) > 0:
+                return path
+        return []
@@ -0,0 +1,60 @@
+import math
+import pygame
+from typing import Dict
+
+from pyui.assets import asset_names, asset_source, file_cache
+
+
+def pack_rects(sizes: Dict[str, tuple], width: int) -> Dict[str, pygame.Rect]:
+    """
+    Place rectangles of the given sizes in rows no wider than width, tallest first,
+    starting a new row when the next one does not fit.
+    """
+    placed = {}
+    x = y = row_height = 0
+    for name, (rect_width, rect_height) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if x + rect_width > width:
+            x = 0
+            y += row_height
+            row_height = 0
+        placed[name] = pygame.Rect(x, y, rect_width, rect_height)
+        x += rect_width
+        row_height = max(row_height, rect_height)
+    return placed
+
+
+def atlas_width(sizes: Dict[str, tuple]) -> int:
+    # roughly square, but never narrower than the widest rectangle
+    area = sum(width * height for width, height in sizes.values())
+    return max([math.ceil(math.sqrt(area))] + [width for width, _ in sizes.values()])
+
+
+class IconAtlas:
+    """
+    All the icons packed into a single surface. Each icon is a subsurface of it,
+    so they share one allocation and draw like any other surface.
+    """
+    def __init__(self, images: Dict[str, pygame.Surface]):
+        sizes = {name: image.get_size() for name, image in images.items()}
+        width = atlas_width(sizes)
+        self.rects = pack_rects(sizes, width)
+        height = max([rect.bottom for rect in self.rects.values()], default=0)
+        surface = pygame.Surface((width, height), flags=pygame.SRCALPHA)
+        surface.blits([(images[name], rect) for name, rect in self.rects.items()], False)
+        self.surface = surface.convert_alpha()
+
+    def icon(self, name: str) -> pygame.Surface:
+        return self.surface.subsurface(self.rects[name])
+
+
+def load_icon_atlas() -> IconAtlas:
+    """
+    Load every icon into an atlas, and put them in the file cache so that get_icon
+    returns them. The icons are pinned, as they cost nothing once the atlas exists.
+    """
+    names = asset_names("icons")
+    atlas = IconAtlas({name: pygame.image.load(asset_source("icons", name, "Icon"), name) for name in names})
+    for name in names:
+        file_cache.icons[name] = atlas.icon(name)
+        file_cache.icons.pin(name)
+    return atlas
@@ -1,4 +1,7 @@
-from typing import Dict, List, Any, Callable, Set
+import inspect
+import weakref
+from collections import deque
+from typing import Dict, List, Tuple, Any, Callable
 from enum import Enum, auto
 
 
@@ -17,24 +20,84 @@ class Message:
         self.data = data
 
 
+class Ref:
+    """
+    A reference held by the message bus, which hashes and compares like the
+    object it refers to. Once a weakly held object is gone, calling it returns None.
+    """
+    def __init__(self, target: Any):
+        self.hash = hash(target)
+        self.ref = lambda: target
+
+    def __call__(self):
+        return self.ref()
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        if isinstance(other, Ref):
+            other = other()
+        target = self()
+        return target is not None and target == other
+
+
+def weak_method(method: Callable) -> Callable:
+    # like weakref.WeakMethod, without a callback that can fail at interpreter exit
+    owner = weakref.ref(method.__self__)
+    function = method.__func__
+
+    def get():
+        target = owner()
+        return None if target is None else function.__get__(target)
+    return get
+
+
+def callback_ref(callback: Callable[[Message], None]) -> Ref:
+    # functions and lambdas would die straight away if held weakly
+    ref = Ref(callback)
+    if inspect.ismethod(callback):
+        ref.ref = weak_method(callback)
+    return ref
+
+
+def subscriber_ref(subscriber: Any, on_death: Callable[[Ref], None] = None) -> Ref:
+    ref = Ref(subscriber)
+    try:
+        ref.ref = weakref.ref(subscriber, None if on_death is None else lambda _: on_death(ref))
+    except TypeError:
+        # objects like strings can't be weakly referenced, so are held strongly
+        pass
+    return ref
+
+
 class MessageBus:
-    """Central messaging system that routes messages between components."""
+    """
+    Central messaging system that routes messages between components.
+    Each subscriber keeps an index of the callbacks it registered, so posting,
+    consuming and unsubscribing do not need to scan other subscribers.
+    Subscriptions are keyed by subscriber and callback, so subscribers sharing a
+    callback are registered and unsubscribed independently.
+    Subscribers and bound method callbacks are held weakly: when a subscriber is
+    garbage collected its subscriptions are removed. Other callables are held
+    strongly, so a lambda that uses its subscriber will keep it alive.
+    """
     def __init__(self):
-        self.subscribers: Dict[MessageType, List[Callable[[Message], None]]] = {}
-        self.subscribed_objects: Dict[Any, Set[MessageType]] = {}
-        self.posts = []
+        # (subscriber, callback) per message type, the dicts are used as ordered sets
+        self.subscribers: Dict[MessageType, Dict[Tuple[Ref, Ref], None]] = {}
+        self.subscribed_objects: Dict[Ref, Dict[MessageType, List[Tuple[Ref, Ref]]]] = {}
+        self.posts = deque()
     
     def subscribe(self, subscriber: Any, msg_type: MessageType, callback: Callable[[Message], None]) -> None:
         """Subscribe to a specific message type with a callback function."""
-        if msg_type not in self.subscribers:
-            self.subscribers[msg_type] = []
-        
-        self.subscribers[msg_type].append(callback)
-        
         if subscriber not in self.subscribed_objects:
-            self.subscribed_objects[subscriber] = set()
-        
-        self.subscribed_objects[subscriber].add(msg_type)
+            self.subscribed_objects[subscriber_ref(subscriber, self.remove_dead)] = {}
+        key = (subscriber_ref(subscriber), callback_ref(callback))
+        self.subscribed_objects[subscriber].setdefault(msg_type, []).append(key)
+
+        if msg_type not in self.subscribers:
+            self.subscribers[msg_type] = {}
+        self.subscribers[msg_type][key] = None
     
     def unsubscribe(self, subscriber: Any, msg_type: MessageType = None) -> None:
         """
@@ -48,41 +111,56 @@ class MessageBus:
             # Unsubscribe from all message types
             for mt in list(self.subscribed_objects[subscriber]):
                 self.unsubscribe_from_type(subscriber, mt)
-            del self.subscribed_objects[subscriber]
         else:
             # Unsubscribe from specific message type
             self.unsubscribe_from_type(subscriber, msg_type)
-            self.subscribed_objects[subscriber].discard(msg_type)
-            if not self.subscribed_objects[subscriber]:
-                del self.subscribed_objects[subscriber]
+        if not self.subscribed_objects[subscriber]:
+            del self.subscribed_objects[subscriber]
     
     def unsubscribe_from_type(self, subscriber: Any, msg_type: MessageType) -> None:
         """Helper method to unsubscribe an object from a specific message type."""
+        keys = self.subscribed_objects[subscriber].pop(msg_type, [])
         if msg_type not in self.subscribers:
             return
-        
-        # Create a new list without the subscriber's callbacks
-        self.subscribers[msg_type] = [
-            cb for cb in self.subscribers[msg_type]
-            if getattr(cb, '__self__', None) is not subscriber
-        ]
-        
+        for key in keys:
+            self.subscribers[msg_type].pop(key, None)
         if not self.subscribers[msg_type]:
             del self.subscribers[msg_type]
     
+    def remove_dead(self, subscriber: Ref) -> None:
+        """Called when a weakly held subscriber has been garbage collected."""
+        if subscriber not in self.subscribed_objects:
+            return
+        for msg_type in list(self.subscribed_objects[subscriber]):
+            self.unsubscribe_from_type(subscriber, msg_type)
+        del self.subscribed_objects[subscriber]
+
     def post(self, message: Message) -> None:
         """Post a message to all subscribers of that message type."""
         if message.type not in self.subscribers:
             return
         self.posts.append(message)
-    
+
+    @property
+    def has_posts(self) -> bool:
+        return len(self.posts) > 0
+
     def consume(self):
-        # consume all messages in the queue
+        # consume all messages in the queue, including any posted by the callbacks
         while len(self.posts) > 0:
-            message = self.posts.pop(0)
-            for callback in self.subscribers[message.type]:
-                if message.sender.active:
-                    callback(message)
+            posts = self.posts
+            self.posts = deque()
+            for message in posts:
+                self.deliver(message)
+
+    def deliver(self, message: Message):
+        if not message.sender.active:
+            return
+        # callbacks may unsubscribe while we are delivering
+        for _, ref in list(self.subscribers.get(message.type, {})):
+            callback = ref()
+            if callback is not None:
+                callback(message)
 
 
 # Singleton instance that can be imported
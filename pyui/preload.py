@@ -0,0 +1,89 @@
+import json
+import time
+from pathlib import Path
+
+from pyui.assets import get_image, get_icon, get_nine_patch_data, get_font
+from pyui.asset_loader import asset_loader
+
+# how each kind of asset in a manifest is loaded
+LOADERS = {
+    "images": get_image,
+    "icons": get_icon,
+    "nine_patch": get_nine_patch_data,
+}
+
+
+class PreloadReport:
+    """How long each asset took to load, in seconds, for finding slow startups."""
+    def __init__(self):
+        self.timings = []
+        self.total = 0.0
+
+    def add(self, kind: str, name: str, seconds: float):
+        self.timings.append((kind, name, seconds))
+
+    def slowest(self, count: int = 10) -> list:
+        return sorted(self.timings, key=lambda timing: timing[2], reverse=True)[:count]
+
+    def __str__(self):
+        lines = [f"Preloaded {len(self.timings)} assets in {self.total * 1000:.1f}ms"]
+        for kind, name, seconds in self.slowest(len(self.timings)):
+            lines.append(f"  {seconds * 1000:8.2f}ms  {kind}/{name}")
+        return "\n".join(lines)
+
+
+def load_manifest(path) -> dict:
+    """
+    Read a manifest of the assets a screen needs, in the form
+    {"fonts": [["creato.otf", 16]], "nine_patch": ["frame.json"], "icons": [...], "images": [...]}
+    """
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def preload(manifest: dict, parallel: bool = False) -> PreloadReport:
+    """
+    Load everything in the manifest into the file cache, so nothing is loaded when
+    the first frame is drawn. Call this after creating the Window, as images are
+    converted for the display. In parallel, images are decoded on worker threads.
+    """
+    report = PreloadReport()
+    start = time.perf_counter()
+    if parallel:
+        preload_parallel(manifest, report)
+    else:
+        for kind, loader in LOADERS.items():
+            for name in manifest.get(kind, []):
+                report.add(kind, name, timed(loader, name))
+        preload_fonts(manifest, report)
+    report.total = time.perf_counter() - start
+    return report
+
+
+def preload_fonts(manifest: dict, report: PreloadReport):
+    for font_name, size in manifest.get("fonts", []):
+        report.add("fonts", f"{font_name} {size}", timed(get_font, font_name, size))
+
+
+def preload_parallel(manifest: dict, report: PreloadReport):
+    # nine patch images are named after their json
+    patch_images = {name: f"{Path(name).stem}.png" for name in manifest.get("nine_patch", [])}
+    pending = [asset_loader.load(kind, name) for kind in ("images", "icons") for name in manifest.get(kind, [])]
+    patches = {name: asset_loader.load("nine_patch", image) for name, image in patch_images.items()}
+    # fonts load on this thread while the images decode
+    preload_fonts(manifest, report)
+    asset_loader.wait()
+    for asset in pending + list(patches.values()):
+        # fail like loading them one at a time would
+        if asset.error is not None:
+            raise asset.error
+    for asset in pending:
+        report.add(asset.kind, asset.name, asset.load_time)
+    for name, asset in patches.items():
+        report.add("nine_patch", name, asset.load_time + timed(get_nine_patch_data, name))
@@ -40,9 +40,11 @@ class SignalHandler:
 
 
 def process_signal_stack():
-    for signal in signal_stack:
-        callback = signal[0]
-        widget = signal[1]
-        callback(widget)
+    # callbacks may trigger more signals, so keep going until none are left
+    while len(signal_stack) > 0:
+        pending = signal_stack[:]
+        signal_stack.clear()
+        for callback, widget in pending:
+            callback(widget)
 
 signal_stack = []
@@ -0,0 +1,56 @@
+import pygame
+from pygame import Surface
+from typing import Dict, List, Tuple
+
+from pyui.helpers import Size
+
+# bytes of free surfaces the pool may hold on to
+DEFAULT_POOL_BUDGET = 32 * 1024 * 1024
+
+
+def surface_bytes(surface: Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfacePool:
+    """
+    Keeps released alpha surfaces, bucketed by size, so widgets that redraw at
+    the same size reuse them instead of allocating new ones.
+    Free surfaces beyond the budget are left for the garbage collector.
+    """
+    def __init__(self, budget: int = DEFAULT_POOL_BUDGET):
+        self.budget = budget
+        self.free: Dict[Tuple[int, int], List[Surface]] = {}
+        self.free_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, size: Size) -> Surface:
+        """Return a fully transparent surface of the given size."""
+        surfaces = self.free.get(size.as_tuple)
+        if surfaces:
+            surface = surfaces.pop()
+            self.free_bytes -= surface_bytes(surface)
+            surface.fill((0, 0, 0, 0))
+            self.hits += 1
+            return surface
+        self.misses += 1
+        return Surface(size.as_tuple, flags=pygame.SRCALPHA)
+
+    def release(self, surface: Surface):
+        """Give a surface back to the pool. It must not be used afterwards."""
+        # acquire hands out alpha surfaces only, others are left for the garbage collector
+        if surface is None or not surface.get_flags() & pygame.SRCALPHA:
+            return
+        size = surface_bytes(surface)
+        if self.free_bytes + size > self.budget:
+            return
+        self.free.setdefault(surface.get_size(), []).append(surface)
+        self.free_bytes += size
+
+    def clear(self):
+        self.free = {}
+        self.free_bytes = 0
+
+
+surface_pool = SurfacePool()
@@ -1,3 +1,5 @@
+from .piece_table import PieceTable
 from .text_store import TextStore
+from .highlight import Highlighter, PythonLexer, TokenKind
 
-__all__ = ['TextStore']
+__all__ = ['PieceTable', 'TextStore', 'Highlighter', 'PythonLexer', 'TokenKind']
@@ -0,0 +1,155 @@
+import re
+import keyword
+import builtins
+import tokenize
+from enum import Enum
+
+# the token rules of the standard library tokenizer, applied a line at a time
+PSEUDO_TOKEN = re.compile(tokenize.PseudoToken, re.UNICODE)
+STRING_ENDS = {opener: re.compile(pattern) for opener, pattern in tokenize.endpats.items()
+               if opener in tokenize.triple_quoted}
+BUILTINS = frozenset(name for name in dir(builtins) if not name.startswith("_"))
+# lines fetched from the store at a time as states are found, and the most lexed
+# again after an edit, which keeps a keystroke well under a millisecond
+LEX_BATCH = 256
+
+
+class TokenKind(Enum):
+    KEYWORD = 1
+    BUILTIN = 2
+    DEFINITION = 3
+    STRING = 4
+    NUMBER = 5
+    COMMENT = 6
+
+
+class PythonLexer:
+    """
+    Finds the tokens of a line of Python. The state carried from one line to the
+    next is the quotes of a triple quoted string left open, or None.
+    """
+    initial_state = None
+
+    def lex(self, line: str, state) -> tuple:
+        """Returns the (start, end, kind) spans of the colored tokens, and the state at the end of the line."""
+        spans = []
+        position = 0
+        if state is not None:
+            position, state = self.string_end(line, 0, state)
+            spans.append((0, position, TokenKind.STRING))
+        previous = None
+        while position < len(line) and state is None:
+            match = PSEUDO_TOKEN.match(line, position)
+            if match is None:
+                position = self.unmatched(line, position, spans)
+                continue
+            start, end = match.span(1)
+            token = line[start:end]
+            position = max(end, position + 1) if start == end else end
+            if token in STRING_ENDS:
+                position, state = self.string_end(line, end, token)
+                spans.append((start, position, TokenKind.STRING))
+            elif token:
+                self.add_token(spans, start, end, token, previous)
+                previous = token
+        return spans, state
+
+    def string_end(self, line: str, start: int, opener: str) -> tuple:
+        """Where a triple quoted string ends in the line, and the state after it."""
+        match = STRING_ENDS[opener[-3:]].match(line, start)
+        if match is None:
+            return len(line), opener[-3:]
+        return match.end(), None
+
+    def unmatched(self, line: str, position: int, spans: list) -> int:
+        # a quote that is not closed on the line runs to the end of it
+        if line[position] in "'\"":
+            spans.append((position, len(line), TokenKind.STRING))
+            return len(line)
+        return position + 1
+
+    def add_token(self, spans: list, start: int, end: int, token: str, previous: str):
+        kind = token_kind(token, previous)
+        if kind is not None:
+            spans.append((start, end, kind))
+
+
+def token_kind(token: str, previous: str):
+    first = token[0]
+    if first == "#":
+        return TokenKind.COMMENT
+    if first.isdigit() or (first == "." and token[1:2].isdigit()):
+        return TokenKind.NUMBER
+    if first in "'\"" or token[-1:] in "'\"":
+        return TokenKind.STRING
+    if not token.isidentifier():
+        return None
+    if keyword.iskeyword(token) or keyword.issoftkeyword(token):
+        return TokenKind.KEYWORD
+    if previous in ("def", "class"):
+        return TokenKind.DEFINITION
+    return TokenKind.BUILTIN if token in BUILTINS else None
+
+
+def color_runs(text: str, spans: list) -> list:
+    """Split text into (text, kind) runs, with a kind of None between the spans."""
+    runs = []
+    position = 0
+    for start, end, kind in spans:
+        start = min(start, len(text))
+        end = min(end, len(text))
+        if start > position:
+            runs.append((text[position:start], None))
+        if end > start:
+            runs.append((text[start:end], kind))
+        position = max(position, end)
+    if position < len(text):
+        runs.append((text[position:], None))
+    return runs
+
+
+class Highlighter:
+    """
+    The lexer state at the start of each line of a TextStore. States are found as
+    far down as lines are drawn. After an edit, lines are lexed again from the edited
+    line only until one ends in the state the next line already started in. If that
+    takes too long, the states below are forgotten and found again when drawn.
+    """
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self.reset()
+
+    def reset(self):
+        # states[y] is the state at the start of line y
+        self.states = [self.lexer.initial_state]
+
+    def state_at(self, store, y: int):
+        while len(self.states) <= y:
+            first = len(self.states) - 1
+            lines = store.lines_from(first, min(y - first, LEX_BATCH))
+            if len(lines) == 0:
+                raise IndexError(f"There is no line {first}.")
+            for line in lines:
+                self.states.append(self.lexer.lex(line, self.states[-1])[1])
+        return self.states[y]
+
+    def edited(self, store, y: int, added_lines: int = 0):
+        """Update the states after line y was changed, and lines were added after it, or removed if negative."""
+        if y >= len(self.states):
+            return
+        if added_lines > 0:
+            self.states[y + 1:y + 1] = [None] * added_lines
+        else:
+            del self.states[y + 1:y + 1 - added_lines]
+        self.relex(store, y, y + max(added_lines, 0))
+
+    def relex(self, store, y: int, last_edited: int):
+        """Lex from line y until the states agree again, giving up after a batch of lines."""
+        for line in store.lines_from(y, min(len(self.states) - 1 - y, LEX_BATCH)):
+            end = self.lexer.lex(line, self.states[y])[1]
+            if end == self.states[y + 1] and y >= last_edited:
+                return
+            self.states[y + 1] = end
+            y += 1
+        # the states further down are found again when those lines are drawn
+        del self.states[y + 1:]
@@ -0,0 +1,118 @@
+import os
+import sys
+import mmap
+
+from pyui.text.piece_table import MAX_PIECE_LENGTH
+
+# bytes of the file covered by each entry of the line index
+CHUNK_SIZE = 1024 * 1024
+
+
+class FileSpan:
+    """
+    Whole lines of a mapped file, used in place of a string as the source of a piece.
+    The bytes are decoded each time text is taken from it, so only the lines asked
+    for are ever decoded, and the file is never copied into strings.
+    """
+    __slots__ = ("file", "start", "end", "length", "newlines")
+
+    def __init__(self, file, start: int, end: int):
+        self.file = file
+        self.start = start
+        self.end = end
+        data = file.map[start:end]
+        self.newlines = data.count(b"\n")
+        # ascii is one character a byte, anything else has to be decoded to be counted
+        self.length = len(data) if data.isascii() else len(file.decode(data))
+
+    def __str__(self) -> str:
+        return self.file.span_text(self)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index) -> str:
+        return str(self)[index]
+
+    def count(self, sub: str, start: int, end: int) -> int:
+        if sub == "\n" and start == 0 and end >= self.length:
+            return self.newlines
+        return str(self).count(sub, start, end)
+
+
+class MappedFile:
+    """
+    A text file that is memory mapped, and handed out as spans of whole lines that
+    are decoded only when their text is needed. Lines are counted from the bytes,
+    through an index of the newlines before each chunk that is built as far as it
+    is asked for. The encoding must encode a newline as the byte "\\n" and never use
+    that byte inside another character, as UTF-8 and single byte encodings do.
+    """
+    def __init__(self, path, encoding: str = "utf-8", chunk_size: int = CHUNK_SIZE):
+        if "\n".encode(encoding) != b"\n":
+            raise ValueError(f"Cannot find the lines of {encoding} text without decoding it.")
+        with open(path, "rb") as file:
+            self.size = os.fstat(file.fileno()).st_size
+            # empty files cannot be mapped
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self.size > 0 else None
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        # bytes handed out as spans so far
+        self.offset = 0
+        # line_index[n] is the number of newlines before byte n * chunk_size
+        self.line_index = [0]
+        # a last line without a newline is a line too
+        self.unterminated = self.size > 0 and self.map[-1] != ord("\n")
+        # the span decoded last and its text, as the same lines are usually asked for a few times in a row
+        self.decoded = (None, "")
+
+    @property
+    def finished(self) -> bool:
+        return self.offset >= self.size
+
+    def decode(self, data: bytes) -> str:
+        return data.decode(self.encoding, errors="replace")
+
+    def span_text(self, span: FileSpan) -> str:
+        if self.decoded[0] is not span:
+            self.decoded = (span, self.decode(self.map[span.start:span.end]))
+        return self.decoded[1]
+
+    def read(self) -> FileSpan:
+        """The next lines of the file, up to a piece long unless a single line is longer."""
+        end = self.offset + MAX_PIECE_LENGTH
+        if end < self.size:
+            newline = self.map.rfind(b"\n", self.offset, end)
+            if newline < 0:
+                newline = self.map.find(b"\n", end)
+            end = self.size if newline < 0 else newline + 1
+        span = FileSpan(self, self.offset, min(end, self.size))
+        self.offset = span.end
+        return span
+
+    def newlines_before(self, offset: int) -> int:
+        chunk = offset // self.chunk_size
+        while len(self.line_index) <= chunk:
+            start = (len(self.line_index) - 1) * self.chunk_size
+            self.line_index.append(self.line_index[-1] + self.map[start:start + self.chunk_size].count(b"\n"))
+        return self.line_index[chunk] + self.map[chunk * self.chunk_size:offset].count(b"\n")
+
+    def lines_after(self, offset: int, limit: int = sys.maxsize) -> int:
+        """The lines from a byte offset to the end of the file, counted no further than limit."""
+        if offset >= self.size:
+            return 0
+        before = self.newlines_before(offset)
+        end = offset
+        lines = 0
+        while end < self.size and lines < limit:
+            end = min((end // self.chunk_size + 1) * self.chunk_size, self.size)
+            lines = self.newlines_before(end) - before
+        if self.unterminated and end == self.size:
+            lines += 1
+        return min(lines, limit)
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+            self.decoded = (None, "")
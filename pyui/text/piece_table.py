@@ -0,0 +1,203 @@
+import random
+
+# text is cut into pieces no longer than this, so finding a line within a piece stays quick
+MAX_PIECE_LENGTH = 4096
+# typed text extends the piece it follows until the piece is this long
+MAX_ADDED_LENGTH = 256
+
+
+class Piece:
+    """
+    A run of text from a source string, or from lines of a mapped file that are
+    decoded when needed, and a node of the tree of pieces making up the document.
+    The tree is a treap: ordered by position in the document and kept balanced by
+    random priorities. Each node holds the length and newline count of its subtree,
+    so offsets and lines are found in O(log n).
+    """
+    __slots__ = ("source", "start", "length", "newlines", "added", "priority",
+                 "left", "right", "total", "total_newlines")
+
+    def __init__(self, source, start: int, length: int, added: bool = False):
+        self.source = source
+        self.start = start
+        self.length = length
+        self.newlines = source.count("\n", start, start + length)
+        # pieces holding typed text may be extended
+        self.added = added
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.total = length
+        self.total_newlines = self.newlines
+
+    @property
+    def text(self) -> str:
+        return self.source[self.start:self.start + self.length]
+
+    def extend(self, text: str):
+        self.source = self.text + text
+        self.start = 0
+        self.length = len(self.source)
+        self.newlines = self.source.count("\n")
+
+    def update(self):
+        self.total = total(self.left) + self.length + total(self.right)
+        self.total_newlines = total_newlines(self.left) + self.newlines + total_newlines(self.right)
+
+
+def total(node: Piece) -> int:
+    return 0 if node is None else node.total
+
+
+def total_newlines(node: Piece) -> int:
+    return 0 if node is None else node.total_newlines
+
+
+def merge(left: Piece, right: Piece) -> Piece:
+    """Join two trees, with all the text of left before the text of right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = merge(left.right, right)
+        left.update()
+        return left
+    right.left = merge(left, right.left)
+    right.update()
+    return right
+
+
+def split(node: Piece, offset: int) -> tuple:
+    """Split a tree into the text before the offset and the text from it on."""
+    if node is None:
+        return None, None
+    left_total = total(node.left)
+    if offset <= left_total:
+        before, node.left = split(node.left, offset)
+        node.update()
+        return before, node
+    if offset >= left_total + node.length:
+        node.right, after = split(node.right, offset - left_total - node.length)
+        node.update()
+        return node, after
+    cut = offset - left_total
+    head = Piece(node.source, node.start, cut, node.added)
+    tail = Piece(node.source, node.start + cut, node.length - cut, node.added)
+    return merge(node.left, head), merge(tail, node.right)
+
+
+def extend_last(node: Piece, text: str) -> bool:
+    """Add the text to the last piece of the tree if it holds typed text with room to spare."""
+    if node is None:
+        return False
+    if node.right is not None:
+        extended = extend_last(node.right, text)
+    elif node.added and node.length + len(text) <= MAX_ADDED_LENGTH:
+        node.extend(text)
+        extended = True
+    else:
+        return False
+    node.update()
+    return extended
+
+
+def collect(node: Piece, start: int, end: int, parts: list):
+    """Append the text of the tree between start and end to parts."""
+    if node is None or start >= end:
+        return
+    left_total = total(node.left)
+    if start < left_total:
+        collect(node.left, start, end, parts)
+    piece_start = max(start - left_total, 0)
+    piece_end = min(end - left_total, node.length)
+    if piece_start < piece_end:
+        parts.append(node.source[node.start + piece_start:node.start + piece_end])
+    right_start = left_total + node.length
+    if end > right_start:
+        collect(node.right, start - right_start, end - right_start, parts)
+
+
+def nth_newline(source: str, start: int, count: int) -> int:
+    """Index of the count'th newline in source from start, which must exist."""
+    index = start - 1
+    for _ in range(count):
+        index = source.find("\n", index + 1)
+    return index
+
+
+class PieceTable:
+    """
+    Text that is edited by inserting and deleting at character offsets, without
+    copying it. The original text is never changed; the document is a tree of
+    pieces of it and of inserted text. Edits and finding a line take O(log n).
+    """
+    def __init__(self, text: str = ""):
+        self.root = None
+        self.append(text)
+
+    def __len__(self) -> int:
+        return total(self.root)
+
+    @property
+    def newlines(self) -> int:
+        return total_newlines(self.root)
+
+    @property
+    def pieces(self) -> int:
+        return self.count_pieces(self.root)
+
+    def count_pieces(self, node: Piece) -> int:
+        if node is None:
+            return 0
+        return self.count_pieces(node.left) + 1 + self.count_pieces(node.right)
+
+    def append(self, text: str):
+        """Add text to the end of the document, cut into pieces."""
+        for start in range(0, len(text), MAX_PIECE_LENGTH):
+            self.append_piece(text, start, min(MAX_PIECE_LENGTH, len(text) - start))
+
+    def append_piece(self, source, start: int, length: int):
+        """Add a piece of a source to the end of the document, which can be text or lines of a mapped file."""
+        self.root = merge(self.root, Piece(source, start, length))
+
+    def insert(self, offset: int, text: str):
+        if not 0 <= offset <= len(self):
+            raise IndexError(f"Offset {offset} is outside the text.")
+        if len(text) == 0:
+            return
+        before, after = split(self.root, offset)
+        if not extend_last(before, text):
+            before = merge(before, Piece(text, 0, len(text), added=True))
+        self.root = merge(before, after)
+
+    def delete(self, offset: int, length: int):
+        if offset < 0 or length < 0 or offset + length > len(self):
+            raise IndexError(f"Cannot delete {length} characters at {offset}.")
+        before, rest = split(self.root, offset)
+        _, after = split(rest, length)
+        self.root = merge(before, after)
+
+    def get_text(self, start: int = 0, end: int = None) -> str:
+        parts = []
+        collect(self.root, start, len(self) if end is None else end, parts)
+        return "".join(parts)
+
+    def line_start(self, line: int) -> int:
+        """Offset of the first character after the given number of newlines."""
+        if not 0 <= line <= self.newlines:
+            raise IndexError(f"There is no line {line}.")
+        offset = 0
+        node = self.root
+        while line > 0:
+            left_newlines = total_newlines(node.left)
+            if line <= left_newlines:
+                node = node.left
+            elif line <= left_newlines + node.newlines:
+                newline = nth_newline(str(node.source), node.start, line - left_newlines)
+                return offset + total(node.left) + newline - node.start + 1
+            else:
+                offset += total(node.left) + node.length
+                line -= left_newlines + node.newlines
+                node = node.right
+        return offset
@@ -1,29 +1,143 @@
+import sys
+from collections.abc import Sequence
+
 from pyui.helpers import Position
+from pyui.text.piece_table import PieceTable
+from pyui.text.mapped_file import MappedFile, CHUNK_SIZE
+
+
+class Lines(Sequence):
+    """The lines of a TextStore as lists of characters. Lines can be replaced, but not resized."""
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self) -> int:
+        return self.store.line_count
+
+    def __getitem__(self, y: int) -> list:
+        return list(self.store.line(y))
+
+    def __setitem__(self, y: int, characters):
+        self.store.replace_line(y, "".join(characters))
+
+    def __eq__(self, other) -> bool:
+        return list(self) == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
 
 class TextStore:
+    """
+    The text being edited, held in a piece table. Every line ends with a newline,
+    so a store with no lines is empty and a store with one empty line is "\\n".
+    A loaded file is memory mapped, and its pieces point at the mapped bytes, which
+    are only decoded when their lines are asked for.
+    """
     def __init__(self):
-        self.lines = []
+        self.table = PieceTable()
+        self.cursor = Position(0, 0)
+        # the loaded file, which pieces of the table are read from
+        self.source = None
+
+    def load(self, path, encoding: str = "utf-8", chunk_size: int = CHUNK_SIZE):
+        """Replace the text with a file, which is memory mapped and added to the table as its lines are needed."""
+        self.close()
         self.cursor = Position(0, 0)
-    
+        self.source = MappedFile(path, encoding, chunk_size)
+
+    def close(self):
+        """Close the loaded file, leaving the store empty."""
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+        self.table = PieceTable()
+
+    @property
+    def reading(self) -> bool:
+        return self.source is not None and not self.source.finished
+
+    def read_lines(self, count: int):
+        """Add lines of the file to the table until there are at least count, or it has all been added."""
+        while self.reading and self.table.newlines < count:
+            span = self.source.read()
+            self.table.append_piece(span, 0, len(span))
+            if self.source.finished and self.source.unterminated:
+                self.table.append("\n")
+
+    @property
+    def lines(self) -> Lines:
+        return Lines(self)
+
+    @lines.setter
+    def lines(self, lines):
+        self.close()
+        self.table = PieceTable("".join("".join(line) + "\n" for line in lines))
+
+    @property
+    def line_count(self) -> int:
+        return self.count_lines(sys.maxsize)
+
+    def count_lines(self, limit: int) -> int:
+        """The number of lines, counted no further than limit. Lines not yet added are counted from the bytes."""
+        if not self.reading or self.table.newlines >= limit:
+            return self.table.newlines
+        return self.table.newlines + self.source.lines_after(self.source.offset, limit - self.table.newlines)
+
+    def has_line(self, y: int) -> bool:
+        return 0 <= y < self.count_lines(y + 1)
+
+    def line_start(self, y: int) -> int:
+        self.read_lines(y + 1)
+        if not 0 <= y < self.table.newlines:
+            raise IndexError(f"There is no line {y}.")
+        return self.table.line_start(y)
+
+    def line_length(self, y: int) -> int:
+        start = self.line_start(y)
+        return self.table.line_start(y + 1) - 1 - start
+
+    def line(self, y: int) -> str:
+        start = self.line_start(y)
+        return self.table.get_text(start, self.table.line_start(y + 1) - 1)
+
+    def lines_from(self, y: int, count: int) -> list:
+        """Up to count lines from line y, which is quicker than getting them one at a time."""
+        self.read_lines(y + count)
+        end = min(y + count, self.table.newlines)
+        if y < 0 or y >= end:
+            return []
+        return self.table.get_text(self.table.line_start(y), self.table.line_start(end) - 1).split("\n")
+
+    def replace_line(self, y: int, text: str):
+        start = self.line_start(y)
+        self.table.delete(start, self.line_length(y))
+        self.table.insert(start, text)
+
+    def cursor_offset(self) -> int:
+        return self.line_start(self.cursor.y) + min(self.cursor.x, self.line_length(self.cursor.y))
+
     def insert_char(self, char: str):
         """Insert text at the current cursor position."""
-        self.lines[self.cursor.y].insert(self.cursor.x, char)
+        self.table.insert(self.cursor_offset(), char)
         self.cursor.x += 1
-    
+
     def remove_char(self):
         """Remove the character at the current cursor position."""
         if self.cursor.x > 0:
-            self.lines[self.cursor.y].pop(self.cursor.x - 1)
+            self.table.delete(self.cursor_offset() - 1, 1)
             self.cursor.x -= 1
         elif self.cursor.y > 0:
-            prev_line = self.lines[self.cursor.y - 1]
-            self.cursor.x = len(prev_line)
-            self.lines[self.cursor.y - 1].extend(self.lines.pop(self.cursor.y))
+            # remove the newline, joining this line to the previous one
+            self.cursor.x = self.line_length(self.cursor.y - 1)
+            self.table.delete(self.line_start(self.cursor.y) - 1, 1)
             self.cursor.y -= 1
-    
+
     def overwrite_char(self, char: str):
         """Overwrite the character at the current cursor position."""
-        if self.cursor.x < len(self.lines[self.cursor.y]):
-            self.lines[self.cursor.y][self.cursor.x] = char
+        if self.cursor.x < self.line_length(self.cursor.y):
+            offset = self.cursor_offset()
+            self.table.delete(offset, 1)
+            self.table.insert(offset, char)
         else:
             self.insert_char(char)
@@ -0,0 +1,51 @@
+import heapq
+from itertools import count
+
+
+class Timers:
+    """
+    Deadlines, in pygame ticks, at which the window must wake up and redraw even
+    when there is no input. Used by widgets that animate, like a blinking cursor.
+    Callbacks can be run at a deadline instead, for widgets that can update the
+    screen themselves without the window redrawing.
+    """
+    def __init__(self):
+        self.deadlines = []
+        # (ticks, order added, callback), the order stops callbacks being compared
+        self.calls = []
+        self.order = count()
+
+    def wake_at(self, ticks: int):
+        if ticks not in self.deadlines:
+            heapq.heappush(self.deadlines, ticks)
+
+    def call_at(self, ticks: int, callback):
+        """Call back when the deadline passes, without asking the window to redraw."""
+        heapq.heappush(self.calls, (ticks, next(self.order), callback))
+
+    def next_timeout(self, now: int):
+        """Milliseconds until the next deadline, or None if nothing is waiting."""
+        upcoming = self.deadlines[:1] + [call[0] for call in self.calls[:1]]
+        if len(upcoming) == 0:
+            return None
+        return max(0, min(upcoming) - now)
+
+    def expire(self, now: int) -> bool:
+        """
+        Remove all deadlines that have passed and run the callbacks that are due,
+        returning True if any of the deadlines were for the window to redraw.
+        """
+        while len(self.calls) > 0 and self.calls[0][0] <= now:
+            heapq.heappop(self.calls)[2]()
+        expired = False
+        while len(self.deadlines) > 0 and self.deadlines[0] <= now:
+            heapq.heappop(self.deadlines)
+            expired = True
+        return expired
+
+    def clear(self):
+        self.deadlines = []
+        self.calls = []
+
+
+timers = Timers()
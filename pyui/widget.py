@@ -3,6 +3,8 @@ from pygame import Surface
 
 from pyui.signals import SignalHandler, SignalType
 from pyui.messaging import message_bus
+from pyui.damage import damage_tracker
+from pyui.surface_pool import surface_pool
 from pyui.helpers import (Size, Margin,Align,
                           Position, Expand, Mouse)
 
@@ -11,14 +13,21 @@ class ImageCache:
     def __init__(self, image: Surface, size: Size): 
         self.image = image
         self.size = size
+        # counts clears, so a widget can tell it was invalidated while drawing
+        self.generation = 0
 
     def update(self, new_image: Surface):
+        # the old image is only ever used by this cache, so it can be reused
+        if self.image is not new_image:
+            surface_pool.release(self.image)
         self.image = new_image
         self.size = Size(new_image.get_width(), new_image.get_height())
     
     def clear(self):
+        surface_pool.release(self.image)
         self.image = None
         self.size = None
+        self.generation += 1
 
     def matches(self, size: Size) -> bool:
         if self.image is None or self.size is None:
@@ -27,6 +36,9 @@ class ImageCache:
 
 
 class Widget:
+    # set by widgets whose render only blits the cached image when it matches the size
+    draws_from_cache = False
+
     def __init__(self, margin=None, align=None, expand=None, background=None):
         if margin is None:
             margin = Margin()
@@ -34,25 +46,134 @@ class Widget:
             align = Align(Align.CENTER, Align.CENTER)
         if expand is None:
             expand = Expand.NONE
+        # cached results of the layout pass, see invalidate_layout
+        self.measured_size = None
+        self.arrangement = None
+        self.arranged_size = None
+        self.parent = None
+        self.image = ImageCache(None, None)
         self.align = align
         self.margin = margin
         self.expand = expand
-        self.background = background
-        self.parent = None
-        self.image = ImageCache(None, None)
+        self._background = background
         self.modal = False
         self.active = False
         # default signals all widgets have
         self.signals = SignalHandler()
         self.mouse_over = False
+        # the area last drawn to the screen, used for damage tracking
+        self.drawn_area = None
+
+    @property
+    def margin(self) -> Margin:
+        return self._margin
+
+    @margin.setter
+    def margin(self, margin: Margin):
+        self._margin = margin
+        self.invalidate_layout()
+
+    @property
+    def align(self) -> Align:
+        return self._align
+
+    @align.setter
+    def align(self, align: Align):
+        self._align = align
+        self.invalidate_layout()
+
+    @property
+    def expand(self) -> Expand:
+        return self._expand
+
+    @expand.setter
+    def expand(self, expand: Expand):
+        self._expand = expand
+        self.invalidate_layout()
+
+    @property
+    def background(self):
+        return self._background
+
+    @background.setter
+    def background(self, background):
+        if background == self._background:
+            return
+        self._background = background
+        # containers draw their background without an image, so damage it here
+        damage_tracker.damage(self.drawn_area)
+        self.invalidate_paint()
+
+    @property
+    def layout_dirty(self) -> bool:
+        return self.measured_size is None
+
+    @property
+    def paint_dirty(self) -> bool:
+        return self.image.image is None
 
     @property
     def min_size(self) -> Size:
+        # callers are free to change the size they get back, so hand out a copy
+        if self.measured_size is None:
+            self.measured_size = self.measure()
+        return self.measured_size.copy()
+
+    def measure(self) -> Size:
+        """Calculate the minimum size of this widget, including margins."""
         return Size(0, 0) + self.margin.size
 
+    @property
+    def layout_children(self) -> list:
+        """The child widgets placed by arrange, in drawing order."""
+        return []
+
+    def arrange(self, size: Size) -> list:
+        """
+        Calculate where the children go when this widget is given the size.
+        Returns a list of (offset, size) pairs, one per child.
+        """
+        return []
+
+    def get_arrangement(self, size: Size) -> list:
+        if self.arrangement is None or self.arranged_size != size:
+            self.arrangement = self.arrange(size)
+            self.arranged_size = size.copy()
+        return self.arrangement
+
+    def invalidate_layout(self):
+        """
+        Drop the cached layout and image of this widget and all of its ancestors.
+        Call this when anything that changes the size of the widget is updated.
+        """
+        self.measured_size = None
+        self.arrangement = None
+        self.image.clear()
+        if self.parent is not None:
+            self.parent.invalidate_layout()
+
+    def invalidate_paint(self):
+        """
+        Drop the cached image of this widget and all of its ancestors, keeping the layout.
+        Call this when the widget looks different but its size is the same.
+        """
+        self.image.clear()
+        if self.parent is not None:
+            self.parent.invalidate_paint()
+
+    def keep_image(self, new_image: Surface, generation: int):
+        """
+        Cache an image drawn from the children, unless one of them was invalidated
+        while it was being drawn, in which case the image is already out of date.
+        """
+        if self.image.generation == generation:
+            self.image.update(new_image)
+        else:
+            surface_pool.release(new_image)
+
     def get_new_image(self, size: Size) -> Surface:
         # The surface needs to have alpha
-        new_surface = Surface((size.width, size.height), flags=pygame.SRCALPHA)
+        new_surface = surface_pool.acquire(size)
         if self.background is not None:
             new_surface.fill(self.background)
         return new_surface
@@ -117,6 +238,17 @@ class Widget:
         return (widget_xpos <= mouse.position.x <= widget_xpos + content_width and 
                 widget_ypos <= mouse.position.y <= widget_ypos + content_height)
 
+    def get_content_rect(self, pos: Position, size: Size) -> pygame.Rect:
+        """The area that responds to the mouse, as used by is_mouse_over."""
+        content_width = self.min_size.width - self.margin.width
+        content_height = self.min_size.height - self.margin.height
+        if self.align.horizontal == Align.FILL:
+            content_width = size.width - self.margin.width
+        if self.align.vertical == Align.FILL:
+            content_height = size.height - self.margin.height
+        return pygame.Rect(pos.x + self.margin.left, pos.y + self.margin.top,
+                           content_width, content_height)
+
     def handle_signals(self, mouse: Mouse, pos: Position, size: Size):
         hovered = self.is_mouse_over(mouse, pos, size)
         if hovered and not self.mouse_over:
@@ -138,12 +270,33 @@ class Widget:
     def render(self, mouse, surface: Surface, pos: Position, size: Size):
         pass
 
+    def cached_blit(self, destination: Surface, position: Position, size: Size):
+        """
+        Return the (image, position) blit that draws this widget unchanged, so a container
+        can draw many children at once. Returns None if the widget needs to render.
+        """
+        if not self.draws_from_cache or not self.image.matches(size):
+            return None
+        self.track_damage(destination, position, size, redrawn=False)
+        return self.image.image, position.as_tuple
+
+    def track_damage(self, destination: Surface, position: Position, size: Size, redrawn: bool = True):
+        """
+        Report the area this widget has drawn to, if it changed since the last frame.
+        A widget that moved also damages the area it used to cover.
+        """
+        # areas on intermediate images mean nothing on the screen
+        if destination is not damage_tracker.target:
+            return
+        area = pygame.Rect(position.x, position.y, size.width, size.height)
+        if redrawn or area != self.drawn_area:
+            damage_tracker.add(destination, area)
+            if self.drawn_area is not None and area != self.drawn_area:
+                damage_tracker.add(destination, self.drawn_area)
+        self.drawn_area = area
+
     def set_active(self, is_active):
         self.active = is_active
 
-    def __del__(self):
-        # Important: unsubscribe from all events
-        message_bus.unsubscribe(self)
-    
     def __str__(self):
         return f"{self.__class__.__name__}"
@@ -14,10 +14,18 @@ class Absolute(Widget):
                          expand=Expand.NONE)
         self.offset = pos
         self.child = child
+        self.child.parent = self
     
     def add_child(self, child: Widget):
         assert False, "Absolute layout can only have one child"
     
+    @property
+    def layout_children(self) -> list:
+        return [self.child]
+
+    def arrange(self, size):
+        return [(self.offset, size)]
+
     def render(self, mouse, destination, position, size):
         """Render the absolute layout and its children."""
         self.child.render(mouse, destination, position + self.offset, size)
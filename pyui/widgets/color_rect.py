@@ -9,14 +9,15 @@ class ColorRect(Widget):
     """
     A widget that displays a solid color rectangle.
     """
+    draws_from_cache = True
+
     def __init__(self, color: Color, size: Size, **kwargs):
         assert "align" not in kwargs, "ColorRect does not support alignment."
         super().__init__(align=Align(Align.FILL, Align.FILL), **kwargs)
         self.size = size
         self.color = color
 
-    @property
-    def min_size(self) -> Size:
+    def measure(self) -> Size:
         return self.size + self.margin.size
 
     def render(self, mouse, destination: Surface, position: Position, size: Size):
@@ -25,6 +26,7 @@ class ColorRect(Widget):
         """
         if self.image.matches(size):
             destination.blit(self.image.image, position.as_tuple)
+            self.track_damage(destination, position, size, redrawn=False)
             return
         new_image = self.get_new_image(size)
         render_pos = self.get_position(size)
@@ -43,3 +45,4 @@ class ColorRect(Widget):
                          self.color, (0, 0, render_width, render_height))
         self.image.update(new_image)
         destination.blit(new_image, (render_pos + position).as_tuple)
+        self.track_damage(destination, render_pos + position, size)
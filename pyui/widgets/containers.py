@@ -2,6 +2,7 @@ import pygame
 from pygame import Surface
 
 from pyui.widget import Widget
+from pyui.damage import damage_tracker
 from pyui.helpers import Size, Position, Align
 
 
@@ -35,18 +36,51 @@ class Container(Widget):
         self.children.append(child)
         child.parent = self
         child.set_active(self.active)
+        self.invalidate_layout()
 
     def remove_child(self, child: Widget):
         if child in self.children:
+            # nothing draws over where it was unless that is damaged
+            damage_tracker.damage(child.drawn_area)
+            child.drawn_area = None
             self.children.remove(child)
             child.set_active(False)
             child.parent = None
+            self.invalidate_layout()
     
     def set_active(self, is_active: bool):
         self.active = is_active
         for child in self.children:
             child.set_active(is_active)
 
+    @property
+    def layout_children(self) -> list:
+        return self.children
+
+    def render_children(self, mouse, destination: Surface, pos: Position, size: Size):
+        """
+        Render the children where they were arranged. Unchanged children are drawn
+        together with a single blits call, the others render themselves.
+        When repainting a damaged area, children outside it are skipped.
+        """
+        self.track_damage(destination, pos, size, redrawn=False)
+        # only set while the window repaints one damaged area of the screen at a time
+        clip = destination.get_clip() if destination is damage_tracker.repainting else None
+        blits = []
+        for child, (offset, child_size) in zip(self.children, self.get_arrangement(size)):
+            child_pos = pos + offset
+            if clip is not None and not clip.colliderect(child_pos.as_tuple, child_size.as_tuple):
+                continue
+            cached = child.cached_blit(destination, child_pos, child_size)
+            if cached is not None:
+                blits.append(cached)
+                continue
+            # keep the drawing order in case children overlap
+            destination.blits(blits, False)
+            blits = []
+            child.render(mouse, destination, child_pos, child_size)
+        destination.blits(blits, False)
+
 
 class HBox(Container):
     """
@@ -57,8 +91,7 @@ class HBox(Container):
         self.children = []
         self.spacing = spacing
 
-    @property
-    def min_size(self) -> Size:
+    def measure(self) -> Size:
         box_size = Size(0, 0)
         for child in self.children:
             child_size = child.min_size
@@ -69,7 +102,7 @@ class HBox(Container):
             box_size.width += (total_children - 1) * self.spacing
         return box_size + self.margin.size
 
-    def render(self, mouse, destination: Surface, pos: Position, size: Size):
+    def arrange(self, size: Size) -> list:
         # the total size available for children is the size minus the margin
         available_size = size - self.margin.size
         spare_width = available_size.width - self.min_size.width
@@ -83,11 +116,8 @@ class HBox(Container):
             expansions = split_pixels(total_expanding_children, spare_width)
         else:
             expansions = [0] * len(self.children)
-        if self.background is not None:
-            pygame.draw.rect(destination, self.background,
-                             (pos.x, pos.y, size.width, size.height))
-        # render each child
-        current_x = pos.x + self.margin.left
+        arrangement = []
+        current_x = self.margin.left
         for i, child in enumerate(self.children):
             child_size = child.min_size
             if i > 0:
@@ -97,9 +127,15 @@ class HBox(Container):
                 child_size.width += expansions.pop(0)
             if child.expand.vertical:
                 child_size.height = available_size.height
-            # render the child
-            child.render(mouse, destination, Position(current_x, pos.y + self.margin.top), child_size)
+            arrangement.append((Position(current_x, self.margin.top), child_size))
             current_x += child_size.width
+        return arrangement
+
+    def render(self, mouse, destination: Surface, pos: Position, size: Size):
+        if self.background is not None:
+            pygame.draw.rect(destination, self.background,
+                             (pos.x, pos.y, size.width, size.height))
+        self.render_children(mouse, destination, pos, size)
 
 class VBox(Container):
     """
@@ -110,8 +146,7 @@ class VBox(Container):
         self.children = []
         self.spacing = spacing
 
-    @property
-    def min_size(self) -> Size:
+    def measure(self) -> Size:
         box_size = Size(0, 0)
         for child in self.children:
             child_size = child.min_size
@@ -122,7 +157,7 @@ class VBox(Container):
             box_size.height += (total_children - 1) * self.spacing
         return box_size + self.margin.size
 
-    def render(self, mouse, destination: Surface, pos: Position, size: Size):
+    def arrange(self, size: Size) -> list:
         # the total size available for children is the size minus the margin
         available_size = size - self.margin.size
         spare_height = available_size.height - self.min_size.height
@@ -136,7 +171,6 @@ class VBox(Container):
             expansions = split_pixels(total_expanding_children, spare_height)
         else:
             expansions = [0] * len(self.children)
-        # render each child
 
         max_width = 0
         for child in self.children:
@@ -145,7 +179,8 @@ class VBox(Container):
                 break
             max_width = max(max_width, child.min_size.width)
 
-        current_y = pos.y + self.margin.top
+        arrangement = []
+        current_y = self.margin.top
         for i, child in enumerate(self.children):
             child_size = child.min_size
             if i > 0:
@@ -158,6 +193,9 @@ class VBox(Container):
                 child_size.width = max_width
             if child.expand.vertical:
                 child_size.height += expansions.pop(0)
-            # render the child
-            child.render(mouse, destination, Position(pos.x + self.margin.left, current_y), child_size)
+            arrangement.append((Position(self.margin.left, current_y), child_size))
             current_y += child_size.height
+        return arrangement
+
+    def render(self, mouse, destination: Surface, pos: Position, size: Size):
+        self.render_children(mouse, destination, pos, size)
@@ -2,16 +2,19 @@ import pygame
 from pygame import Surface
 
 from pyui.widget import Widget
-from pyui.widgets.nine_patch import NinePatch, NinePatchData
+from pyui.widgets.nine_patch import NinePatchData, nine_patch_cache
+from pyui.surface_pool import surface_pool
 from pyui.helpers import Size, Position, Expand
 
-# Frames cannot cache their contents as the inner widgets may want to update
+# Frames cache their contents, inner widgets that change invalidate the frame
 
 class Frame(Widget):
     """
     A widget that wraps a child widget in a nine-patch frame.
     The inner size of the nine-patch is exactly that of the contained widget.
     """
+    draws_from_cache = True
+
     def __init__(self, child: Widget, nine_patch_data: NinePatchData, **kwargs):
         super().__init__(**kwargs)
         self.child = child
@@ -19,8 +22,7 @@ class Frame(Widget):
         self.nine_patch_data = nine_patch_data
         # Don't create the NinePatch here as we need dynamic sizing based on the child
 
-    @property
-    def min_size(self) -> Size:
+    def measure(self) -> Size:
         # Frame size is child size plus the nine patch borders and padding
         n = self.nine_patch_data
         child_size = self.child.min_size
@@ -32,13 +34,10 @@ class Frame(Widget):
 
     def get_new_image(self, size: Size) -> Surface:
         # The surface needs to have alpha
-        return Surface((size.width, size.height), flags=pygame.SRCALPHA)
+        return surface_pool.acquire(size)
 
-    def render(self, mouse, destination: Surface, position: Position, size: Size):
-        """
-        Render the nine patch frame and the child widget inside it.
-        """
-        new_image = self.get_new_image(size)
+    def get_frame_area(self, size: Size):
+        """Return the position and size of the nine patch inside the given size."""
         render_pos = self.get_position(size)
         # Add the margin left and top
         render_pos.x += self.margin.left
@@ -53,16 +52,43 @@ class Frame(Widget):
             render_height = size.height - self.margin.height
         
         # Calculate size available for the nine patch
-        frame_size = Size(render_width, render_height)
-        
+        return render_pos, Size(render_width, render_height)
+
+    @property
+    def layout_children(self) -> list:
+        return [self.child]
+
+    def arrange(self, size: Size) -> list:
+        n = self.nine_patch_data
+        render_pos, frame_size = self.get_frame_area(size)
+        child_size = Size(frame_size.width - n.left - n.right,
+                          frame_size.height - n.top - n.bottom)
+        return [(render_pos + Position(n.left, n.top), child_size)]
+
+    def render(self, mouse, destination: Surface, position: Position, size: Size):
+        """
+        Render the nine patch frame and the child widget inside it.
+        """
+        if self.image.matches(size):
+            destination.blit(self.image.image, position.as_tuple)
+            self.track_damage(destination, position, size, redrawn=False)
+            return
+        generation = self.image.generation
+        new_image = self.compose(mouse, size)
+        destination.blit(new_image, position.as_tuple)
+        self.track_damage(destination, position, size)
+        self.keep_image(new_image, generation)
+
+    def compose(self, mouse, size: Size) -> Surface:
+        new_image = self.get_new_image(size)
+        render_pos, frame_size = self.get_frame_area(size)
+
         # Create a temporary surface for the frame and child
-        frame_surface = Surface(frame_size.as_tuple).convert_alpha()
-        frame_surface.fill((0, 0, 0, 0))
+        frame_surface = surface_pool.acquire(frame_size)
         
-        # Create a NinePatch with the correct size for this rendering
+        # The nine patch at this size is shared with other frames using the same data
         n = self.nine_patch_data
-        nine_patch = NinePatch(self.nine_patch_data, frame_size)
-        nine_patch.render(mouse, frame_surface, Position(0, 0), frame_size)
+        frame_surface.blit(nine_patch_cache.get(n, frame_size), (0, 0))
         child_pos = Position(n.left, n.top)
         child_size = Size(
             frame_size.width - n.left - n.right,
@@ -75,7 +101,8 @@ class Frame(Widget):
                              (child_pos.x, child_pos.y, child_size.width, child_size.height))
         self.child.render(mouse, frame_surface, child_pos, child_size)
         new_image.blit(frame_surface, render_pos.as_tuple)
-        destination.blit(new_image, position.as_tuple)
+        surface_pool.release(frame_surface)
+        return new_image
 
     def set_active(self, is_active):
         self.active = is_active
@@ -9,13 +9,30 @@ class Image(Widget):
     """
     A widget that displays an image
     """
+    draws_from_cache = True
+
     def __init__(self, image: Surface, **kwargs):
         super().__init__(**kwargs)
         self.size = Size(image.get_width(), image.get_height())
         self.render_image = image
 
-    @property
-    def min_size(self) -> Size:
+    @classmethod
+    def from_pending(cls, pending, **kwargs):
+        """An image that shows the placeholder of a pending asset until it has loaded."""
+        image = cls(pending.surface, **kwargs)
+        pending.when_ready(image.set_image)
+        return image
+
+    def set_image(self, image: Surface):
+        self.render_image = image
+        new_size = Size(image.get_width(), image.get_height())
+        if new_size != self.size:
+            self.size = new_size
+            self.invalidate_layout()
+        else:
+            self.invalidate_paint()
+
+    def measure(self) -> Size:
         return self.size + self.margin.size
 
     def render(self, mouse, destination: Surface, position: Position, size: Size):
@@ -24,6 +41,7 @@ class Image(Widget):
         """
         if self.image.matches(size):
             destination.blit(self.image.image, position.as_tuple)
+            self.track_damage(destination, position, size, redrawn=False)
             return
         new_image = self.get_new_image(size)
         render_pos = self.get_position(size)
@@ -34,3 +52,4 @@ class Image(Widget):
         new_image.blit(self.render_image, render_pos.as_tuple)
         self.image.update(new_image)
         destination.blit(self.image.image, position.as_tuple)
+        self.track_damage(destination, position, size)
@@ -9,6 +9,8 @@ class Label(Widget):
     """
     A widget that displays text.
     """
+    draws_from_cache = True
+
     def __init__(self, text, font, color=(0, 0, 0), **kwargs):
         """
         Initialize a Label widget.
@@ -22,14 +24,17 @@ class Label(Widget):
         self.text = text
         self.font = font
         self.color = color
+        self.size = None
         self.update_size()
 
     def update_size(self):
         """Update the size based on the text content."""
-        self.size = self.font.size_of(self.text)
+        new_size = self.font.size_of(self.text)
+        if new_size != self.size:
+            self.size = new_size
+            self.invalidate_layout()
 
-    @property
-    def min_size(self) -> Size:
+    def measure(self) -> Size:
         return self.size + self.margin.size
     
     def set_text(self, new_text):
@@ -38,8 +43,7 @@ class Label(Widget):
             return
         self.text = new_text
         self.update_size()
-        # Reset the image cache
-        self.image.clear()
+        self.invalidate_paint()
 
     def render(self, mouse, destination: Surface, position: Position, size: Size):
         """
@@ -47,6 +51,7 @@ class Label(Widget):
         """
         if self.image.matches(size):
             destination.blit(self.image.image, position.as_tuple)
+            self.track_damage(destination, position, size, redrawn=False)
             return
         
         new_image = self.get_new_image(size)
@@ -63,3 +68,4 @@ class Label(Widget):
         # Update the image cache
         self.image.update(new_image)
         destination.blit(new_image, position.as_tuple)
+        self.track_damage(destination, position, size)
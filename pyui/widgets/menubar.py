@@ -5,6 +5,7 @@ from pyui.helpers import Margin, Align, Expand, Position
 from pyui.assets import get_font, get_nine_patch_data, get_icon
 from pyui.messaging import message_bus, MessageType, Message
 from pyui.keys import keys, Key
+from pyui.signals import SignalType
 
 
 class MenuSelection(HBox):
@@ -25,28 +26,22 @@ class MenuSelection(HBox):
         if keys is not None:
             self.add_child(Label(keys, get_font("creato.otf", 16),
                                  (60, 60, 46), align=Align(Align.RIGHT, Align.CENTER)))
-    
-    def render(self, mouse, destination, position, size):
-        if keys.is_pressed(Key.ESCAPE):
-            message_bus.post(Message(MessageType.REMOVE_MODAL, self))
-            return
-        real_position = position + self.parent.parent.pos
-        self.handle_signals(mouse, real_position, size)
-        if self.mouse_over:
-            self.background = (150, 150, 150, 255)
-        else:
-            # if clicked, we need to close
-            if mouse.left.down:
-                message_bus.post(Message(MessageType.REMOVE_MODAL, self))
-                return
-            self.background = None
-        # also close if the escape key is pressed
-        return super().render(mouse, destination, position, size)
+        # the window tells us when the mouse moves over, the menu then redraws
+        self.signals.callbacks[SignalType.MOUSE_IN].append(self.highlight)
+        self.signals.callbacks[SignalType.MOUSE_OUT].append(self.unhighlight)
+
+    def highlight(self, widget):
+        self.background = (150, 150, 150, 255)
+
+    def unhighlight(self, widget):
+        self.background = None
 
 
 class Menu(Frame):
+    # the menu checks for input every frame
+    draws_from_cache = False
+
     def __init__(self, *args, **kwargs):
-        self.pos = Position(0, 0)
         patch_data = get_nine_patch_data("frame.json")
         background = (180, 180, 180)
         box = VBox()
@@ -55,20 +50,51 @@ class Menu(Frame):
             box.add_child(MenuSelection(i, icon))
         super().__init__(box, patch_data, background=background,
                          align=Align(Align.LEFT, Align.TOP))
+        self.pos = Position(0, 0)
+
+    @property
+    def pos(self) -> Position:
+        return self._pos
+
+    @pos.setter
+    def pos(self, pos: Position):
+        self._pos = pos
+        self.invalidate_layout()
+
+    def arrange(self, size):
+        return [(offset + self.pos, child_size) for offset, child_size in super().arrange(size)]
+
+    def get_content_rect(self, pos, size):
+        return super().get_content_rect(pos + self.pos, size)
     
     def render(self, mouse, destination, position, size):
+        # close if the escape key is pressed or the mouse clicked anywhere
+        if keys.is_pressed(Key.ESCAPE) or mouse.left.down:
+            message_bus.post(Message(MessageType.REMOVE_MODAL, self))
+            return
         super().render(mouse, destination, position + self.pos, size)
 
 
 class MenuItem(Label):
     """A menu item that can be clicked."""
+    # the menu item checks for clicks every frame
+    draws_from_cache = False
+
     def __init__(self, text: str, font, menu: Menu, **kwargs):
         super().__init__(text, font, (40, 40, 40),
                          margin=Margin(12, 12, 5, 5), **kwargs)
         self.menu = menu
         self.menu.modal = True
+        self.signals.callbacks[SignalType.MOUSE_IN].append(self.highlight)
+        self.signals.callbacks[SignalType.MOUSE_OUT].append(self.unhighlight)
         message_bus.subscribe(self, MessageType.ESCAPE_PRESSED, self.escape_pressed)
 
+    def highlight(self, widget):
+        self.background = (100, 100, 100, 255)
+
+    def unhighlight(self, widget):
+        self.background = (0, 0, 0, 0)
+
     def display_menu(self, position, size, width):
         # if the width of the menu overflows the screen, move the menu to the left
         overflow = (position.x + self.menu.min_size.width) - width
@@ -79,13 +105,9 @@ class MenuItem(Label):
         message_bus.post(Message(MessageType.ADD_WIDGET, self, self.menu))
 
     def render(self, mouse, destination, position, size):
-        self.image.clear()
-        if self.is_mouse_over(mouse, position, size):
-            if mouse.left.down:
-                self.display_menu(position, size, destination.get_width())
-            self.background = (100, 100, 100, 255)
-        else:
-            self.background = (0, 0, 0, 0)
+        # the background follows the mouse, so the cached image is only redrawn on a change
+        if self.mouse_over and mouse.left.down:
+            self.display_menu(position, size, destination.get_width())
         return super().render(mouse, destination, position, size)
     
     def escape_pressed(self):
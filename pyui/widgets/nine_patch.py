@@ -1,41 +1,48 @@
 # filepath: /home/sparky/code/PyUI/pyui/widgets/nine_patch.py
 import json
+import math
+import pygame
 
 from pathlib import Path
+from collections import OrderedDict
 from pygame import Surface
 from pygame import transform
 from dataclasses import dataclass
 
 from pyui.widget import Widget
 from pyui.helpers import Size, Position
-from pyui.assets import get_nine_patch, ASSETS_FOLDER
+from pyui.assets import get_nine_patch, read_asset
+from pyui.surface_pool import surface_bytes
+
+# bytes of sliced and composed nine patches that are kept
+DEFAULT_NINE_PATCH_BUDGET = 8 * 1024 * 1024
+# tiled pieces are repeated to at least this many pixels once, so filling an area takes few blits
+TILE_STRIP_LENGTH = 256
 
 
 @dataclass
 class NinePatchData:
     """
-    Stores the sizes of the nine patch corners and the associated image
+    Stores the sizes of the nine patch corners and the associated image.
+    If tile is set, the edges and center are repeated rather than stretched.
     """
     top: int
     bottom: int
     left: int
     right: int
     image: Surface = None
+    tile: bool = False
     
     @classmethod
     def from_json(cls, json_name: str):            
-        json_path = ASSETS_FOLDER / "nine_patch" / json_name
-        if not json_path.exists():
-            raise FileNotFoundError(f"Nine patch JSON '{json_name}' not found in assets.")
-            
-        with open(json_path, 'r') as f:
-            data = json.load(f)
+        data = json.loads(read_asset("nine_patch", json_name, "Nine patch JSON"))
         
         # Create the instance with corner measurements
         instance = cls(top=data.get('top', 0),
                        bottom=data.get('bottom', 0),
                        left=data.get('left', 0),
-                       right=data.get('right', 0))
+                       right=data.get('right', 0),
+                       tile=data.get('tile', False))
         
         # Extract the base name without extension
         base_name = Path(json_name).stem
@@ -44,6 +51,159 @@ class NinePatchData:
         return instance
 
 
+def repeat(piece: Surface, across: bool, down: bool) -> Surface:
+    """Repeat the piece in the given directions until it is at least TILE_STRIP_LENGTH long."""
+    width, height = piece.get_size()
+    if width == 0 or height == 0:
+        return piece
+    count_x = math.ceil(TILE_STRIP_LENGTH / width) if across else 1
+    count_y = math.ceil(TILE_STRIP_LENGTH / height) if down else 1
+    strip = Surface((width * count_x, height * count_y), flags=pygame.SRCALPHA)
+    strip.blits([(piece, (x * width, y * height)) for x in range(count_x) for y in range(count_y)], False)
+    return strip
+
+
+def fill_blits(strip: Surface, area: pygame.Rect) -> list:
+    """The blits that cover the area with copies of the strip, cropping the last ones."""
+    width, height = strip.get_size()
+    if width == 0 or height == 0:
+        return []
+    return [(strip, (x, y), (0, 0, min(width, area.right - x), min(height, area.bottom - y)))
+            for y in range(area.top, area.bottom, height)
+            for x in range(area.left, area.right, width)]
+
+
+class NinePatchPieces:
+    """
+    The nine parts of a nine patch image, cut out once.
+    Corners are drawn as they are, the edges and center are stretched, or for
+    tiled nine patches repeated from strips that are also only built once.
+    """
+    def __init__(self, data: NinePatchData):
+        self.data = data
+        width = data.image.get_width()
+        height = data.image.get_height()
+        inner_width = width - data.left - data.right
+        inner_height = height - data.top - data.bottom
+        self.top_left = self.cut(0, 0, data.left, data.top)
+        self.top_right = self.cut(width - data.right, 0, data.right, data.top)
+        self.bottom_left = self.cut(0, height - data.bottom, data.left, data.bottom)
+        self.bottom_right = self.cut(width - data.right, height - data.bottom, data.right, data.bottom)
+        self.top = self.cut(data.left, 0, inner_width, data.top)
+        self.bottom = self.cut(data.left, height - data.bottom, inner_width, data.bottom)
+        self.left = self.cut(0, data.top, data.left, inner_height)
+        self.right = self.cut(width - data.right, data.top, data.right, inner_height)
+        self.center = self.cut(data.left, data.top, inner_width, inner_height)
+        if data.tile:
+            self.make_strips()
+        self.bytes = sum(surface_bytes(surface) for surface in vars(self).values() if isinstance(surface, Surface))
+
+    def cut(self, x: int, y: int, width: int, height: int) -> Surface:
+        return self.data.image.subsurface((x, y, width, height)).copy()
+
+    def make_strips(self):
+        self.top_strip = repeat(self.top, True, False)
+        self.bottom_strip = repeat(self.bottom, True, False)
+        self.left_strip = repeat(self.left, False, True)
+        self.right_strip = repeat(self.right, False, True)
+        self.center_strip = repeat(self.center, True, True)
+
+    def compose(self, size: Size) -> Surface:
+        """Draw the nine patch at the given size."""
+        n = self.data
+        surface = Surface(size.as_tuple, flags=pygame.SRCALPHA)
+        surface.blits([
+            (self.top_left, (0, 0)),
+            (self.top_right, (size.width - n.right, 0)),
+            (self.bottom_left, (0, size.height - n.bottom)),
+            (self.bottom_right, (size.width - n.right, size.height - n.bottom))], False)
+        if n.tile:
+            surface.blits(self.tiled_blits(size), False)
+        else:
+            surface.blits(self.scaled_blits(size), False)
+        return surface
+
+    def scaled_blits(self, size: Size) -> list:
+        n = self.data
+        inner_width = size.width - n.left - n.right
+        inner_height = size.height - n.top - n.bottom
+        return [(transform.scale(self.top, (inner_width, n.top)), (n.left, 0)),
+                (transform.scale(self.bottom, (inner_width, n.bottom)), (n.left, size.height - n.bottom)),
+                (transform.scale(self.left, (n.left, inner_height)), (0, n.top)),
+                (transform.scale(self.right, (n.right, inner_height)), (size.width - n.right, n.top)),
+                (transform.scale(self.center, (inner_width, inner_height)), (n.left, n.top))]
+
+    def tiled_blits(self, size: Size) -> list:
+        n = self.data
+        inner_width = size.width - n.left - n.right
+        inner_height = size.height - n.top - n.bottom
+        return (fill_blits(self.top_strip, pygame.Rect(n.left, 0, inner_width, n.top)) +
+                fill_blits(self.bottom_strip, pygame.Rect(n.left, size.height - n.bottom, inner_width, n.bottom)) +
+                fill_blits(self.left_strip, pygame.Rect(0, n.top, n.left, inner_height)) +
+                fill_blits(self.right_strip, pygame.Rect(size.width - n.right, n.top, n.right, inner_height)) +
+                fill_blits(self.center_strip, pygame.Rect(n.left, n.top, inner_width, inner_height)))
+
+
+def patch_key(data: NinePatchData) -> tuple:
+    # the dataclass itself is not hashable, and data loaded from the same json shares the image
+    return (data.image, data.top, data.bottom, data.left, data.right, data.tile)
+
+
+class NinePatchCache:
+    """
+    Sliced pieces for the nine patches in use, and the most recently drawn sizes
+    of each. Shared by all widgets, as the same frame is often drawn at the same size.
+    Over the byte budget the least recently used sizes are dropped, then pieces, so
+    images the file cache dropped are not kept alive here.
+    Composed surfaces are handed out to many widgets, so must never be drawn on.
+    """
+    def __init__(self, budget: int = DEFAULT_NINE_PATCH_BUDGET):
+        self.budget = budget
+        self.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_pieces(self, data: NinePatchData) -> NinePatchPieces:
+        key = patch_key(data)
+        pieces = self.pieces.get(key)
+        if pieces is not None:
+            self.pieces.move_to_end(key)
+            return pieces
+        pieces = NinePatchPieces(data)
+        self.pieces[key] = pieces
+        self.total_bytes += pieces.bytes
+        self.evict()
+        return pieces
+
+    def get(self, data: NinePatchData, size: Size) -> Surface:
+        key = patch_key(data) + size.as_tuple
+        if key in self.composed:
+            self.hits += 1
+            self.composed.move_to_end(key)
+            return self.composed[key]
+        self.misses += 1
+        surface = self.get_pieces(data).compose(size)
+        self.composed[key] = surface
+        self.total_bytes += surface_bytes(surface)
+        self.evict()
+        return surface
+
+    def evict(self):
+        # the newest of each is kept, even if it is larger than the budget
+        while self.total_bytes > self.budget and len(self.composed) > 1:
+            self.total_bytes -= surface_bytes(self.composed.popitem(last=False)[1])
+        while self.total_bytes > self.budget and len(self.pieces) > 1:
+            self.total_bytes -= self.pieces.popitem(last=False)[1].bytes
+
+    def clear(self):
+        self.pieces = OrderedDict()
+        self.composed = OrderedDict()
+        self.total_bytes = 0
+
+
+nine_patch_cache = NinePatchCache()
+
+
 class NinePatch(Widget):
     """
     A widget that displays a nine-patch image which can be expanded to 
@@ -52,6 +212,8 @@ class NinePatch(Widget):
     The nine-patch can be sized either based on its corner measurements (minimum)
     or with an explicit minimum size provided through the size parameter.
     """
+    draws_from_cache = True
+
     def __init__(self, nine_patch_data: NinePatchData, size: Size = None, **kwargs):
         super().__init__(**kwargs)
         self.nine_patch_data = nine_patch_data
@@ -65,8 +227,7 @@ class NinePatch(Widget):
         # This widget is self-expanding by default
         self.expanding = True
     
-    @property
-    def min_size(self) -> Size:
+    def measure(self) -> Size:
         return self.size + self.margin.size
 
     def render(self, mouse, destination: Surface, position: Position, size: Size):
@@ -75,7 +236,8 @@ class NinePatch(Widget):
         Stretches the center parts to fit the given size while preserving corners.
         """
         if self.image.matches(size):
-            destination.blit(self.image, position)
+            destination.blit(self.image.image, position.as_tuple)
+            self.track_damage(destination, position, size, redrawn=False)
             return
 
         new_image = self.get_new_image(size)
@@ -92,51 +254,8 @@ class NinePatch(Widget):
         if self.expand.vertical:
             render_height = size.height - self.margin.height
         
-        # Create a new surface for the nine-patch rendering
-        patch_surface = Surface((render_width, render_height)).convert_alpha()
-        patch_surface.fill((0, 0, 0, 0))
-        n = self.nine_patch_data
-        
-        # Draw the corners (they remain the same size)
-        # Top-left corner
-        patch_surface.blit(self.render_image.subsurface((0, 0, n.left, n.top)), (0, 0))
-
-        patch_surface.blit(self.render_image.subsurface((self.img_size.width - n.right, 0, n.right, n.top)),
-                           (render_width - n.right, 0))
-        patch_surface.blit(self.render_image.subsurface((0, self.img_size.height - n.bottom, n.left, n.bottom)),
-                           (0, render_height - n.bottom))
-        patch_surface.blit(self.render_image.subsurface(
-            (self.img_size.width - n.right, self.img_size.height - n.bottom, n.right, n.bottom)),
-            (render_width - n.right, render_height - n.bottom))
-        
-        # Top edge
-        top_edge = self.render_image.subsurface((n.left, 0, self.img_size.width - n.left - n.right, n.top))
-        scaled_top_edge = transform.scale(top_edge, (render_width - n.left - n.right, n.top))
-        patch_surface.blit(scaled_top_edge, (n.left, 0))
-        
-        # Bottom edge
-        bottom_edge = self.render_image.subsurface((n.left, self.img_size.height - n.bottom, 
-                                            self.img_size.width - n.left - n.right, n.bottom))
-        scaled_bottom_edge = transform.scale(bottom_edge, (render_width - n.left - n.right, n.bottom))
-        patch_surface.blit(scaled_bottom_edge, (n.left, render_height - n.bottom))
-        
-        # Left edge
-        left_edge = self.render_image.subsurface((0, n.top, n.left, self.img_size.height - n.top - n.bottom))
-        scaled_left_edge = transform.scale(left_edge, (n.left, render_height - n.top - n.bottom))
-        patch_surface.blit(scaled_left_edge, (0, n.top))
-        
-        # Right edge
-        right_edge = self.render_image.subsurface((self.img_size.width - n.right, n.top, n.right, self.img_size.height - n.top - n.bottom))
-        scaled_right_edge = transform.scale(right_edge,
-                                            (n.right, render_height - n.top - n.bottom))
-        patch_surface.blit(scaled_right_edge, (render_width - n.right, n.top))
-        # Center section
-        center = self.render_image.subsurface((n.left, n.top, self.img_size.width - n.left - n.right,
-                                        self.img_size.height - n.top - n.bottom))
-        scaled_center = transform.scale(center, 
-                                    (render_width - n.left - n.right, 
-                                     render_height - n.top - n.bottom))
-        patch_surface.blit(scaled_center, (n.left, n.top))
-        new_image.blit(patch_surface, (render_pos.x, render_pos.y))
+        patch = nine_patch_cache.get(self.nine_patch_data, Size(render_width, render_height))
+        new_image.blit(patch, (render_pos.x, render_pos.y))
         self.image.update(new_image)
         destination.blit(new_image, position.as_tuple)
+        self.track_damage(destination, position, size)
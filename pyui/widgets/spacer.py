@@ -7,8 +7,7 @@ class Spacer(Widget):
     def __init__(self, expand):
         super().__init__(expand=expand)
 
-    @property
-    def min_size(self):
+    def measure(self) -> Size:
         return Size(0, 0)
     
     def render(self, mouse, surface, pos, size):
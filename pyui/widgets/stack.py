@@ -10,6 +10,8 @@ class Stack(Container):
     A container widget that stacks multiple widgets on top of each other.
     The last widget in the list will be drawn last (on top).
     """
+    draws_from_cache = True
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.children = []
@@ -19,8 +21,7 @@ class Stack(Container):
         child.background = None
         super().add_child(child)
 
-    @property
-    def min_size(self) -> Size:
+    def measure(self) -> Size:
         """
         The minimum size is the size of the largest child widget plus margins.
         """
@@ -31,13 +32,20 @@ class Stack(Container):
             box_size.height = max(box_size.height, child_size.height)
         return box_size + self.margin.size
 
-    def render(self, mouse, destination: Surface, pos: Position, size: Size):
-        new_image = self.get_new_image(size)
-        if self.background is not None:
-            new_image.fill(self.background)
-        # The total size available for children is the size minus the margin
+    def arrange(self, size: Size) -> list:
+        # every child gets the whole area inside the margin
         available_size = size - self.margin.size
         margin_pos = Position(self.margin.left, self.margin.top)
-        for child in self.children:
-            child.render(mouse, new_image, margin_pos, available_size)
+        return [(margin_pos, available_size)] * len(self.children)
+
+    def render(self, mouse, destination: Surface, pos: Position, size: Size):
+        if self.image.matches(size):
+            destination.blit(self.image.image, pos.as_tuple)
+            self.track_damage(destination, pos, size, redrawn=False)
+            return
+        generation = self.image.generation
+        new_image = self.get_new_image(size)
+        self.render_children(mouse, new_image, Position(0, 0), size)
         destination.blit(new_image, pos.as_tuple)
+        self.track_damage(destination, pos, size)
+        self.keep_image(new_image, generation)
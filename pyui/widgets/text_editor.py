@@ -1,48 +1,289 @@
 import pygame
+from collections import OrderedDict
 
 from pyui.widget import Widget
 from pyui.helpers import Position, Margin, Size
 from pyui.assets import get_font
 from pyui.text import TextStore
+from pyui.text.highlight import Highlighter, TokenKind, color_runs
+from pyui.timers import timers
 
 # milliseconds
 CURSOR_BLINK_RATE = 500
+CURSOR_COLOR = (0, 0, 0)
+# rendered lines kept for redrawing and scrolling
+MAX_CACHED_LINES = 1024
+# nothing past this fits in an editor, and very long lines are too wide to render
+MAX_RENDERED_CHARACTERS = 512
+TAB_SIZE = 4
+SYNTAX_COLORS = {
+    TokenKind.KEYWORD: (0, 0, 160),
+    TokenKind.BUILTIN: (120, 40, 140),
+    TokenKind.DEFINITION: (0, 110, 120),
+    TokenKind.STRING: (20, 120, 20),
+    TokenKind.NUMBER: (170, 80, 0),
+    TokenKind.COMMENT: (120, 120, 120),
+}
 
 
 def get_font_size(font):
     font_size = Size(0, font.get_linesize())
 
 
+def display_text(line: str) -> str:
+    return line[:MAX_RENDERED_CHARACTERS].expandtabs(TAB_SIZE)
+
+
+def expand_tabs(text: str, column: int) -> str:
+    """Expand the tabs of text that starts part way along a line."""
+    return (" " * column + text).expandtabs(TAB_SIZE)[column:]
+
+
+class LineCache:
+    """
+    Rendered lines of text, keyed by their content, so a line is only rasterized once
+    however often the editor redraws and wherever it scrolls to. With a lexer, lines
+    are colored, and keyed by the lexer state they start in as well.
+    """
+    def __init__(self, font, color, size: int = MAX_CACHED_LINES, lexer=None, colors=None):
+        self.font = font
+        self.color = color
+        self.size = size
+        self.lexer = lexer
+        self.colors = SYNTAX_COLORS if colors is None else colors
+        self.lines: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, line: str, state=None) -> pygame.Surface:
+        key = (line, state)
+        surface = self.lines.get(key)
+        if surface is not None:
+            self.lines.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.render(line, state)
+        self.lines[key] = surface
+        if len(self.lines) > self.size:
+            self.lines.popitem(last=False)
+        return surface
+
+    def render(self, line: str, state) -> pygame.Surface:
+        # not through Font.render, which would fill the shared text cache with lines
+        if self.lexer is None:
+            return self.font.font.render(display_text(line), True, self.color)
+        text = line[:MAX_RENDERED_CHARACTERS]
+        column = 0
+        runs = []
+        for run, kind in color_runs(text, self.lexer.lex(text, state)[0]):
+            shown = expand_tabs(run, column)
+            column += len(shown)
+            runs.append(self.font.font.render(shown, True, self.colors.get(kind, self.color)))
+        surface = pygame.Surface((sum(run.get_width() for run in runs), self.font.height), flags=pygame.SRCALPHA)
+        x = 0
+        for run in runs:
+            surface.blit(run, (x, 0))
+            x += run.get_width()
+        return surface
+
+    def clear(self):
+        self.lines = OrderedDict()
+
+
 class TextEditor(Widget):
-    def __init__(self, background=(250, 245, 245),
-                 margin=Margin(4, 4, 4, 4), **kwargs):
+    """
+    Edits a TextStore. Only the lines in view are drawn, from a cache of rendered
+    lines, and scrolling moves the cached image so only lines coming into view are drawn.
+    The cursor blinks on a timer that redraws just the cursor, so an idle editor
+    leaves the window idle.
+    """
+    def __init__(self, background=(250, 245, 245), color=(0, 0, 0),
+                 margin=Margin(4, 4, 4, 4), lexer=None, **kwargs):
         super().__init__(background=background, margin=margin, **kwargs)
         self.text = TextStore()
         self.cursor_position = Position(self.margin.left, self.margin.top)
-        self.cursor_size = Size(20, 20)
         self.font = get_font('creato.otf', 16)
-    
-    def render_cursor(self, destination, position):
-        # on or off?
-        time = pygame.time.get_ticks() // CURSOR_BLINK_RATE
-        if time % 2 == 0:
-            # don't draw the cursor
+        self.line_height = self.font.height
+        self.cursor_size = Size(1, self.line_height)
+        self.cursor_visible = True
+        # when the cursor blinks next, None if it is not blinking
+        self.next_blink = None
+        # the surface and position the editor was last drawn at, so the cursor can be redrawn alone
+        self.drawn_on = None
+        self.drawn_position = None
+        self.lines = LineCache(self.font, color, lexer=lexer)
+        # the lexer states lines start in, for syntax highlighting
+        self.highlighter = None if lexer is None else Highlighter(lexer)
+        # the first line in view, and the first line drawn in the cached image
+        self.top_line = 0
+        self.image_top = 0
+
+    def load_file(self, path, encoding: str = "utf-8"):
+        """Edit a file, which is only read as far as the lines shown."""
+        self.text.load(path, encoding)
+        self.top_line = 0
+        if self.highlighter is not None:
+            self.highlighter.reset()
+        self.invalidate_paint()
+
+    def text_changed(self, y: int, added_lines: int = 0):
+        """Redraw after line y was edited, and lines were added after it, or removed if negative."""
+        if self.highlighter is not None:
+            self.highlighter.edited(self.text, y, added_lines)
+        # the cursor stays on while typing
+        self.cursor_visible = True
+        self.schedule_blink()
+        # lines that did not change are drawn from the line cache
+        self.invalidate_paint()
+
+    def insert_char(self, char: str):
+        y = self.text.cursor.y
+        self.text.insert_char(char)
+        self.text_changed(y, char.count("\n"))
+
+    def remove_char(self):
+        joined = self.text.cursor.x == 0 and self.text.cursor.y > 0
+        self.text.remove_char()
+        self.text_changed(self.text.cursor.y, -1 if joined else 0)
+
+    def overwrite_char(self, char: str):
+        y = self.text.cursor.y
+        self.text.overwrite_char(char)
+        self.text_changed(y, char.count("\n"))
+
+    def line_state(self, y: int):
+        return None if self.highlighter is None else self.highlighter.state_at(self.text, y)
+
+    def scroll(self, lines: int):
+        """Move the view down by a number of lines, or up if negative."""
+        top = max(0, self.top_line + lines)
+        # no further than the last line, without counting the lines of a file beyond it
+        top = max(0, min(top, self.text.count_lines(top + 1) - 1))
+        if top == self.top_line:
             return
-        
-        start_x = position.x + self.cursor_position.x
-        start_y = position.y + self.cursor_position.y
-        pygame.draw.line(destination, (0, 0, 0),
-                         (start_x, start_y),
-                         (start_x, start_y + self.cursor_size.height))
+        self.top_line = top
+        # keep the cached image, render moves it
+        if self.parent is not None:
+            self.parent.invalidate_paint()
+
+    def text_area(self, size: Size) -> pygame.Rect:
+        return pygame.Rect(self.margin.left, self.margin.top,
+                           size.width - self.margin.width, size.height - self.margin.height)
+
+    def visible_lines(self, size: Size) -> int:
+        # including the last line, which may only be partly in view
+        return -(-self.text_area(size).height // self.line_height)
+
+    def draw_lines(self, image: pygame.Surface, size: Size, first: int, last: int):
+        """Draw the rows of text between first and last, counted from the top of the view."""
+        area = self.text_area(size)
+        image.set_clip(area)
+        rows = pygame.Rect(area.x, area.y + first * self.line_height, area.width, (last - first) * self.line_height)
+        image.fill(self.background if self.background is not None else (0, 0, 0, 0), rows)
+        blits = []
+        for row, text in enumerate(self.text.lines_from(self.top_line + first, last - first), first):
+            line = self.lines.get(text, self.line_state(self.top_line + row))
+            blits.append((line, (area.x, area.y + row * self.line_height)))
+        image.blits(blits, False)
+        image.set_clip(None)
+
+    def scroll_image(self, size: Size):
+        """Move the cached image by the lines scrolled, and draw the lines that came into view."""
+        rows = self.visible_lines(size)
+        scrolled = self.top_line - self.image_top
+        self.image_top = self.top_line
+        if abs(scrolled) >= rows:
+            self.draw_lines(self.image.image, size, 0, rows)
+            return
+        self.image.image.set_clip(self.text_area(size))
+        self.image.image.scroll(0, -scrolled * self.line_height)
+        if scrolled > 0:
+            # the line that was cut off at the bottom is drawn whole
+            self.draw_lines(self.image.image, size, rows - scrolled - 1, rows)
+        else:
+            self.draw_lines(self.image.image, size, 0, -scrolled)
+
+    def update_cursor_position(self):
+        cursor = self.text.cursor
+        x = 0
+        if self.text.has_line(cursor.y):
+            x = self.font.size_of(display_text(self.text.line(cursor.y)[:cursor.x])).width
+        self.cursor_position = Position(self.margin.left + x,
+                                        self.margin.top + (cursor.y - self.top_line) * self.line_height)
+
+    def cursor_area(self, size: Size):
+        """The area the cursor covers in the editor, or None when it is out of view."""
+        self.update_cursor_position()
+        area = pygame.Rect(self.cursor_position.as_tuple, self.cursor_size.as_tuple)
+        return area if self.text_area(size).contains(area) else None
+
+    def render_cursor(self, destination, position, size):
+        area = self.cursor_area(size)
+        if self.cursor_visible and area is not None:
+            destination.fill(CURSOR_COLOR, area.move(position.as_tuple))
+
+    def schedule_blink(self):
+        blink_at = pygame.time.get_ticks() + CURSOR_BLINK_RATE
+        self.next_blink = blink_at
+        timers.call_at(blink_at, lambda: self.blink(blink_at))
+
+    def find_window(self) -> tuple:
+        """The window the editor is in, or None, and the top level widget holding it."""
+        root = self
+        while isinstance(root.parent, Widget):
+            root = root.parent
+        return root.parent, root
+
+    def blink(self, ticks: int):
+        # a newer blink was scheduled since
+        if ticks != self.next_blink:
+            return
+        window, root = self.find_window()
+        if window is None:
+            # no longer shown, the next render starts blinking again
+            self.next_blink = None
+            return
+        self.cursor_visible = not self.cursor_visible
+        self.schedule_blink()
+        if self.image.image is None or root not in window.visible_widgets:
+            # the editor is drawn anyway, or it is hidden
+            return
+        if self.drawn_on is window.screen:
+            self.repaint_cursor(window.screen)
+        else:
+            # drawn into a container's image, which has to be drawn again
+            self.parent.invalidate_paint()
+
+    def repaint_cursor(self, screen: pygame.Surface):
+        """Draw the cursor straight to the screen, over the pixels of the line beneath it."""
+        area = self.cursor_area(self.image.size)
+        if area is None:
+            return
+        on_screen = area.move(self.drawn_position.as_tuple)
+        screen.blit(self.image.image, on_screen, area)
+        if self.cursor_visible:
+            screen.fill(CURSOR_COLOR, on_screen)
+        pygame.display.update(on_screen)
 
     def render(self, mouse, destination, position, size):
+        self.drawn_on = destination
+        self.drawn_position = position
+        if self.next_blink is None or pygame.time.get_ticks() > self.next_blink:
+            self.schedule_blink()
         if self.image.matches(size):
+            scrolled = self.image_top != self.top_line
+            if scrolled:
+                self.scroll_image(size)
             destination.blit(self.image.image, position.as_tuple)
-            self.render_cursor(destination, position)
+            self.track_damage(destination, position, size, redrawn=scrolled)
+            self.render_cursor(destination, position, size)
             return
-        
+
         new_image = self.get_new_image(size)
-        new_image.fill(self.background)
+        self.image_top = self.top_line
+        self.draw_lines(new_image, size, 0, self.visible_lines(size))
         destination.blit(new_image, position.as_tuple)
-        self.render_cursor(destination, position)
+        self.track_damage(destination, position, size)
+        self.render_cursor(destination, position, size)
         self.image.update(new_image)
@@ -3,6 +3,11 @@ import pygame
 from pyui.helpers import Size, Position, Mouse
 from pyui.messaging import message_bus, MessageType
 from pyui.keys import keys
+from pyui.damage import damage_tracker
+from pyui.timers import timers
+from pyui.hit_test import HitIndex
+from pyui.signals import SignalType, process_signal_stack
+from pyui.asset_loader import asset_loader
 
 FRAMES_PER_SECOND = 30
 
@@ -23,8 +28,13 @@ class Window:
     A window class that manages multiple widgets.
     The window handles initialization, rendering, and the main event loop.
     Widgets are rendered in the order they were added (first to last).
+    With damage tracking enabled, only the areas widgets report as changed are
+    redrawn and pushed to the display.
+    When event driven, the main loop sleeps until there is input, a message, a
+    timer or a redraw request, and skips drawing frames where nothing happened.
     """
-    def __init__(self, size: Size, background=(200, 200, 200), title: str = "PyUI Window"):
+    def __init__(self, size: Size, background=(200, 200, 200), title: str = "PyUI Window",
+                 damage_tracking: bool = False, event_driven: bool = False):
         assert background is not None, "Background color cannot be None"
         pyui_init()
         self.title = title
@@ -35,6 +45,15 @@ class Window:
         self.mouse = Mouse()
         self.modal_backgrounds = []
         self.title = title
+        self.damage_tracking = damage_tracking
+        # the first frame always needs the whole screen
+        self.full_redraw = True
+        self.event_driven = event_driven
+        self.needs_draw = True
+        self.pending_events = []
+        # built from the layout when needed, see get_hit_index
+        self.hit_index = None
+        self.hover_path = []
 
         current_surface = pygame.display.get_surface()
         if current_surface is not None:
@@ -44,21 +63,40 @@ class Window:
             pygame.display.set_caption(self.title)
             self.screen = pygame.display.set_mode(self.size.as_tuple)
 
-        # define the callbacks
-        message_bus.subscribe(self, MessageType.ADD_WIDGET,
-                              lambda message: self.add_widget(message.data))
-        message_bus.subscribe(self, MessageType.REMOVE_MODAL,
-                              lambda message: self.remove_modal())
+        # define the callbacks, as methods so the bus does not keep the window alive
+        message_bus.subscribe(self, MessageType.ADD_WIDGET, self.on_add_widget)
+        message_bus.subscribe(self, MessageType.REMOVE_MODAL, self.on_remove_modal)
+
+    def on_add_widget(self, message):
+        self.add_widget(message.data)
+
+    def on_remove_modal(self, message):
+        self.remove_modal()
 
     @classmethod
     def default(cls):
         """Create a default window with a size of 800x600."""
         return cls(Size(200, 200), title="Test Window")
 
+    def request_draw(self):
+        """Ask for the next frame to be drawn, even if there was no input."""
+        self.needs_draw = True
+
+    def invalidate_layout(self):
+        # moved widgets report their old and new areas, removed ones the area they covered
+        self.hit_index = None
+        self.request_draw()
+
+    def invalidate_paint(self):
+        self.request_draw()
+
     def add_widget(self, widget):
         self.widgets.append(widget)
         widget.set_active(True)
         widget.parent = self
+        self.full_redraw = True
+        self.hit_index = None
+        self.needs_draw = True
         if widget.modal:
             self.capture_background(widget)
     
@@ -77,6 +115,9 @@ class Window:
                     break
             self.widgets.remove(widget)
             widget.parent = None
+            self.full_redraw = True
+            self.hit_index = None
+            self.needs_draw = True
 
     def remove_modal(self):
         # remove the last modal widget
@@ -84,6 +125,9 @@ class Window:
             # no modal widget to remove
             return
         self.widgets.pop()
+        self.full_redraw = True
+        self.hit_index = None
+        self.needs_draw = True
         # remove the last captured background
         if self.modal_backgrounds:
             self.modal_backgrounds.pop()
@@ -93,20 +137,84 @@ class Window:
             widget.parent = None
         self.widgets = []
         self.modal_backgrounds = []
+        self.full_redraw = True
+        self.hit_index = None
+        self.needs_draw = True
+
+    @property
+    def visible_widgets(self) -> list:
+        if len(self.modal_backgrounds) > 0:
+            # only the top modal widget is drawn
+            return self.widgets[-1:]
+        return self.widgets
+
+    def get_hit_index(self) -> HitIndex:
+        if self.hit_index is None:
+            self.hit_index = HitIndex()
+            for widget in self.visible_widgets:
+                self.hit_index.add(widget, Position(0, 0), self.size)
+        return self.hit_index
+
+    def route_mouse(self) -> None:
+        """Send mouse signals to the widgets under the mouse, or that it just left."""
+        path = self.get_hit_index().find(self.mouse.position)
+        for widget in self.hover_path:
+            if widget not in path:
+                widget.mouse_over = False
+                widget.signals.trigger(SignalType.MOUSE_OUT, widget)
+        for widget in path:
+            if widget not in self.hover_path:
+                widget.mouse_over = True
+                widget.signals.trigger(SignalType.MOUSE_IN, widget)
+        self.hover_path = path
+        for button, signal in ((self.mouse.left, SignalType.MOUSE_LEFT_CLICK),
+                               (self.mouse.right, SignalType.MOUSE_RIGHT_CLICK),
+                               (self.mouse.middle, SignalType.MOUSE_MIDDLE_CLICK)):
+            if button.down:
+                for widget in path:
+                    widget.signals.trigger(signal, widget)
+        process_signal_stack()
 
     def draw(self) -> None:
         """Clear the screen and draw all widgets in order."""
+        if self.damage_tracking:
+            self.draw_damaged()
+            return
+        self.paint(self.mouse)
+        pygame.display.flip()
+
+    def paint(self, mouse: Mouse) -> None:
         # is there a new modal widget?
         if len(self.modal_backgrounds) > 0:
             # draw the last captured background
             self.screen.blit(self.modal_backgrounds[-1].capture, (0, 0))
             # only the top widget needs to be handled
-            self.widgets[-1].render(self.mouse, self.screen, Position(0, 0), self.size)
+            self.widgets[-1].render(mouse, self.screen, Position(0, 0), self.size)
         else:
             self.screen.fill(self.background)
             for widget in self.widgets:
-                widget.render(self.mouse, self.screen, Position(0, 0), self.size)
-        pygame.display.flip()
+                widget.render(mouse, self.screen, Position(0, 0), self.size)
+
+    def draw_damaged(self) -> None:
+        """Redraw and update only the areas of the screen that widgets changed."""
+        # a fully clipped pass lets widgets update and report damage without drawing
+        damage_tracker.track(self.screen)
+        self.screen.set_clip(pygame.Rect(0, 0, 0, 0))
+        self.paint(self.mouse)
+        rects = damage_tracker.collect()
+        if self.full_redraw:
+            rects = [self.screen.get_rect()]
+            self.full_redraw = False
+        # input was handled by the first pass, so don't repeat clicks
+        mouse = self.mouse.without_clicks()
+        damage_tracker.repainting = self.screen
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.paint(mouse)
+        damage_tracker.repainting = None
+        self.screen.set_clip(None)
+        if len(rects) > 0:
+            pygame.display.update(rects)
     
     def handle_events(self) -> bool:
         # Update mouse state
@@ -117,7 +225,9 @@ class Window:
         keys_pressed = []
         keys_released = []
 
-        for event in pygame.event.get():
+        events = self.pending_events + pygame.event.get()
+        self.pending_events = []
+        for event in events:
             match event.type:
                 case pygame.KEYDOWN:
                     keys_pressed.append(event.key)
@@ -127,8 +237,31 @@ class Window:
                 return False
         
         keys.update(keys_pressed, keys_released)
+        self.route_mouse()
         return True
     
+    def wait_for_activity(self) -> None:
+        """Sleep until there is an event or the next timer is due."""
+        if self.needs_draw or message_bus.has_posts:
+            return
+        timeout = timers.next_timeout(pygame.time.get_ticks())
+        if timeout is None:
+            event = pygame.event.wait()
+        else:
+            # a timeout of 0 would wait forever
+            event = pygame.event.wait(max(1, timeout))
+        if event.type != pygame.NOEVENT:
+            self.pending_events.append(event)
+            self.needs_draw = True
+        if timers.expire(pygame.time.get_ticks()):
+            self.needs_draw = True
+
+    def draw_frame(self) -> None:
+        if self.event_driven and not self.needs_draw:
+            return
+        self.needs_draw = False
+        self.draw()
+
     def run(self) -> None:
         """
         Start the main window loop.
@@ -137,9 +270,19 @@ class Window:
         self.running = True
         
         self.draw()
+        self.needs_draw = False
         while self.running:
+            if self.event_driven:
+                self.wait_for_activity()
+            else:
+                # callbacks still run when drawing every frame
+                timers.expire(pygame.time.get_ticks())
             self.running = self.handle_events()
-            self.draw()
+            if asset_loader.update():
+                self.needs_draw = True
+            if message_bus.has_posts:
+                self.needs_draw = True
+            self.draw_frame()
             message_bus.consume()
             # Control frame rate
             pygame.time.Clock().tick(FRAMES_PER_SECOND)
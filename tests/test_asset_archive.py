@@ -0,0 +1,87 @@
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from pyui.test_helper import PyuiTest
+from pyui.asset_archive import AssetArchive, pack_assets, main, ASSET_KINDS
+from pyui.asset_loader import AssetLoader
+from pyui.assets import (ASSETS_FOLDER, use_archive, get_image, get_icon, get_nine_patch,
+                         get_font, file_cache)
+from pyui.widgets import NinePatchData
+
+
+def count_asset_files() -> int:
+    return sum(1 for kind in ASSET_KINDS for path in (ASSETS_FOLDER / kind).iterdir() if path.is_file())
+
+
+class TestAssetArchive(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name) / "assets.pak"
+        self.count = pack_assets(ASSETS_FOLDER, self.path)
+
+    def tearDown(self):
+        use_archive(None)
+        self.folder.cleanup()
+
+    def test_packs_every_file(self):
+        self.assertEqual(self.count, count_asset_files())
+
+    def test_entries_match_files(self):
+        archive = AssetArchive(self.path)
+        self.assertEqual(archive.read("nine_patch", "frame.json"),
+                         (ASSETS_FOLDER / "nine_patch" / "frame.json").read_bytes())
+        archive.close()
+
+    def test_contains(self):
+        archive = AssetArchive(self.path)
+        self.assertTrue(archive.contains("images", "dog.png"))
+        self.assertFalse(archive.contains("images", "cat.png"))
+        archive.close()
+
+    def test_not_an_archive(self):
+        other = Path(self.folder.name) / "other.pak"
+        other.write_bytes(b"0123456789abcdef")
+        with self.assertRaises(ValueError):
+            AssetArchive(other)
+
+    def test_loads_without_asset_folder(self):
+        use_archive(self.path)
+        with patch("pyui.assets.ASSETS_FOLDER", Path(self.folder.name) / "missing"):
+            self.assertEqual(get_image("dog.png").get_size(), (256, 256))
+            get_icon("open.png")
+            get_nine_patch("button.png")
+            self.assertEqual(NinePatchData.from_json("frame.json").top, 7)
+            self.assertGreater(get_font("creato.otf", 16).size_of("Hello").width, 0)
+
+    def test_same_image_as_loose_files(self):
+        loose = get_image("dog.png")
+        use_archive(self.path)
+        self.assertEqual(get_image("dog.png").get_size(), loose.get_size())
+
+    def test_missing_entry(self):
+        use_archive(self.path)
+        with self.assertRaises(FileNotFoundError):
+            get_image("cat.png")
+
+    def test_switching_clears_cache(self):
+        get_image("dog.png")
+        use_archive(self.path)
+        self.assertNotIn("dog.png", file_cache.images)
+
+    def test_background_loading(self):
+        use_archive(self.path)
+        loader = AssetLoader()
+        pending = loader.load("images", "dog.png")
+        loader.wait()
+        self.assertTrue(pending.ready)
+
+    def test_command_line(self):
+        output = Path(self.folder.name) / "cli.pak"
+        with patch.object(sys, "argv", ["asset_archive", str(output)]), patch("builtins.print"):
+            main()
+        archive = AssetArchive(output)
+        self.assertEqual(len(archive.index), self.count)
+        archive.close()
@@ -0,0 +1,124 @@
+import time
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pygame
+
+from pyui.test_helper import PyuiTest
+from pyui.asset_loader import AssetLoader, ASSET_LOADED, get_image_async, asset_loader
+from pyui.assets import file_cache, get_image
+from pyui.widgets import Image
+from pyui.helpers import Size
+
+
+def loaded_event_posted() -> bool:
+    # the event is posted from the worker just after the future completes
+    deadline = time.monotonic() + 1
+    while not pygame.event.peek(ASSET_LOADED):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+class TestAssetLoader(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        file_cache.clear()
+        self.loader = AssetLoader()
+
+    def test_placeholder_until_loaded(self):
+        placeholder = pygame.Surface((5, 5))
+        pending = self.loader.load("images", "dog.png", placeholder)
+        self.assertIs(pending.surface, placeholder)
+        self.assertFalse(pending.ready)
+
+    def test_loaded_on_update(self):
+        pending = self.loader.load("images", "dog.png")
+        self.loader.wait()
+        self.assertTrue(pending.ready)
+        self.assertEqual(pending.surface.get_size(), get_image("dog.png").get_size())
+        self.assertFalse(self.loader.busy)
+
+    def test_loaded_asset_is_cached(self):
+        pending = self.loader.load("images", "dog.png")
+        self.loader.wait()
+        self.assertIs(file_cache.images["dog.png"], pending.surface)
+
+    def test_callback(self):
+        callback = Mock()
+        pending = self.loader.load("icons", "open.png")
+        pending.when_ready(callback)
+        self.loader.wait()
+        callback.assert_called_once_with(pending.surface)
+
+    def test_cached_asset_is_ready(self):
+        image = get_image("dog.png")
+        pending = self.loader.load("images", "dog.png")
+        self.assertTrue(pending.ready)
+        self.assertIs(pending.surface, image)
+        self.assertFalse(self.loader.busy)
+
+    def test_same_asset_loaded_once(self):
+        first = self.loader.load("images", "dog.png")
+        self.assertIs(self.loader.load("images", "dog.png"), first)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            self.loader.load("images", "missing.png")
+
+    def test_update_without_loads(self):
+        self.assertFalse(self.loader.update())
+
+    def test_wakes_the_window(self):
+        pygame.event.clear()
+        self.loader.load("images", "dog.png")
+        self.loader.wait()
+        self.assertTrue(loaded_event_posted())
+
+    def test_loaded_once_woken(self):
+        pygame.event.clear()
+        self.loader.load("images", "dog.png")
+        self.assertTrue(loaded_event_posted())
+        self.assertTrue(self.loader.update())
+
+    def test_broken_file_keeps_placeholder(self):
+        with tempfile.TemporaryDirectory() as folder:
+            (Path(folder) / "images").mkdir()
+            (Path(folder) / "images" / "broken.png").write_bytes(b"not an image")
+            with patch("pyui.assets.ASSETS_FOLDER", Path(folder)):
+                pending = self.loader.load("images", "broken.png")
+                self.loader.wait()
+        self.assertFalse(pending.ready)
+        self.assertIsNotNone(pending.error)
+        self.assertEqual(pending.surface.get_size(), (1, 1))
+
+    def test_broken_file_wakes_the_window(self):
+        pygame.event.clear()
+        with tempfile.TemporaryDirectory() as folder:
+            (Path(folder) / "images").mkdir()
+            (Path(folder) / "images" / "broken.png").write_bytes(b"not an image")
+            with patch("pyui.assets.ASSETS_FOLDER", Path(folder)):
+                self.loader.load("images", "broken.png")
+                self.loader.wait()
+        self.assertTrue(loaded_event_posted())
+
+
+class TestPendingImage(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        file_cache.clear()
+
+    def test_image_swaps_in_loaded_surface(self):
+        image = Image.from_pending(get_image_async("dog.png"))
+        self.assertEqual(image.min_size, Size(1, 1))
+        asset_loader.wait()
+        self.assertEqual(image.min_size, Size(*get_image("dog.png").get_size()))
+
+    def test_set_image_same_size_keeps_layout(self):
+        image = Image(pygame.Surface((10, 10)))
+        image.min_size
+        image.set_image(pygame.Surface((10, 10)))
+        self.assertFalse(image.layout_dirty)
+        self.assertTrue(image.paint_dirty)
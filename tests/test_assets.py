@@ -1,7 +1,12 @@
+from unittest.mock import patch, Mock
+
 from pygame import Surface
 
 from pyui.test_helper import PyuiTest
-from pyui.assets import get_image, get_nine_patch, file_cache
+from pyui.assets import (get_image, get_nine_patch, get_nine_patch_data, get_font, file_cache, text_cache,
+                         TextCache, Font, FileCache)
+from pyui.widgets import Label
+from pyui.helpers import Size, Position
 
 class TestAssets(PyuiTest):
     def test_load_image(self):
@@ -17,8 +22,200 @@ class TestAssets(PyuiTest):
         get_image("dog.png")
         self.assertTrue("dog.png" in file_cache.images)
 
+    def test_nine_patch_data_cache(self):
+        file_cache.clear()
+        self.assertIs(get_nine_patch_data("frame.json"), get_nine_patch_data("frame.json"))
+
     def test_cache_works(self):
         file_cache.clear()
         img1 = get_image("dog.png")
         img2 = get_image("dog.png")
         self.assertIs(img1, img2)
+
+
+class TestTextCache(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        text_cache.clear()
+        self.font = get_font("creato.otf", 16)
+
+    def test_same_text_is_shared(self):
+        first = self.font.render("Hello", (0, 0, 0))
+        self.assertIs(self.font.render("Hello", (0, 0, 0)), first)
+
+    def test_counts_hits_and_misses(self):
+        hits, misses = text_cache.hits, text_cache.misses
+        self.font.render("Hello")
+        self.font.render("Hello")
+        self.assertEqual(text_cache.hits - hits, 1)
+        self.assertEqual(text_cache.misses - misses, 1)
+
+    def test_color_is_part_of_key(self):
+        first = self.font.render("Hello", (0, 0, 0))
+        self.assertIsNot(self.font.render("Hello", (255, 0, 0)), first)
+
+    def test_antialias_is_part_of_key(self):
+        first = self.font.render("Hello", (0, 0, 0))
+        self.assertIsNot(self.font.render("Hello", (0, 0, 0), antialias=False), first)
+
+    def test_font_size_is_part_of_key(self):
+        first = self.font.render("Hello")
+        self.assertIsNot(get_font("creato.otf", 24).render("Hello"), first)
+
+    def test_labels_share_text(self):
+        hits = text_cache.hits
+        for _ in range(3):
+            label = Label("Shared", self.font)
+            label.render(self.mouse, Surface((100, 100)), Position(0, 0), Size(100, 30))
+        self.assertEqual(text_cache.hits - hits, 2)
+
+
+class TestTextCacheBudget(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.surface = Surface((10, 10))
+        self.size = self.surface.get_pitch() * self.surface.get_height()
+        self.cache = TextCache(budget=self.size * 2)
+
+    def test_oldest_is_dropped(self):
+        for key in ["a", "b", "c"]:
+            self.cache.add(key, Surface((10, 10)))
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("c"))
+        self.assertEqual(self.cache.total_bytes, self.size * 2)
+
+    def test_recently_used_is_kept(self):
+        self.cache.add("a", Surface((10, 10)))
+        self.cache.add("b", Surface((10, 10)))
+        self.cache.get("a")
+        self.cache.add("c", Surface((10, 10)))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+
+    def test_larger_than_budget_is_kept(self):
+        self.cache.add("big", Surface((100, 100)))
+        self.assertIsNotNone(self.cache.get("big"))
+
+    def test_clear(self):
+        self.cache.add("a", self.surface)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.total_bytes, 0)
+
+
+class TestFontMeasurement(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.font = Font("creato.otf", 16)
+
+    def test_same_as_pygame(self):
+        for text in ["Hello", "AV", "Wafting fjords"]:
+            self.assertEqual(self.font.size_of(text).as_tuple, self.font.font.size(text))
+
+    def test_measured_once(self):
+        self.font.font = Mock(wraps=self.font.font)
+        self.font.size_of("Hello")
+        self.font.size_of("Hello")
+        self.font.font.size.assert_called_once_with("Hello")
+
+    def test_returns_copy(self):
+        self.font.size_of("Hello").width += 100
+        self.assertEqual(self.font.size_of("Hello").as_tuple, self.font.font.size("Hello"))
+
+    def test_empty_text(self):
+        self.assertEqual(self.font.size_of(""), Size(0, self.font.font.get_height()))
+
+    def test_measurements_are_bounded(self):
+        with patch("pyui.assets.MAX_MEASURED_TEXTS", 2):
+            for text in ["a", "b", "c"]:
+                self.font.size_of(text)
+        self.assertEqual(list(self.font.measured), ["b", "c"])
+
+
+class TestFileCache(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.size = Surface((10, 10)).get_pitch() * 10
+        self.cache = FileCache(budget=self.size * 2)
+
+    def add_images(self, names):
+        for name in names:
+            self.cache.images[name] = Surface((10, 10))
+
+    def test_used_like_a_dict(self):
+        image = Surface((10, 10))
+        self.cache.images["a.png"] = image
+        self.assertIn("a.png", self.cache.images)
+        self.assertIs(self.cache.images["a.png"], image)
+        self.assertNotIn("a.png", self.cache.icons)
+
+    def test_oldest_is_dropped(self):
+        self.add_images(["a", "b", "c"])
+        self.assertNotIn("a", self.cache.images)
+        self.assertEqual(len(self.cache.images), 2)
+        self.assertEqual(self.cache.total_bytes, self.size * 2)
+
+    def test_recently_used_is_kept(self):
+        self.add_images(["a", "b"])
+        self.cache.images.get("a")
+        self.add_images(["c"])
+        self.assertIn("a", self.cache.images)
+        self.assertNotIn("b", self.cache.images)
+
+    def test_pinned_is_kept(self):
+        self.add_images(["a"])
+        self.cache.images.pin("a")
+        self.add_images(["b", "c"])
+        self.assertIn("a", self.cache.images)
+
+    def test_unpinned_can_be_dropped(self):
+        self.add_images(["a"])
+        self.cache.images.pin("a")
+        self.cache.images.unpin("a")
+        self.add_images(["b", "c"])
+        self.assertNotIn("a", self.cache.images)
+
+    def test_all_pinned_goes_over_budget(self):
+        self.add_images(["a", "b"])
+        self.cache.images.pin("a")
+        self.cache.images.pin("b")
+        self.add_images(["c"])
+        self.assertEqual(len(self.cache.images), 3)
+
+    def test_replacing_keeps_count(self):
+        self.add_images(["a", "a"])
+        self.assertEqual(self.cache.total_bytes, self.size)
+
+    def test_stats(self):
+        self.add_images(["a", "b", "c"])
+        self.cache.images.get("c")
+        self.cache.images.get("a")
+        self.assertEqual(self.cache.stats, {"assets": 2, "bytes": self.size * 2, "hits": 1,
+                                            "misses": 1, "evictions": 1})
+
+    def test_fonts_are_not_counted(self):
+        self.cache.fonts["creato"] = get_font("creato.otf")
+        self.assertEqual(self.cache.total_bytes, 0)
+
+    def test_uncounted_assets_are_kept(self):
+        self.cache.fonts["creato"] = get_font("creato.otf")
+        self.cache.nine_patch["button.json"] = get_nine_patch_data("button.json")
+        self.add_images(["a", "b", "c"])
+        self.assertIn("creato", self.cache.fonts)
+        self.assertIn("button.json", self.cache.nine_patch)
+        self.assertEqual(self.cache.stats["evictions"], 1)
+
+    def test_clear(self):
+        self.add_images(["a"])
+        self.cache.images.pin("a")
+        self.cache.clear()
+        self.assertNotIn("a", self.cache.images)
+        self.assertEqual(self.cache.pinned, set())
+        self.assertEqual(self.cache.total_bytes, 0)
+
+    def test_loading_uses_cache(self):
+        file_cache.clear()
+        get_image("dog.png")
+        get_image("dog.png")
+        self.assertEqual(file_cache.hits, 1)
+        self.assertEqual(file_cache.misses, 1)
@@ -0,0 +1,131 @@
+from pygame import Surface
+
+from pyui.test_helper import PyuiTest
+from pyui.widget import Widget
+from pyui.widgets import HBox, VBox, ColorRect, Label, Frame, NinePatchData
+from pyui.assets import get_font
+from pyui.helpers import Size, Position, Margin, Expand
+
+
+class CountingWidget(Widget):
+    def __init__(self, size: Size, **kwargs):
+        super().__init__(**kwargs)
+        self.size = size
+        self.measure_count = 0
+
+    def measure(self) -> Size:
+        self.measure_count += 1
+        return self.size + self.margin.size
+
+
+class TestLayoutCache(PyuiTest):
+    def test_min_size_is_cached(self):
+        widget = CountingWidget(Size(10, 10))
+        widget.min_size
+        widget.min_size
+        self.assertEqual(widget.measure_count, 1)
+
+    def test_min_size_returns_copy(self):
+        widget = CountingWidget(Size(10, 10))
+        widget.min_size.width += 50
+        self.assertEqual(widget.min_size, Size(10, 10))
+
+    def test_margin_change_invalidates(self):
+        widget = CountingWidget(Size(10, 10))
+        widget.min_size
+        widget.margin = Margin(5, 5, 5, 5)
+        self.assertEqual(widget.min_size, Size(20, 20))
+
+    def test_nested_render_does_not_remeasure(self):
+        child = CountingWidget(Size(10, 10))
+        inner = VBox()
+        inner.add_child(child)
+        outer = HBox()
+        outer.add_child(inner)
+        surface = Surface((100, 100))
+        for _ in range(5):
+            outer.render(self.mouse, surface, Position(0, 0), Size(100, 100))
+        self.assertEqual(child.measure_count, 1)
+
+    def test_invalidate_reaches_ancestors(self):
+        child = CountingWidget(Size(10, 10))
+        inner = VBox()
+        inner.add_child(child)
+        outer = HBox()
+        outer.add_child(inner)
+        self.assertEqual(outer.min_size, Size(10, 10))
+        child.size = Size(30, 20)
+        child.invalidate_layout()
+        self.assertEqual(outer.min_size, Size(30, 20))
+
+    def test_invalidate_does_not_reach_siblings(self):
+        child = CountingWidget(Size(10, 10))
+        sibling = CountingWidget(Size(10, 10))
+        box = HBox()
+        box.add_children([child, sibling])
+        box.min_size
+        child.invalidate_layout()
+        box.min_size
+        self.assertEqual(sibling.measure_count, 1)
+
+    def test_add_child_invalidates(self):
+        box = HBox()
+        box.add_child(ColorRect(color=(255, 0, 0), size=Size(10, 10)))
+        self.assertEqual(box.min_size, Size(10, 10))
+        box.add_child(ColorRect(color=(255, 0, 0), size=Size(10, 10)))
+        self.assertEqual(box.min_size, Size(20, 10))
+
+    def test_remove_child_invalidates(self):
+        rect = ColorRect(color=(255, 0, 0), size=Size(10, 10))
+        box = VBox()
+        box.add_children([rect, ColorRect(color=(255, 0, 0), size=Size(10, 10))])
+        self.assertEqual(box.min_size, Size(10, 20))
+        box.remove_child(rect)
+        self.assertEqual(box.min_size, Size(10, 10))
+
+    def test_label_text_change_invalidates(self):
+        label = Label("Hi", get_font("creato.otf", 16))
+        box = HBox()
+        box.add_child(label)
+        old_size = box.min_size
+        label.set_text("A much longer piece of text")
+        self.assertGreater(box.min_size.width, old_size.width)
+
+    def test_frame_child_change_invalidates(self):
+        patch_data = NinePatchData(top=5, bottom=5, left=5, right=5, image=Surface((20, 20)))
+        label = Label("Hi", get_font("creato.otf", 16))
+        frame = Frame(label, patch_data)
+        old_size = frame.min_size
+        label.set_text("A much longer piece of text")
+        self.assertGreater(frame.min_size.width, old_size.width)
+
+
+class TestArrangementCache(PyuiTest):
+    def test_arrangement_is_reused(self):
+        box = HBox()
+        box.add_child(ColorRect(color=(255, 0, 0), size=Size(10, 10)))
+        first = box.get_arrangement(Size(100, 100))
+        self.assertIs(box.get_arrangement(Size(100, 100)), first)
+
+    def test_size_change_rearranges(self):
+        box = HBox()
+        box.add_child(ColorRect(color=(255, 0, 0), size=Size(10, 10), expand=Expand.HORIZONTAL))
+        box.get_arrangement(Size(100, 100))
+        _, child_size = box.get_arrangement(Size(50, 100))[0]
+        self.assertEqual(child_size.width, 50)
+
+    def test_expand_change_rearranges(self):
+        rect = ColorRect(color=(255, 0, 0), size=Size(10, 10))
+        box = HBox()
+        box.add_child(rect)
+        box.get_arrangement(Size(100, 100))
+        rect.expand = Expand.HORIZONTAL
+        _, child_size = box.get_arrangement(Size(100, 100))[0]
+        self.assertEqual(child_size.width, 100)
+
+    def test_arrangement_offsets(self):
+        box = VBox(spacing=5, margin=Margin(2, 0, 3, 0))
+        box.add_children([ColorRect(color=(255, 0, 0), size=Size(10, 10)),
+                          ColorRect(color=(255, 0, 0), size=Size(10, 10))])
+        offsets = [offset for offset, _ in box.get_arrangement(Size(100, 100))]
+        self.assertEqual(offsets, [Position(2, 3), Position(2, 18)])
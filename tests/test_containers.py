@@ -1,8 +1,12 @@
 import unittest
+from unittest.mock import Mock
 
+import pygame
 from pygame import Surface
 
-from pyui.widgets import HBox, VBox, ColorRect, Image
+from pyui.widget import Widget
+from pyui.widgets import HBox, VBox, Stack, ColorRect, Image
+from pyui.damage import damage_tracker
 from pyui.helpers import Margin, Position, Size, Expand, Mouse
 from pyui.widgets.containers import split_pixels
 from pyui.test_helper import PyuiTest
@@ -542,3 +546,89 @@ class TestOppositeExpansion(PyuiTest):
         box.render(self.mouse, image, Position(0, 0), Size(100, 100))
         self.assertPixel(image, Position(0, 0), (255, 0, 0))
         self.assertPixel(image, Position(99, 99), (255, 0, 0))
+
+
+class CountingRect(ColorRect):
+    def __init__(self, color=(255, 0, 0)):
+        super().__init__(color=color, size=Size(10, 10))
+        self.render_count = 0
+
+    def render(self, mouse, destination, position, size):
+        self.render_count += 1
+        super().render(mouse, destination, position, size)
+
+
+class AlwaysRendered(Widget):
+    def __init__(self):
+        super().__init__()
+        self.render_count = 0
+
+    def render(self, mouse, destination, position, size):
+        self.render_count += 1
+
+
+class TestBatchedRendering(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.surface = Surface((100, 100))
+
+    def render(self, box, count=1):
+        for _ in range(count):
+            box.render(self.mouse, self.surface, Position(0, 0), Size(100, 100))
+
+    def test_cached_children_are_not_rendered(self):
+        children = [CountingRect() for _ in range(5)]
+        box = HBox()
+        box.add_children(children)
+        self.render(box, 3)
+        self.assertEqual([child.render_count for child in children], [1] * 5)
+
+    def test_cached_children_drawn_in_one_call(self):
+        box = VBox()
+        box.add_children([CountingRect() for _ in range(5)])
+        self.render(box)
+        destination = Mock(wraps=self.surface)
+        box.render(self.mouse, destination, Position(0, 0), Size(100, 100))
+        destination.blits.assert_called_once()
+        destination.blit.assert_not_called()
+
+    def test_changed_child_is_rendered(self):
+        children = [CountingRect() for _ in range(3)]
+        box = HBox()
+        box.add_children(children)
+        self.render(box)
+        children[1].color = (0, 255, 0)
+        children[1].invalidate_paint()
+        self.render(box)
+        self.assertEqual([child.render_count for child in children], [1, 2, 1])
+        self.assertPixel(self.surface, Position(15, 5), (0, 255, 0))
+
+    def test_uncached_widget_always_rendered(self):
+        widget = AlwaysRendered()
+        box = HBox()
+        box.add_children([CountingRect(), widget])
+        self.render(box, 3)
+        self.assertEqual(widget.render_count, 3)
+
+    def test_overlapping_children_keep_order(self):
+        bottom = CountingRect(color=(255, 0, 0))
+        top = CountingRect(color=(0, 0, 255))
+        stack = Stack()
+        stack.add_children([bottom, top])
+        self.render(stack)
+        top.color = (0, 255, 0)
+        top.invalidate_paint()
+        self.render(stack)
+        self.assertPixel(self.surface, Position(5, 5), (0, 255, 0))
+
+    def test_moved_cached_child_is_damage(self):
+        child = CountingRect()
+        box = HBox()
+        box.add_child(child)
+        self.render(box)
+        damage_tracker.track(self.surface)
+        box.render(self.mouse, self.surface, Position(20, 20), Size(80, 80))
+        damage = damage_tracker.collect()
+        self.assertEqual(child.render_count, 1)
+        self.assertTrue(any(rect.contains(pygame.Rect(20, 20, 10, 10)) for rect in damage))
+
@@ -0,0 +1,179 @@
+import pygame
+from unittest.mock import patch
+
+from pyui.test_helper import PyuiTest
+from pyui.damage import DamageTracker, merge_rects, damage_tracker, MAX_DAMAGE_RECTS
+from pyui.window import Window
+from pyui.widgets import ColorRect, Label, HBox, VBox
+from pyui.assets import get_font
+from pyui.helpers import Size, Position
+
+
+class TestDamageTracker(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.tracker = DamageTracker()
+        self.surface = pygame.Surface((100, 100))
+
+    def test_not_tracking_by_default(self):
+        self.assertFalse(self.tracker.tracking)
+
+    def test_ignores_damage_when_not_tracking(self):
+        self.tracker.add(self.surface, pygame.Rect(0, 0, 10, 10))
+        self.assertEqual(self.tracker.rects, [])
+
+    def test_records_damage_on_target(self):
+        self.tracker.track(self.surface)
+        self.tracker.add(self.surface, pygame.Rect(0, 0, 10, 10))
+        self.assertEqual(self.tracker.collect(), [pygame.Rect(0, 0, 10, 10)])
+
+    def test_ignores_other_surfaces(self):
+        self.tracker.track(self.surface)
+        self.tracker.add(pygame.Surface((100, 100)), pygame.Rect(0, 0, 10, 10))
+        self.assertEqual(self.tracker.collect(), [])
+
+    def test_damage_is_clipped_to_target(self):
+        self.tracker.track(self.surface)
+        self.tracker.add_area(self.surface, Position(90, 90), Size(50, 50))
+        self.assertEqual(self.tracker.collect(), [pygame.Rect(90, 90, 10, 10)])
+
+    def test_damage_outside_target_is_dropped(self):
+        self.tracker.track(self.surface)
+        self.tracker.add_area(self.surface, Position(200, 200), Size(50, 50))
+        self.assertEqual(self.tracker.collect(), [])
+
+    def test_collect_stops_tracking(self):
+        self.tracker.track(self.surface)
+        self.tracker.collect()
+        self.assertFalse(self.tracker.tracking)
+
+
+class TestMergeRects(PyuiTest):
+    def test_empty(self):
+        self.assertEqual(merge_rects([]), [])
+
+    def test_contained_rect_is_dropped(self):
+        merged = merge_rects([pygame.Rect(5, 5, 5, 5), pygame.Rect(0, 0, 20, 20)])
+        self.assertEqual(merged, [pygame.Rect(0, 0, 20, 20)])
+
+    def test_separate_rects_are_kept(self):
+        merged = merge_rects([pygame.Rect(0, 0, 5, 5), pygame.Rect(50, 50, 5, 5)])
+        self.assertEqual(len(merged), 2)
+
+    def test_too_many_rects_become_one(self):
+        rects = [pygame.Rect(i * 2, 0, 1, 1) for i in range(MAX_DAMAGE_RECTS + 1)]
+        self.assertEqual(merge_rects(rects), [pygame.Rect(0, 0, MAX_DAMAGE_RECTS * 2 + 1, 1)])
+
+
+class TestWidgetDamage(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.surface = pygame.Surface((100, 100))
+        damage_tracker.track(self.surface)
+
+    def tearDown(self):
+        damage_tracker.collect()
+
+    def test_first_render_is_damage(self):
+        rect = ColorRect(color=(255, 0, 0), size=Size(10, 10))
+        rect.render(self.mouse, self.surface, Position(0, 0), Size(10, 10))
+        self.assertEqual(damage_tracker.collect(), [pygame.Rect(0, 0, 10, 10)])
+
+    def test_cached_render_is_not_damage(self):
+        rect = ColorRect(color=(255, 0, 0), size=Size(10, 10))
+        rect.render(self.mouse, self.surface, Position(0, 0), Size(10, 10))
+        damage_tracker.track(self.surface)
+        rect.render(self.mouse, self.surface, Position(0, 0), Size(10, 10))
+        self.assertEqual(damage_tracker.collect(), [])
+
+    def test_moved_widget_damages_old_and_new_area(self):
+        rect = ColorRect(color=(255, 0, 0), size=Size(10, 10))
+        rect.render(self.mouse, self.surface, Position(0, 0), Size(10, 10))
+        damage_tracker.track(self.surface)
+        rect.render(self.mouse, self.surface, Position(50, 50), Size(10, 10))
+        damage = damage_tracker.collect()
+        self.assertIn(pygame.Rect(0, 0, 10, 10), damage)
+        self.assertIn(pygame.Rect(50, 50, 10, 10), damage)
+
+    def test_label_text_change_is_damage(self):
+        label = Label("Hello", get_font("creato.otf", 16))
+        label.render(self.mouse, self.surface, Position(0, 0), Size(100, 30))
+        damage_tracker.track(self.surface)
+        label.set_text("World")
+        label.render(self.mouse, self.surface, Position(0, 0), Size(100, 30))
+        self.assertEqual(damage_tracker.collect(), [pygame.Rect(0, 0, 100, 30)])
+
+
+class TestWindowDamage(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.window = Window(Size(200, 200), damage_tracking=True)
+
+    def tearDown(self):
+        self.window.clear_widgets()
+
+    def test_first_draw_updates_whole_screen(self):
+        self.window.add_widget(ColorRect(color=(255, 0, 0), size=Size(10, 10)))
+        with patch('pygame.display.update') as update:
+            self.window.draw()
+        update.assert_called_once_with([pygame.Rect(0, 0, 200, 200)])
+
+    def test_static_frame_updates_nothing(self):
+        self.window.add_widget(ColorRect(color=(255, 0, 0), size=Size(10, 10)))
+        with patch('pygame.display.update') as update:
+            self.window.draw()
+            update.reset_mock()
+            self.window.draw()
+        update.assert_not_called()
+
+    def test_only_changed_area_is_updated(self):
+        first = ColorRect(color=(255, 0, 0), size=Size(20, 20))
+        box = HBox()
+        box.add_children([first, ColorRect(color=(0, 255, 0), size=Size(20, 20))])
+        self.window.add_widget(box)
+        with patch('pygame.display.update') as update:
+            self.window.draw()
+            first.color = (0, 0, 255)
+            first.image.clear()
+            self.window.draw()
+        update.assert_called_with([pygame.Rect(0, 0, 20, 20)])
+
+    def test_does_not_flip(self):
+        with patch('pygame.display.flip') as flip, patch('pygame.display.update'):
+            self.window.draw()
+        flip.assert_not_called()
+
+    def test_changed_area_is_redrawn(self):
+        rect = ColorRect(color=(255, 0, 0), size=Size(200, 200))
+        self.window.add_widget(rect)
+        with patch('pygame.display.update'):
+            self.window.draw()
+            rect.color = (0, 255, 0)
+            rect.image.clear()
+            self.window.draw()
+        self.assertPixel(self.window.screen, Position(100, 100), (0, 255, 0))
+
+    def test_removed_child_is_redrawn(self):
+        second = ColorRect(color=(0, 255, 0), size=Size(20, 20))
+        box = VBox()
+        box.add_children([ColorRect(color=(255, 0, 0), size=Size(20, 20)), second])
+        self.window.add_widget(box)
+        with patch('pygame.display.update') as update:
+            self.window.draw()
+            update.reset_mock()
+            box.remove_child(second)
+            self.window.draw()
+        update.assert_called_once()
+        self.assertPixel(self.window.screen, Position(5, 25), self.window.background)
+
+    def test_container_background_is_redrawn(self):
+        box = HBox()
+        box.add_child(ColorRect(color=(255, 0, 0), size=Size(20, 20)))
+        self.window.add_widget(box)
+        with patch('pygame.display.update') as update:
+            self.window.draw()
+            update.reset_mock()
+            box.background = (0, 0, 255)
+            self.window.draw()
+        update.assert_called_once()
+        self.assertPixel(self.window.screen, Position(100, 100), (0, 0, 255))
@@ -0,0 +1,77 @@
+from unittest.mock import Mock
+
+import pygame
+
+from pyui.test_helper import PyuiTest
+from pyui.glyph_atlas import GlyphAtlas, ATLAS_START_ROWS
+from pyui.assets import Font, get_font, text_cache
+from pyui.helpers import Size
+
+
+def opaque_colors(surface: pygame.Surface) -> set:
+    colors = set()
+    for x in range(surface.get_width()):
+        for y in range(surface.get_height()):
+            color = surface.get_at((x, y))
+            if color.a == 255:
+                colors.add((color.r, color.g, color.b))
+    return colors
+
+
+class TestGlyphAtlas(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.font = Font("creato.otf").font
+        self.atlas = GlyphAtlas(self.font)
+
+    def test_glyphs_rasterized_once(self):
+        self.atlas.font = Mock(wraps=self.font)
+        self.atlas.render("1010", (0, 0, 0))
+        self.atlas.render("0101", (255, 0, 0))
+        self.assertEqual(self.atlas.font.render.call_count, 2)
+
+    def test_render_uses_color(self):
+        surface = self.atlas.render("8", (255, 0, 0))
+        self.assertEqual(opaque_colors(surface), {(255, 0, 0)})
+
+    def test_size_matches_render(self):
+        surface = self.atlas.render("12:45", (0, 0, 0))
+        self.assertEqual(self.atlas.size_of("12:45"), Size(*surface.get_size()))
+
+    def test_width_close_to_font(self):
+        for text in ["0123456789", "99.5%", "Hello"]:
+            self.assertAlmostEqual(self.atlas.size_of(text).width, self.font.size(text)[0], delta=4)
+
+    def test_empty_text(self):
+        self.assertEqual(self.atlas.render("", (0, 0, 0)).get_size(), (0, self.font.get_height()))
+
+    def test_atlas_grows(self):
+        self.atlas.render("".join(chr(code) for code in range(33, 1000)), (0, 0, 0))
+        self.assertGreater(self.atlas.surface.get_height(), self.font.get_height() * ATLAS_START_ROWS)
+
+    def test_glyphs_kept_when_growing(self):
+        first = self.atlas.render("A", (0, 0, 0))
+        self.atlas.grow()
+        self.assertEqual(opaque_colors(self.atlas.render("A", (0, 0, 0))), opaque_colors(first))
+
+    def test_zero_width_glyph(self):
+        self.assertEqual(self.atlas.size_of("\u00ad"), Size(0, self.font.get_height()))
+
+
+class TestAtlasFont(PyuiTest):
+    def test_render_uses_atlas(self):
+        font = Font("creato.otf", 16, use_atlas=True)
+        font.render("42")
+        self.assertIn("4", font.get_atlas().glyphs)
+
+    def test_atlas_text_is_not_cached(self):
+        text_cache.clear()
+        Font("creato.otf", 16, use_atlas=True).render("42")
+        self.assertEqual(len(text_cache.surfaces), 0)
+
+    def test_size_from_atlas(self):
+        font = Font("creato.otf", 16, use_atlas=True)
+        self.assertEqual(font.size_of("42"), Size(*font.render("42").get_size()))
+
+    def test_get_font_keeps_atlas_fonts_apart(self):
+        self.assertIsNot(get_font("creato.otf", 16, use_atlas=True), get_font("creato.otf", 16))
@@ -0,0 +1,143 @@
+import unittest
+
+from pyui.text import TextStore
+from pyui.text.highlight import PythonLexer, Highlighter, TokenKind, color_runs, LEX_BATCH
+from pyui.helpers import Position
+
+
+def kinds(line: str, state=None) -> list:
+    spans, _ = PythonLexer().lex(line, state)
+    return [(line[start:end], kind) for start, end, kind in spans]
+
+
+class CountingLexer(PythonLexer):
+    def __init__(self):
+        self.lexed = 0
+
+    def lex(self, line: str, state) -> tuple:
+        self.lexed += 1
+        return super().lex(line, state)
+
+
+class TestPythonLexer(unittest.TestCase):
+    def test_tokens(self):
+        self.assertEqual(kinds("def main(x=12): # start"), [
+            ("def", TokenKind.KEYWORD), ("main", TokenKind.DEFINITION),
+            ("12", TokenKind.NUMBER), ("# start", TokenKind.COMMENT)])
+
+    def test_builtins_and_names(self):
+        self.assertEqual(kinds("print(value, len)"), [("print", TokenKind.BUILTIN), ("len", TokenKind.BUILTIN)])
+
+    def test_strings(self):
+        self.assertEqual(kinds("a = 'one' + f\"two\""), [("'one'", TokenKind.STRING), ("f\"two\"", TokenKind.STRING)])
+
+    def test_unclosed_string_runs_to_end(self):
+        self.assertEqual(kinds("x = 'open"), [("'open", TokenKind.STRING)])
+
+    def test_triple_quoted_string_carries_state(self):
+        lexer = PythonLexer()
+        spans, state = lexer.lex('x = r"""start', None)
+        self.assertEqual(spans, [(4, 13, TokenKind.STRING)])
+        self.assertEqual(state, '"""')
+        self.assertEqual(lexer.lex("middle", state), ([(0, 6, TokenKind.STRING)], state))
+        spans, state = lexer.lex('end""" if', state)
+        self.assertEqual(spans, [(0, 6, TokenKind.STRING), (7, 9, TokenKind.KEYWORD)])
+        self.assertIsNone(state)
+
+    def test_triple_quoted_string_on_one_line(self):
+        spans, state = PythonLexer().lex("'''doc''' 1", None)
+        self.assertEqual(spans, [(0, 9, TokenKind.STRING), (10, 11, TokenKind.NUMBER)])
+        self.assertIsNone(state)
+
+    def test_unknown_characters_are_skipped(self):
+        self.assertEqual(kinds("$ ? 1"), [("1", TokenKind.NUMBER)])
+
+    def test_color_runs(self):
+        self.assertEqual(color_runs("if x: 1", [(0, 2, TokenKind.KEYWORD), (6, 7, TokenKind.NUMBER)]),
+                         [("if", TokenKind.KEYWORD), (" x: ", None), ("1", TokenKind.NUMBER)])
+        self.assertEqual(color_runs("abc", []), [("abc", None)])
+        self.assertEqual(color_runs("ab", [(0, 5, TokenKind.STRING)]), [("ab", TokenKind.STRING)])
+
+
+class TestHighlighter(unittest.TestCase):
+    def setUp(self):
+        self.store = TextStore()
+        self.store.lines = [list(f"value_{number} = {number}") for number in range(1000)]
+        self.lexer = CountingLexer()
+        self.highlighter = Highlighter(self.lexer)
+
+    def all_states(self) -> list:
+        fresh = Highlighter(PythonLexer())
+        fresh.state_at(self.store, self.store.line_count)
+        return fresh.states
+
+    def test_states_found_as_needed(self):
+        self.assertIsNone(self.highlighter.state_at(self.store, 10))
+        self.assertEqual(self.lexer.lexed, 10)
+
+    def test_edit_lexes_until_states_agree(self):
+        self.store.lines = [list(f"value_{number} = {number}") for number in range(50000)]
+        self.highlighter.state_at(self.store, 40000)
+        self.lexer.lexed = 0
+        self.store.cursor = Position(0, 20000)
+        self.store.insert_char("x")
+        self.highlighter.edited(self.store, 20000)
+        self.assertEqual(self.lexer.lexed, 1)
+
+    def test_opening_string_changes_following_lines(self):
+        self.highlighter.state_at(self.store, 100)
+        self.store.replace_line(50, 'x = """')
+        self.highlighter.edited(self.store, 50)
+        self.assertEqual(self.highlighter.state_at(self.store, 80), '"""')
+        self.store.replace_line(60, '"""')
+        self.highlighter.edited(self.store, 60)
+        self.assertIsNone(self.highlighter.state_at(self.store, 80))
+        self.assertEqual(self.highlighter.states, self.all_states()[:101])
+
+    def test_long_changes_forget_later_states(self):
+        self.highlighter.state_at(self.store, 1000)
+        self.store.replace_line(10, '"""')
+        self.highlighter.edited(self.store, 10)
+        self.assertEqual(len(self.highlighter.states), 11 + LEX_BATCH)
+        self.assertEqual(self.highlighter.state_at(self.store, 1000), '"""')
+        self.assertEqual(self.highlighter.states, self.all_states())
+
+    def test_added_and_removed_lines(self):
+        self.store.lines = [list('"""'), list("a"), list("b"), list('"""'), list("c")]
+        self.highlighter.state_at(self.store, 5)
+        self.store.cursor = Position(1, 1)
+        self.store.insert_char("\n")
+        self.highlighter.edited(self.store, 1, 1)
+        self.assertEqual(self.highlighter.states, self.all_states())
+        self.store.cursor = Position(0, 1)
+        self.store.remove_char()
+        self.highlighter.edited(self.store, 0, -1)
+        self.assertEqual(self.highlighter.states, self.all_states())
+
+    def test_edit_past_lexed_lines(self):
+        self.highlighter.state_at(self.store, 5)
+        self.highlighter.edited(self.store, 100)
+        self.assertEqual(len(self.highlighter.states), 6)
+        self.assertEqual(self.lexer.lexed, 5)
+
+    def test_removing_last_lines(self):
+        self.store.lines = [list("a"), list("b"), list("c")]
+        self.highlighter.state_at(self.store, 3)
+        self.store.cursor = Position(0, 2)
+        self.store.remove_char()
+        self.highlighter.edited(self.store, 1, -1)
+        self.assertEqual(self.highlighter.states, self.all_states())
+
+    def test_state_past_last_line(self):
+        self.assertIsNone(self.highlighter.state_at(self.store, 1000))
+        with self.assertRaises(IndexError):
+            self.highlighter.state_at(self.store, 1001)
+
+    def test_reset(self):
+        self.highlighter.state_at(self.store, 10)
+        self.highlighter.reset()
+        self.assertEqual(self.highlighter.states, [None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+from unittest.mock import Mock
+
+from pyui.test_helper import PyuiTest
+from pyui.hit_test import HitIndex
+from pyui.window import Window
+from pyui.widgets import HBox, VBox, Stack, ColorRect, Label
+from pyui.assets import get_font
+from pyui.signals import SignalType
+from pyui.helpers import Size, Position, Align
+
+
+def make_rect():
+    return ColorRect(color=(255, 0, 0), size=Size(10, 10))
+
+
+class TestHitIndex(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.box = HBox(align=Align(Align.LEFT, Align.TOP))
+        self.rects = [make_rect() for _ in range(10)]
+        self.box.add_children(self.rects)
+        self.index = HitIndex()
+        self.index.add(self.box, Position(0, 0), Size(100, 10))
+
+    def test_finds_deepest_widget(self):
+        path = self.index.find(Position(35, 5))
+        self.assertEqual(path, [self.box, self.rects[3]])
+
+    def test_nothing_outside_widgets(self):
+        self.assertEqual(self.index.find(Position(150, 150)), [])
+
+    def test_vertical_layout(self):
+        box = VBox()
+        rects = [make_rect() for _ in range(5)]
+        box.add_children(rects)
+        index = HitIndex()
+        index.add(box, Position(0, 0), Size(10, 50))
+        self.assertEqual(index.find(Position(5, 25))[-1], rects[2])
+
+    def test_overlapping_children_pick_top(self):
+        stack = Stack()
+        bottom = make_rect()
+        top = make_rect()
+        stack.add_children([bottom, top])
+        index = HitIndex()
+        index.add(stack, Position(0, 0), Size(10, 10))
+        self.assertEqual(index.find(Position(5, 5))[-1], top)
+
+    def test_overlapping_children_pick_top_content(self):
+        font = get_font("creato.otf", 16)
+        long_label = Label("a much longer label here", font)
+        stack = Stack()
+        stack.add_children([long_label, Label("x", font)])
+        index = HitIndex()
+        index.add(stack, Position(0, 0), Size(200, 20))
+        self.assertEqual(index.find(Position(100, 10)), [stack, long_label])
+
+    def test_offset_position(self):
+        index = HitIndex()
+        index.add(self.box, Position(100, 100), Size(100, 10))
+        self.assertEqual(index.find(Position(105, 105))[-1], self.rects[0])
+
+    def test_top_level_widgets_searched_from_top(self):
+        other = make_rect()
+        self.index.add(other, Position(0, 0), Size(10, 10))
+        self.assertEqual(self.index.find(Position(5, 5)), [other])
+
+
+class TestMouseRouting(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.window = Window(Size(200, 200))
+        self.box = HBox()
+        self.left = ColorRect(color=(255, 0, 0), size=Size(100, 200))
+        self.right = ColorRect(color=(0, 255, 0), size=Size(100, 200))
+        self.box.add_children([self.left, self.right])
+        self.window.add_widget(self.box)
+
+    def tearDown(self):
+        self.window.clear_widgets()
+
+    def move_mouse(self, x, y, left=False):
+        self.window.mouse.update((x, y), (left, False, False))
+        self.window.route_mouse()
+
+    def test_mouse_in(self):
+        callback = Mock()
+        self.left.signals.callbacks[SignalType.MOUSE_IN].append(callback)
+        self.move_mouse(50, 50)
+        callback.assert_called_once_with(self.left)
+        self.assertTrue(self.left.mouse_over)
+
+    def test_mouse_out(self):
+        callback = Mock()
+        self.left.signals.callbacks[SignalType.MOUSE_OUT].append(callback)
+        self.move_mouse(50, 50)
+        self.move_mouse(150, 50)
+        callback.assert_called_once_with(self.left)
+        self.assertFalse(self.left.mouse_over)
+
+    def test_unchanged_path_sends_nothing(self):
+        callback = Mock()
+        self.left.signals.callbacks[SignalType.MOUSE_IN].append(callback)
+        self.move_mouse(50, 50)
+        self.move_mouse(60, 60)
+        callback.assert_called_once()
+
+    def test_parent_stays_hovered(self):
+        callback = Mock()
+        self.box.signals.callbacks[SignalType.MOUSE_OUT].append(callback)
+        self.move_mouse(50, 50)
+        self.move_mouse(150, 50)
+        callback.assert_not_called()
+        self.assertTrue(self.box.mouse_over)
+
+    def test_click(self):
+        callback = Mock()
+        self.right.signals.callbacks[SignalType.MOUSE_LEFT_CLICK].append(callback)
+        self.move_mouse(150, 50)
+        self.move_mouse(150, 50, left=True)
+        callback.assert_called_once_with(self.right)
+
+    def test_click_elsewhere(self):
+        callback = Mock()
+        self.right.signals.callbacks[SignalType.MOUSE_LEFT_CLICK].append(callback)
+        self.move_mouse(50, 50, left=True)
+        callback.assert_not_called()
+
+    def test_layout_change_rebuilds_index(self):
+        self.window.get_hit_index()
+        self.left.margin = self.left.margin
+        self.assertIsNone(self.window.hit_index)
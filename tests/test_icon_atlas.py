@@ -0,0 +1,73 @@
+import pygame
+from pygame import Surface
+
+from pyui.test_helper import PyuiTest
+from pyui.icon_atlas import IconAtlas, pack_rects, atlas_width, load_icon_atlas
+from pyui.assets import get_icon, file_cache, asset_names
+from pyui.helpers import Position
+
+
+def colored(width: int, height: int, color) -> Surface:
+    surface = Surface((width, height), flags=pygame.SRCALPHA)
+    surface.fill(color)
+    return surface
+
+
+class TestPackRects(PyuiTest):
+    def test_rects_do_not_overlap(self):
+        sizes = {f"icon{i}": (8 + i, 16 - i) for i in range(10)}
+        rects = list(pack_rects(sizes, 40).values())
+        for index, rect in enumerate(rects):
+            self.assertEqual(rect.collidelist(rects[index + 1:]), -1)
+
+    def test_rects_fit_width(self):
+        sizes = {f"icon{i}": (10, 10) for i in range(10)}
+        self.assertTrue(all(rect.right <= 35 for rect in pack_rects(sizes, 35).values()))
+
+    def test_tallest_first(self):
+        rects = pack_rects({"small": (10, 5), "tall": (10, 20)}, 100)
+        self.assertEqual(rects["tall"].topleft, (0, 0))
+        self.assertEqual(rects["small"].topleft, (10, 0))
+
+    def test_width_fits_widest(self):
+        self.assertEqual(atlas_width({"wide": (100, 1), "small": (2, 2)}), 100)
+
+    def test_width_is_roughly_square(self):
+        self.assertEqual(atlas_width({f"icon{i}": (10, 10) for i in range(16)}), 40)
+
+
+class TestIconAtlas(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.atlas = IconAtlas({"red": colored(10, 10, (255, 0, 0)), "blue": colored(6, 12, (0, 0, 255))})
+
+    def test_icons_share_surface(self):
+        self.assertIs(self.atlas.icon("red").get_parent(), self.atlas.surface)
+
+    def test_icons_keep_contents(self):
+        red = self.atlas.icon("red")
+        self.assertEqual(red.get_size(), (10, 10))
+        self.assertPixel(red, Position(9, 9), (255, 0, 0))
+        self.assertPixel(self.atlas.icon("blue"), Position(0, 0), (0, 0, 255))
+
+    def test_empty(self):
+        self.assertEqual(IconAtlas({}).surface.get_size(), (0, 0))
+
+
+class TestLoadIconAtlas(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        file_cache.clear()
+
+    def test_get_icon_uses_atlas(self):
+        atlas = load_icon_atlas()
+        self.assertIs(get_icon("open.png").get_parent(), atlas.surface)
+
+    def test_all_icons_loaded(self):
+        load_icon_atlas()
+        self.assertEqual(len(file_cache.icons), len(asset_names("icons")))
+
+    def test_icons_are_pinned_and_free(self):
+        load_icon_atlas()
+        self.assertIn(("icons", "open.png"), file_cache.pinned)
+        self.assertEqual(file_cache.total_bytes, 0)
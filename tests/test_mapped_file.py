@@ -0,0 +1,137 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pyui.helpers import Position
+from pyui.text import TextStore
+from pyui.text.mapped_file import MappedFile, FileSpan
+from pyui.text.piece_table import MAX_PIECE_LENGTH
+
+
+class TestLoadingFiles(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name) / "text.txt"
+        self.text_store = TextStore()
+
+    def tearDown(self):
+        self.text_store.close()
+        self.folder.cleanup()
+
+    def write(self, text: str):
+        self.path.write_bytes(text.encode("utf-8"))
+
+    def test_load(self):
+        self.write("one\ntwo\nthree\n")
+        self.text_store.load(self.path)
+        self.assertEqual(self.text_store.lines, [list("one"), list("two"), list("three")])
+        self.assertEqual(self.text_store.cursor, Position(0, 0))
+
+    def test_only_reads_lines_asked_for(self):
+        self.write("".join(f"line {number}\n" for number in range(10000)))
+        self.text_store.load(self.path, chunk_size=100)
+        self.assertEqual(self.text_store.line(3), "line 3")
+        self.assertLessEqual(self.text_store.source.offset, MAX_PIECE_LENGTH)
+        self.assertEqual(self.text_store.line_count, 10000)
+        self.assertTrue(self.text_store.has_line(9999))
+        self.assertLessEqual(self.text_store.source.offset, MAX_PIECE_LENGTH)
+
+    def test_counting_lines_decodes_nothing(self):
+        self.write("".join(f"línea {number}\n" for number in range(10000)))
+        self.text_store.load(self.path, chunk_size=100)
+        with patch.object(self.text_store.source, "decode") as decode:
+            self.assertEqual(self.text_store.line_count, 10000)
+            self.assertEqual(self.text_store.count_lines(20), 20)
+        decode.assert_not_called()
+
+    def test_only_lines_asked_for_are_decoded(self):
+        self.write("".join(f"línea {number}\n" for number in range(10000)))
+        self.text_store.load(self.path)
+        self.text_store.line(0)
+        with patch.object(self.text_store.source, "decode", wraps=self.text_store.source.decode) as decode:
+            self.assertEqual(self.text_store.line(1), "línea 1")
+        self.assertLessEqual(sum(len(call.args[0]) for call in decode.call_args_list), MAX_PIECE_LENGTH)
+
+    def test_pieces_hold_no_text(self):
+        self.write("".join(f"line {number}\n" for number in range(10000)))
+        self.text_store.load(self.path)
+        self.assertEqual(self.text_store.line(9999), "line 9999")
+        self.assertIsInstance(self.text_store.table.root.source, FileSpan)
+
+    def test_edit_then_read_further(self):
+        self.write("".join(f"line {number}\n" for number in range(100)))
+        self.text_store.load(self.path, chunk_size=32)
+        self.text_store.cursor = Position(0, 2)
+        self.text_store.remove_char()
+        self.assertEqual(self.text_store.line(1), "line 1line 2")
+        self.assertEqual(self.text_store.line(98), "line 99")
+        self.assertFalse(self.text_store.has_line(99))
+
+    def test_characters_split_between_chunks(self):
+        self.write("é" * 10 + "\n")
+        self.text_store.load(self.path, chunk_size=3)
+        self.assertEqual(self.text_store.line(0), "é" * 10)
+
+    def test_missing_final_newline(self):
+        self.write("one\ntwo")
+        self.text_store.load(self.path)
+        self.assertEqual(self.text_store.line_count, 2)
+        self.assertEqual(self.text_store.line(1), "two")
+
+    def test_empty_file(self):
+        self.write("")
+        self.text_store.load(self.path)
+        self.assertEqual(self.text_store.line_count, 0)
+        with self.assertRaises(IndexError):
+            self.text_store.line(0)
+
+    def test_invalid_bytes_are_replaced(self):
+        self.path.write_bytes(b"ab\xffcd\n")
+        self.text_store.load(self.path)
+        self.assertEqual(self.text_store.line(0), "ab�cd")
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            self.text_store.load(Path(self.folder.name) / "missing.txt")
+
+    def test_setting_lines_closes_file(self):
+        self.write("one\ntwo\n")
+        self.text_store.load(self.path, chunk_size=2)
+        source = self.text_store.source
+        self.text_store.lines = [['a']]
+        self.assertIsNone(source.map)
+        self.assertEqual(self.text_store.lines, [['a']])
+
+    def test_file_stays_mapped_once_read(self):
+        self.write("one\ntwo\n")
+        self.text_store.load(self.path)
+        self.assertEqual(self.text_store.line_count, 2)
+        self.assertEqual(self.text_store.line(1), "two")
+        self.assertIsNotNone(self.text_store.source.map)
+
+    def test_spans_end_after_a_newline(self):
+        self.write("a" * 10 + "\n" + "b" * MAX_PIECE_LENGTH + "\nc\n")
+        mapped = MappedFile(self.path)
+        self.assertEqual(str(mapped.read()), "a" * 10 + "\n")
+        self.assertEqual(str(mapped.read()), "b" * MAX_PIECE_LENGTH + "\n")
+        self.assertEqual(str(mapped.read()), "c\n")
+        self.assertTrue(mapped.finished)
+        mapped.close()
+
+    def test_lines_after(self):
+        self.write("".join(f"line {number}\n" for number in range(100)) + "last")
+        mapped = MappedFile(self.path, chunk_size=16)
+        self.assertEqual(mapped.lines_after(0), 101)
+        self.assertEqual(mapped.lines_after(len("line 0\n")), 100)
+        self.assertGreaterEqual(mapped.lines_after(0, 5), 5)
+        mapped.close()
+
+    def test_encoding_without_newline_bytes(self):
+        self.write("one\n")
+        with self.assertRaises(ValueError):
+            self.text_store.load(self.path, "utf-16")
+
+
+if __name__ == '__main__':
+    unittest.main()
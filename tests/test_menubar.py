@@ -0,0 +1,42 @@
+from pygame import Surface
+
+from pyui.test_helper import PyuiTest
+from pyui.widgets.menubar import MenuItem, Menu
+from pyui.assets import get_font
+from pyui.signals import SignalType, process_signal_stack
+from pyui.helpers import Size, Position
+
+
+class TestMenuItem(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.item = MenuItem("File", get_font("creato.otf", 18), Menu())
+        self.surface = Surface((100, 100))
+
+    def render(self):
+        self.item.render(self.mouse, self.surface, Position(0, 0), Size(60, 30))
+
+    def test_cache_is_kept_between_frames(self):
+        self.render()
+        image = self.item.image.image
+        self.render()
+        self.assertIs(self.item.image.image, image)
+
+    def send(self, signal):
+        self.item.signals.trigger(signal, self.item)
+        process_signal_stack()
+
+    def test_mouse_in_highlights(self):
+        self.render()
+        self.send(SignalType.MOUSE_IN)
+        self.assertTrue(self.item.paint_dirty)
+        self.render()
+        self.assertPixel(self.surface, Position(2, 2), (100, 100, 100))
+
+    def test_mouse_out_removes_highlight(self):
+        self.send(SignalType.MOUSE_IN)
+        self.render()
+        self.send(SignalType.MOUSE_OUT)
+        self.surface.fill((0, 0, 0))
+        self.render()
+        self.assertPixel(self.surface, Position(2, 2), (0, 0, 0))
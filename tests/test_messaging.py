@@ -1,7 +1,10 @@
+import gc
 import unittest
+import weakref
 from unittest.mock import Mock
 
 from pyui.messaging import MessageType, Message, MessageBus, message_bus
+from pyui.widget import Widget
 
 
 class TestMessage(unittest.TestCase):
@@ -44,7 +47,7 @@ class TestMessageBus(unittest.TestCase):
         self.bus.subscribe(subscriber, msg_type, callback)
         
         self.assertIn(msg_type, self.bus.subscribers)
-        self.assertIn(callback, self.bus.subscribers[msg_type])
+        self.assertIn((subscriber, callback), self.bus.subscribers[msg_type])
         self.assertIn(subscriber, self.bus.subscribed_objects)
         self.assertIn(msg_type, self.bus.subscribed_objects[subscriber])
     
@@ -130,3 +133,153 @@ class TestMessageBus(unittest.TestCase):
         
         # This should not raise an exception
         self.bus.post(message)
+
+    def test_unsubscribe_lambda(self):
+        """Test that lambda callbacks are removed with their subscriber."""
+        subscriber = Mock()
+        msg_type = MessageType.ADD_WIDGET
+        self.bus.subscribe(subscriber, msg_type, lambda message: None)
+        self.bus.unsubscribe(subscriber)
+        self.assertNotIn(msg_type, self.bus.subscribers)
+
+    def test_unsubscribe_keeps_other_subscribers(self):
+        """Test that unsubscribing one object leaves the others subscribed."""
+        subscriber1 = Mock()
+        subscriber2 = Mock()
+        msg_type = MessageType.ADD_WIDGET
+        self.bus.subscribe(subscriber1, msg_type, subscriber1.callback)
+        self.bus.subscribe(subscriber2, msg_type, subscriber2.callback)
+        self.bus.unsubscribe(subscriber1)
+
+        message = Message(msg_type, subscriber2)
+        self.bus.post(message)
+        self.bus.consume()
+        subscriber1.callback.assert_not_called()
+        subscriber2.callback.assert_called_once_with(message)
+
+    def test_unsubscribe_one_type_keeps_others(self):
+        """Test that unsubscribing from one type leaves other types subscribed."""
+        subscriber = Mock()
+        self.bus.subscribe(subscriber, MessageType.ADD_WIDGET, subscriber.callback1)
+        self.bus.subscribe(subscriber, MessageType.REMOVE_MODAL, subscriber.callback2)
+        self.bus.unsubscribe(subscriber, MessageType.ADD_WIDGET)
+        self.assertIn(MessageType.REMOVE_MODAL, self.bus.subscribed_objects[subscriber])
+        self.assertIn((subscriber, subscriber.callback2), self.bus.subscribers[MessageType.REMOVE_MODAL])
+
+    def test_unsubscribe_keeps_shared_callback(self):
+        """Test that subscribers registering the same function are unsubscribed separately."""
+        received = []
+
+        def callback(message):
+            received.append(message)
+        subscriber1 = Mock()
+        subscriber2 = Mock()
+        msg_type = MessageType.ADD_WIDGET
+        self.bus.subscribe(subscriber1, msg_type, callback)
+        self.bus.subscribe(subscriber2, msg_type, callback)
+        self.bus.unsubscribe(subscriber1)
+
+        message = Message(msg_type, subscriber2)
+        self.bus.post(message)
+        self.bus.consume()
+        self.assertEqual(received, [message])
+
+    def test_unsubscribe_during_consume(self):
+        """Test that a callback can unsubscribe while messages are delivered."""
+        subscriber = Mock()
+        msg_type = MessageType.ADD_WIDGET
+        other = Mock()
+        self.bus.subscribe(subscriber, msg_type, lambda message: self.bus.unsubscribe(subscriber))
+        self.bus.subscribe(other, msg_type, other.callback)
+        self.bus.post(Message(msg_type, other))
+        self.bus.consume()
+        other.callback.assert_called_once()
+        self.assertNotIn(subscriber, self.bus.subscribed_objects)
+
+    def test_messages_posted_while_consuming(self):
+        """Test that messages posted by callbacks are consumed in the same call."""
+        subscriber = Mock()
+        second = Message(MessageType.REMOVE_MODAL, subscriber)
+        self.bus.subscribe(subscriber, MessageType.ADD_WIDGET, lambda message: self.bus.post(second))
+        self.bus.subscribe(subscriber, MessageType.REMOVE_MODAL, subscriber.callback)
+        self.bus.post(Message(MessageType.ADD_WIDGET, subscriber))
+        self.bus.consume()
+        subscriber.callback.assert_called_once_with(second)
+        self.assertFalse(self.bus.has_posts)
+
+    def test_messages_consumed_in_order(self):
+        """Test that messages are delivered in the order they were posted."""
+        subscriber = Mock()
+        received = []
+        self.bus.subscribe(subscriber, MessageType.ADD_WIDGET, lambda message: received.append(message.data))
+        for i in range(3):
+            self.bus.post(Message(MessageType.ADD_WIDGET, subscriber, i))
+        self.bus.consume()
+        self.assertEqual(received, [0, 1, 2])
+
+
+class WeakSubscriber:
+    def __init__(self):
+        self.received = []
+
+    def callback(self, message):
+        self.received.append(message)
+
+
+class TestWeakSubscriptions(unittest.TestCase):
+    """Tests that the MessageBus does not keep subscribers alive."""
+
+    def setUp(self):
+        self.bus = MessageBus()
+
+    def test_bound_method_does_not_keep_subscriber(self):
+        subscriber = WeakSubscriber()
+        self.bus.subscribe(subscriber, MessageType.ADD_WIDGET, subscriber.callback)
+        ref = weakref.ref(subscriber)
+        del subscriber
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_dead_subscriber_is_removed(self):
+        subscriber = WeakSubscriber()
+        self.bus.subscribe(subscriber, MessageType.ADD_WIDGET, subscriber.callback)
+        del subscriber
+        gc.collect()
+        self.assertEqual(len(self.bus.subscribed_objects), 0)
+        self.assertNotIn(MessageType.ADD_WIDGET, self.bus.subscribers)
+
+    def test_live_subscriber_still_receives(self):
+        subscriber = WeakSubscriber()
+        self.bus.subscribe(subscriber, MessageType.ADD_WIDGET, subscriber.callback)
+        gc.collect()
+        sender = Mock()
+        self.bus.post(Message(MessageType.ADD_WIDGET, sender))
+        self.bus.consume()
+        self.assertEqual(len(subscriber.received), 1)
+
+    def test_function_callback_is_kept(self):
+        subscriber = WeakSubscriber()
+        received = []
+        self.bus.subscribe(subscriber, MessageType.ADD_WIDGET, lambda message: received.append(message))
+        gc.collect()
+        self.bus.post(Message(MessageType.ADD_WIDGET, Mock()))
+        self.bus.consume()
+        self.assertEqual(len(received), 1)
+
+    def test_unsubscribe_after_death_is_safe(self):
+        subscriber = WeakSubscriber()
+        self.bus.subscribe(subscriber, MessageType.ADD_WIDGET, subscriber.callback)
+        other = WeakSubscriber()
+        del subscriber
+        gc.collect()
+        self.bus.unsubscribe(other)
+        self.assertEqual(len(self.bus.subscribed_objects), 0)
+
+    def test_widget_is_collected(self):
+        widget = Widget()
+        self.bus.subscribe(widget, MessageType.ADD_WIDGET, widget.set_active)
+        ref = weakref.ref(widget)
+        del widget
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(self.bus.subscribed_objects), 0)
@@ -105,3 +105,15 @@ class TestMouse(unittest.TestCase):
         self.assertFalse(self.mouse.left.down)
         self.assertFalse(self.mouse.left.up)
         self.assertTrue(self.mouse.left.state)
+
+    def test_without_clicks_keeps_position(self):
+        self.mouse.update((10, 20), (True, False, False))
+        mouse = self.mouse.without_clicks()
+        self.assertEqual(mouse.position, Position(10, 20))
+        self.assertTrue(mouse.left.state)
+
+    def test_without_clicks_has_no_button_events(self):
+        self.mouse.update((10, 20), (True, False, True))
+        mouse = self.mouse.without_clicks()
+        self.assertFalse(mouse.left.down)
+        self.assertFalse(mouse.right.down)
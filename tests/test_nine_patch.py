@@ -2,6 +2,7 @@ import pygame
 from pygame import Color, Surface
 
 from pyui.widgets import NinePatch, NinePatchData
+from pyui.widgets.nine_patch import NinePatchCache, NinePatchPieces, fill_blits
 from pyui.helpers import Size, Margin, Position, Align, Expand
 from pyui.test_helper import PyuiTest
 
@@ -25,6 +26,10 @@ class TestNinePatchData(PyuiTest):
         self.assertIsNotNone(nine_patch_data.image)
         self.assertIsInstance(nine_patch_data.image, Surface)
     
+    def test_tile_defaults_off(self):
+        """Nine patches stretch unless the JSON asks for tiling"""
+        self.assertFalse(NinePatchData.from_json("button.json").tile)
+
     def test_json_not_found(self):
         """Test error handling when JSON file is not found"""
         with self.assertRaises(FileNotFoundError):
@@ -147,3 +152,141 @@ class TestNinePatchRendering(PyuiTest):
         self.assertPixel(dest_surface, Position(15, 15), (0, 0, 0))
         # The area within the nine-patch after the offset should be modified
         self.assertNotPixel(dest_surface, Position(45, 45), (0, 0, 0))
+
+    def test_cached_render(self):
+        """Test that a second render draws the cached image"""
+        self.nine_patch.render(self.mouse, pygame.Surface((100, 100)), Position(0, 0), Size(50, 50))
+        dest_surface = pygame.Surface((100, 100))
+        dest_surface.fill(Color(0, 0, 0))
+        self.nine_patch.render(self.mouse, dest_surface, Position(20, 20), Size(50, 50))
+        self.assertPixel(dest_surface, Position(15, 15), (0, 0, 0))
+        self.assertNotPixel(dest_surface, Position(45, 45), (0, 0, 0))
+
+
+def make_patch_image() -> Surface:
+    """A 3x3 image with red corners, green edges and a blue center"""
+    image = Surface((3, 3), flags=pygame.SRCALPHA)
+    image.fill((0, 255, 0))
+    for corner in [(0, 0), (2, 0), (0, 2), (2, 2)]:
+        image.set_at(corner, (255, 0, 0))
+    image.set_at((1, 1), (0, 0, 255))
+    return image
+
+
+class TestNinePatchCache(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.data = NinePatchData(top=1, bottom=1, left=1, right=1, image=make_patch_image())
+        # the pieces and two 10x10 patches fit, a third does not
+        self.cache = NinePatchCache(budget=NinePatchPieces(self.data).bytes + 1000)
+
+    def test_compose(self):
+        patch = self.cache.get(self.data, Size(10, 10))
+        self.assertPixel(patch, Position(0, 0), (255, 0, 0))
+        self.assertPixel(patch, Position(9, 9), (255, 0, 0))
+        self.assertPixel(patch, Position(5, 0), (0, 255, 0))
+        self.assertPixel(patch, Position(0, 5), (0, 255, 0))
+        self.assertPixel(patch, Position(5, 5), (0, 0, 255))
+
+    def test_same_size_is_reused(self):
+        first = self.cache.get(self.data, Size(10, 10))
+        self.assertIs(self.cache.get(self.data, Size(10, 10)), first)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_shared_between_equal_data(self):
+        first = self.cache.get(self.data, Size(10, 10))
+        other = NinePatchData(top=1, bottom=1, left=1, right=1, image=self.data.image)
+        self.assertIs(self.cache.get(other, Size(10, 10)), first)
+
+    def test_different_borders_not_shared(self):
+        first = self.cache.get(self.data, Size(10, 10))
+        other = NinePatchData(top=0, bottom=0, left=1, right=1, image=self.data.image)
+        self.assertIsNot(self.cache.get(other, Size(10, 10)), first)
+
+    def test_pieces_cut_once(self):
+        self.cache.get(self.data, Size(10, 10))
+        pieces = self.cache.get_pieces(self.data)
+        self.cache.get(self.data, Size(20, 20))
+        self.assertIs(self.cache.get_pieces(self.data), pieces)
+
+    def test_least_recently_used_is_dropped(self):
+        first = self.cache.get(self.data, Size(10, 10))
+        self.cache.get(self.data, Size(10, 11))
+        self.cache.get(self.data, Size(10, 10))
+        self.cache.get(self.data, Size(10, 12))
+        self.assertEqual(len(self.cache.composed), 2)
+        self.assertIs(self.cache.get(self.data, Size(10, 10)), first)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_pieces_of_unused_images_are_dropped(self):
+        self.cache.budget = 0
+        self.cache.get_pieces(self.data)
+        other = NinePatchData(top=1, bottom=1, left=1, right=1, image=make_patch_image())
+        self.cache.get_pieces(other)
+        self.assertEqual(list(self.cache.pieces.values()), [self.cache.get_pieces(other)])
+        self.assertEqual(self.cache.total_bytes, self.cache.get_pieces(other).bytes)
+
+    def test_clear(self):
+        self.cache.get(self.data, Size(10, 10))
+        self.cache.clear()
+        self.assertEqual(len(self.cache.pieces), 0)
+        self.assertEqual(self.cache.total_bytes, 0)
+
+
+def make_tiled_image() -> Surface:
+    """A 4x4 image, the top edge alternates green and yellow and the center is a checkerboard"""
+    image = Surface((4, 4), flags=pygame.SRCALPHA)
+    image.fill((255, 0, 0))
+    image.set_at((1, 0), (0, 255, 0))
+    image.set_at((2, 0), (255, 255, 0))
+    for x, y in [(1, 1), (2, 2)]:
+        image.set_at((x, y), (0, 0, 255))
+    for x, y in [(2, 1), (1, 2)]:
+        image.set_at((x, y), (255, 255, 255))
+    return image
+
+
+class TestTiledNinePatch(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.cache = NinePatchCache()
+        self.data = NinePatchData(top=1, bottom=1, left=1, right=1, image=make_tiled_image(), tile=True)
+
+    def test_edges_repeat(self):
+        patch = self.cache.get(self.data, Size(12, 12))
+        self.assertPixel(patch, Position(1, 0), (0, 255, 0))
+        self.assertPixel(patch, Position(2, 0), (255, 255, 0))
+        self.assertPixel(patch, Position(9, 0), (0, 255, 0))
+        self.assertPixel(patch, Position(10, 0), (255, 255, 0))
+
+    def test_center_repeats(self):
+        patch = self.cache.get(self.data, Size(12, 12))
+        self.assertPixel(patch, Position(5, 5), (0, 0, 255))
+        self.assertPixel(patch, Position(6, 5), (255, 255, 255))
+        self.assertPixel(patch, Position(6, 6), (0, 0, 255))
+
+    def test_corners_are_kept(self):
+        patch = self.cache.get(self.data, Size(12, 12))
+        self.assertPixel(patch, Position(11, 11), (255, 0, 0))
+
+    def test_large_patch_is_filled(self):
+        patch = self.cache.get(self.data, Size(600, 20))
+        self.assertPixel(patch, Position(597, 0), (0, 255, 0))
+        self.assertPixel(patch, Position(597, 1), (0, 0, 255))
+
+    def test_not_shared_with_stretched(self):
+        stretched = NinePatchData(top=1, bottom=1, left=1, right=1, image=self.data.image)
+        self.assertIsNot(self.cache.get(stretched, Size(12, 12)), self.cache.get(self.data, Size(12, 12)))
+
+    def test_strips_built_once(self):
+        pieces = self.cache.get_pieces(self.data)
+        strip = pieces.top_strip
+        self.cache.get(self.data, Size(30, 30))
+        self.assertIs(self.cache.get_pieces(self.data).top_strip, strip)
+
+    def test_fill_crops_last_blit(self):
+        blits = fill_blits(Surface((10, 1)), pygame.Rect(0, 0, 25, 1))
+        self.assertEqual([area for _, _, area in blits], [(0, 0, 10, 1), (0, 0, 10, 1), (0, 0, 5, 1)])
+
+    def test_fill_empty_strip(self):
+        self.assertEqual(fill_blits(Surface((0, 1)), pygame.Rect(0, 0, 25, 1)), [])
@@ -0,0 +1,88 @@
+import random
+import unittest
+
+from pyui.text.piece_table import PieceTable, MAX_PIECE_LENGTH, MAX_ADDED_LENGTH
+
+
+class TestPieceTable(unittest.TestCase):
+    def test_empty(self):
+        table = PieceTable()
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.get_text(), "")
+        self.assertEqual(table.newlines, 0)
+
+    def test_insert(self):
+        table = PieceTable("hello world")
+        table.insert(5, ",")
+        table.insert(0, ">")
+        table.insert(len(table), "!")
+        self.assertEqual(table.get_text(), ">hello, world!")
+
+    def test_delete(self):
+        table = PieceTable("hello world")
+        table.delete(5, 6)
+        table.delete(0, 1)
+        self.assertEqual(table.get_text(), "ello")
+
+    def test_out_of_range(self):
+        table = PieceTable("abc")
+        with self.assertRaises(IndexError):
+            table.insert(4, "x")
+        with self.assertRaises(IndexError):
+            table.delete(2, 2)
+        with self.assertRaises(IndexError):
+            table.line_start(1)
+
+    def test_get_text_range(self):
+        table = PieceTable("abcdef")
+        table.insert(3, "XYZ")
+        self.assertEqual(table.get_text(2, 7), "cXYZd")
+
+    def test_long_text_is_cut_into_pieces(self):
+        table = PieceTable("a" * (MAX_PIECE_LENGTH * 3 + 1))
+        self.assertEqual(table.pieces, 4)
+
+    def test_typing_extends_pieces(self):
+        table = PieceTable("start")
+        for offset in range(5, 5 + MAX_ADDED_LENGTH):
+            table.insert(offset, "x")
+        self.assertEqual(table.pieces, 2)
+        table.insert(len(table), "x")
+        self.assertEqual(table.pieces, 3)
+
+    def test_original_text_is_not_extended(self):
+        table = PieceTable("start")
+        table.insert(5, "x")
+        self.assertEqual(table.pieces, 2)
+
+    def test_line_start(self):
+        table = PieceTable("one\ntwo\n\nfour\n")
+        self.assertEqual([table.line_start(line) for line in range(5)], [0, 4, 8, 9, 14])
+
+    def test_line_start_across_pieces(self):
+        text = "".join(f"line {number}\n" for number in range(2000))
+        table = PieceTable(text)
+        self.assertGreater(table.pieces, 1)
+        self.assertEqual(table.line_start(1500), text.index("line 1500\n"))
+
+    def test_random_edits_match_string(self):
+        generator = random.Random(42)
+        text = "".join(f"line {number}\n" for number in range(500))
+        table = PieceTable(text)
+        for _ in range(1000):
+            offset = generator.randint(0, len(text))
+            if generator.random() < 0.6:
+                inserted = generator.choice(["a", "\n", "xyz"])
+                text = text[:offset] + inserted + text[offset:]
+                table.insert(offset, inserted)
+            else:
+                length = generator.randint(0, min(5, len(text) - offset))
+                text = text[:offset] + text[offset + length:]
+                table.delete(offset, length)
+        self.assertEqual(table.get_text(), text)
+        self.assertEqual(table.newlines, text.count("\n"))
+        self.assertEqual(table.line_start(100), len("\n".join(text.split("\n")[:100])) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
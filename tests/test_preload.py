@@ -0,0 +1,77 @@
+import json
+import tempfile
+from pathlib import Path
+
+from pyui.test_helper import PyuiTest
+from pyui.preload import preload, load_manifest, PreloadReport
+from pyui.assets import file_cache
+
+MANIFEST = {
+    "fonts": [["creato.otf", 16], ["creato.otf", 18]],
+    "nine_patch": ["frame.json"],
+    "icons": ["open.png"],
+    "images": ["dog.png"],
+}
+
+
+class TestPreload(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        file_cache.clear()
+
+    def assert_cached(self):
+        self.assertIn("dog.png", file_cache.images)
+        self.assertIn("open.png", file_cache.icons)
+        self.assertIn("frame.json", file_cache.nine_patch)
+        self.assertIn("frame.png", file_cache.nine_patch)
+        self.assertIn("creato.otf_18", file_cache.fonts)
+
+    def test_warms_cache(self):
+        preload(MANIFEST)
+        self.assert_cached()
+
+    def test_warms_cache_in_parallel(self):
+        preload(MANIFEST, parallel=True)
+        self.assert_cached()
+
+    def test_reports_every_asset(self):
+        for parallel in (False, True):
+            file_cache.clear()
+            report = preload(MANIFEST, parallel)
+            names = sorted(name for _, name, _ in report.timings)
+            self.assertEqual(names, ["creato.otf 16", "creato.otf 18", "dog.png", "frame.json", "open.png"])
+
+    def test_timings_are_positive(self):
+        report = preload(MANIFEST)
+        self.assertTrue(all(seconds >= 0 for _, _, seconds in report.timings))
+        self.assertGreaterEqual(report.total, max(seconds for _, _, seconds in report.timings))
+
+    def test_missing_asset(self):
+        for parallel in (False, True):
+            with self.assertRaises(FileNotFoundError):
+                preload({"images": ["missing.png"]}, parallel)
+
+    def test_empty_manifest(self):
+        self.assertEqual(preload({}).timings, [])
+
+    def test_load_manifest(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "manifest.json"
+            path.write_text(json.dumps(MANIFEST))
+            self.assertEqual(load_manifest(path), MANIFEST)
+
+
+class TestPreloadReport(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.report = PreloadReport()
+        self.report.add("images", "fast.png", 0.001)
+        self.report.add("images", "slow.png", 0.5)
+
+    def test_slowest(self):
+        self.assertEqual(self.report.slowest(1), [("images", "slow.png", 0.5)])
+
+    def test_text_lists_slowest_first(self):
+        lines = str(self.report).splitlines()
+        self.assertIn("slow.png", lines[1])
+        self.assertIn("fast.png", lines[2])
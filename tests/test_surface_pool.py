@@ -0,0 +1,93 @@
+import pygame
+
+from pyui.test_helper import PyuiTest
+from pyui.surface_pool import SurfacePool, surface_pool, surface_bytes
+from pyui.widgets import Frame, Stack, ColorRect, NinePatchData
+from pyui.helpers import Size, Position
+
+
+class TestSurfacePool(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.pool = SurfacePool()
+
+    def test_acquire_has_size(self):
+        surface = self.pool.acquire(Size(20, 10))
+        self.assertEqual(surface.get_size(), (20, 10))
+
+    def test_acquire_has_alpha(self):
+        surface = self.pool.acquire(Size(20, 10))
+        self.assertTrue(surface.get_flags() & pygame.SRCALPHA)
+
+    def test_released_surface_is_reused(self):
+        surface = self.pool.acquire(Size(20, 10))
+        self.pool.release(surface)
+        self.assertIs(self.pool.acquire(Size(20, 10)), surface)
+        self.assertEqual(self.pool.hits, 1)
+
+    def test_other_sizes_are_not_reused(self):
+        surface = self.pool.acquire(Size(20, 10))
+        self.pool.release(surface)
+        self.assertIsNot(self.pool.acquire(Size(10, 20)), surface)
+        self.assertEqual(self.pool.misses, 2)
+
+    def test_reused_surface_is_cleared(self):
+        surface = self.pool.acquire(Size(20, 10))
+        surface.fill((255, 0, 0, 255))
+        self.pool.release(surface)
+        self.assertPixel(self.pool.acquire(Size(20, 10)), Position(5, 5), (0, 0, 0, 0))
+
+    def test_budget_is_respected(self):
+        surface = self.pool.acquire(Size(20, 10))
+        self.pool.budget = surface_bytes(surface) - 1
+        self.pool.release(surface)
+        self.assertEqual(self.pool.free_bytes, 0)
+        self.assertEqual(self.pool.free, {})
+
+    def test_release_none(self):
+        self.pool.release(None)
+        self.assertEqual(self.pool.free_bytes, 0)
+
+    def test_surface_without_alpha_is_not_kept(self):
+        self.pool.release(pygame.Surface((20, 10)))
+        self.assertEqual(self.pool.free, {})
+        self.assertTrue(self.pool.acquire(Size(20, 10)).get_flags() & pygame.SRCALPHA)
+
+    def test_free_bytes_tracked(self):
+        surface = self.pool.acquire(Size(20, 10))
+        self.pool.release(surface)
+        self.assertEqual(self.pool.free_bytes, surface_bytes(surface))
+        self.pool.acquire(Size(20, 10))
+        self.assertEqual(self.pool.free_bytes, 0)
+
+
+class TestWidgetPooling(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        surface_pool.clear()
+        self.destination = pygame.Surface((100, 100))
+
+    def test_cache_update_releases_old_image(self):
+        rect = ColorRect(color=(255, 0, 0), size=Size(10, 10))
+        rect.render(self.mouse, self.destination, Position(0, 0), Size(50, 50))
+        old_image = rect.image.image
+        rect.image.clear()
+        self.assertIn(old_image, surface_pool.free[(50, 50)])
+
+    def test_stack_reuses_surfaces(self):
+        stack = Stack()
+        stack.add_child(ColorRect(color=(255, 0, 0), size=Size(10, 10)))
+        stack.render(self.mouse, self.destination, Position(0, 0), Size(50, 50))
+        misses = surface_pool.misses
+        for _ in range(3):
+            stack.render(self.mouse, self.destination, Position(0, 0), Size(50, 50))
+        self.assertEqual(surface_pool.misses, misses)
+
+    def test_frame_reuses_surfaces(self):
+        patch_data = NinePatchData(top=2, bottom=2, left=2, right=2, image=pygame.Surface((6, 6)))
+        frame = Frame(ColorRect(color=(255, 0, 0), size=Size(10, 10)), patch_data)
+        frame.render(self.mouse, self.destination, Position(0, 0), Size(50, 50))
+        misses = surface_pool.misses
+        for _ in range(3):
+            frame.render(self.mouse, self.destination, Position(0, 0), Size(50, 50))
+        self.assertEqual(surface_pool.misses, misses)
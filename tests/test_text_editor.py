@@ -0,0 +1,316 @@
+import pygame
+from unittest.mock import patch, PropertyMock
+
+from pyui.helpers import Size, Position, Margin, Expand
+from pyui.test_helper import PyuiTest
+from pyui.timers import timers
+from pyui.window import Window
+from pyui.widgets import TextEditor, Stack, VBox, ColorRect
+from pyui.widgets.text_editor import LineCache, MAX_RENDERED_CHARACTERS, SYNTAX_COLORS
+from pyui.text import TextStore
+from pyui.text.highlight import PythonLexer, TokenKind
+
+SIZE = Size(200, 200)
+LINE_COUNT = 10000
+
+
+def make_editor(top_line: int = 0) -> TextEditor:
+    editor = TextEditor()
+    editor.text.lines = [list(f"line {number}") for number in range(LINE_COUNT)]
+    editor.scroll(top_line)
+    return editor
+
+
+def draw(editor: TextEditor) -> pygame.Surface:
+    surface = pygame.Surface(SIZE.as_tuple, flags=pygame.SRCALPHA)
+    editor.render(None, surface, Position(0, 0), SIZE)
+    return surface
+
+
+class TestTextEditor(PyuiTest):
+    def assertSameImage(self, first: pygame.Surface, second: pygame.Surface):
+        self.assertEqual(pygame.image.tobytes(first, "RGBA"), pygame.image.tobytes(second, "RGBA"))
+
+    def test_only_visible_lines_are_rendered(self):
+        editor = make_editor()
+        draw(editor)
+        self.assertEqual(editor.lines.misses, editor.visible_lines(SIZE))
+
+    def test_redraw_uses_line_cache(self):
+        editor = make_editor()
+        draw(editor)
+        misses = editor.lines.misses
+        editor.invalidate_paint()
+        draw(editor)
+        self.assertEqual(editor.lines.misses, misses)
+
+    def test_edit_renders_only_edited_line(self):
+        editor = make_editor()
+        draw(editor)
+        misses = editor.lines.misses
+        editor.text.cursor = Position(2, 3)
+        editor.insert_char("x")
+        draw(editor)
+        self.assertEqual(editor.text.line(3), "lixne 3")
+        self.assertEqual(editor.lines.misses, misses + 1)
+
+    def test_scroll_down_matches_full_draw(self):
+        editor = make_editor(100)
+        draw(editor)
+        misses = editor.lines.misses
+        editor.scroll(2)
+        scrolled = draw(editor)
+        # the line that was cut off at the bottom is redrawn from the cache
+        self.assertEqual(editor.lines.misses, misses + 2)
+        self.assertSameImage(scrolled, draw(make_editor(102)))
+
+    def test_scroll_up_matches_full_draw(self):
+        editor = make_editor(100)
+        draw(editor)
+        editor.scroll(-3)
+        self.assertSameImage(draw(editor), draw(make_editor(97)))
+
+    def test_scroll_by_more_than_a_page(self):
+        editor = make_editor()
+        draw(editor)
+        editor.scroll(50)
+        self.assertSameImage(draw(editor), draw(make_editor(50)))
+
+    def test_scroll_limits(self):
+        editor = make_editor()
+        editor.scroll(-5)
+        self.assertEqual(editor.top_line, 0)
+        editor.scroll(LINE_COUNT * 2)
+        self.assertEqual(editor.top_line, LINE_COUNT - 1)
+
+    def test_scroll_keeps_image(self):
+        editor = make_editor()
+        draw(editor)
+        image = editor.image.image
+        editor.scroll(1)
+        draw(editor)
+        self.assertIs(editor.image.image, image)
+
+    def test_draws_past_last_line(self):
+        editor = make_editor(LINE_COUNT - 1)
+        surface = draw(editor)
+        self.assertPixel(surface, Position(100, 150), pygame.Color(editor.background))
+
+    def test_cursor_position(self):
+        editor = make_editor(5)
+        editor.text.cursor = Position(4, 7)
+        editor.update_cursor_position()
+        width = editor.font.size_of("line").width
+        self.assertEqual(editor.cursor_position, Position(editor.margin.left + width,
+                                                          editor.margin.top + 2 * editor.line_height))
+
+    def test_cursor_out_of_view_is_not_drawn(self):
+        editor = make_editor(5)
+        editor.margin = Margin(0, 0, 0, 0)
+        editor.background = (255, 255, 255)
+        editor.text.cursor = Position(0, 0)
+        surface = pygame.Surface(SIZE.as_tuple, flags=pygame.SRCALPHA)
+        editor.render(None, surface, Position(0, editor.line_height * 5), SIZE)
+        self.assertEqual(surface.get_at((0, 0)), pygame.Color(0, 0, 0, 0))
+
+    def test_load_file_scrolls_to_top(self):
+        editor = make_editor(10)
+        editor.load_file(__file__)
+        self.assertEqual(editor.top_line, 0)
+        self.assertEqual(editor.text.line(0), "import pygame")
+
+    def test_scroll_loaded_file_past_the_end(self):
+        editor = TextEditor()
+        editor.load_file(__file__)
+        with patch.object(TextStore, "line_count", new_callable=PropertyMock) as line_count:
+            editor.scroll(LINE_COUNT)
+        line_count.assert_not_called()
+        self.assertEqual(editor.top_line, editor.text.line_count - 1)
+
+
+class TestCursorBlink(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.window = Window.default()
+        self.editor = make_editor()
+        self.editor.background = (255, 255, 255)
+        self.editor.text.cursor = Position(0, 1)
+
+    def tearDown(self):
+        timers.clear()
+
+    def draw_window(self):
+        self.window.draw()
+        self.window.needs_draw = False
+
+    def cursor_pixel(self) -> pygame.Color:
+        self.editor.update_cursor_position()
+        return self.window.screen.get_at(self.editor.cursor_position.as_tuple)
+
+    def blink(self):
+        self.editor.blink(self.editor.next_blink)
+
+    def test_blink_repaints_only_cursor(self):
+        self.window.add_widget(self.editor)
+        self.draw_window()
+        self.assertEqual(self.cursor_pixel(), pygame.Color(0, 0, 0))
+        with patch('pygame.display.update') as update:
+            self.blink()
+        self.assertEqual(self.cursor_pixel(), pygame.Color(255, 255, 255))
+        area = update.call_args[0][0]
+        self.assertEqual(area.size, self.editor.cursor_size.as_tuple)
+        self.assertFalse(self.window.needs_draw)
+        self.assertIsNotNone(self.editor.image.image)
+
+    def test_blink_restores_line_pixels(self):
+        self.window.add_widget(self.editor)
+        self.draw_window()
+        self.editor.cursor_visible = False
+        self.editor.invalidate_paint()
+        self.draw_window()
+        hidden = pygame.image.tobytes(self.window.screen, "RGBA")
+        with patch('pygame.display.update'):
+            self.blink()
+            self.blink()
+        self.assertEqual(pygame.image.tobytes(self.window.screen, "RGBA"), hidden)
+
+    def test_blink_is_a_timer_callback(self):
+        self.window.add_widget(self.editor)
+        self.draw_window()
+        self.assertEqual(timers.deadlines, [])
+        with patch('pygame.display.update'):
+            self.assertFalse(timers.expire(self.editor.next_blink))
+        self.assertFalse(self.editor.cursor_visible)
+        self.assertGreater(self.editor.next_blink, 0)
+
+    def test_old_blinks_are_ignored(self):
+        self.window.add_widget(self.editor)
+        self.draw_window()
+        stale = self.editor.next_blink - 1
+        self.editor.blink(stale)
+        self.assertTrue(self.editor.cursor_visible)
+
+    def test_typing_shows_cursor(self):
+        self.window.add_widget(self.editor)
+        self.draw_window()
+        with patch('pygame.display.update'):
+            self.blink()
+        self.editor.insert_char("x")
+        self.assertTrue(self.editor.cursor_visible)
+        self.assertTrue(self.window.needs_draw)
+
+    def test_removed_editor_stops_blinking(self):
+        self.window.add_widget(self.editor)
+        self.draw_window()
+        self.window.remove_widget(self.editor)
+        self.blink()
+        self.assertIsNone(self.editor.next_blink)
+
+    def test_hidden_editor_is_not_repainted(self):
+        self.window.add_widget(self.editor)
+        self.draw_window()
+        modal = ColorRect((255, 0, 0), Size(10, 10))
+        modal.modal = True
+        self.window.add_widget(modal)
+        with patch('pygame.display.update') as update:
+            self.blink()
+        update.assert_not_called()
+
+    def test_blink_inside_composed_container_redraws_it(self):
+        stack = Stack()
+        stack.add_child(self.editor)
+        self.window.add_widget(stack)
+        self.draw_window()
+        with patch('pygame.display.update') as update:
+            self.blink()
+        update.assert_not_called()
+        self.assertTrue(self.window.needs_draw)
+        self.assertIsNone(stack.image.image)
+
+    def test_blink_inside_box_repaints_directly(self):
+        box = VBox(expand=Expand.BOTH)
+        self.editor.expand = Expand.BOTH
+        box.add_child(self.editor)
+        self.window.add_widget(box)
+        self.draw_window()
+        with patch('pygame.display.update') as update:
+            self.blink()
+        update.assert_called_once()
+        self.assertFalse(self.window.needs_draw)
+
+
+class TestLineCache(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.cache = LineCache(TextEditor().font, (0, 0, 0), size=2)
+
+    def test_hit(self):
+        first = self.cache.get("one")
+        self.assertIs(self.cache.get("one"), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_least_recently_used_evicted(self):
+        self.cache.get("one")
+        self.cache.get("two")
+        self.cache.get("one")
+        self.cache.get("three")
+        self.assertEqual(list(self.cache.lines), [("one", None), ("three", None)])
+
+    def test_long_lines_are_cut(self):
+        surface = self.cache.get("x" * MAX_RENDERED_CHARACTERS * 4)
+        self.assertEqual(surface.get_width(), self.cache.get("x" * MAX_RENDERED_CHARACTERS).get_width())
+
+    def test_tabs_are_expanded(self):
+        self.assertGreater(self.cache.get("\tx").get_width(), self.cache.get("x").get_width())
+
+
+def colors_in(surface: pygame.Surface) -> set:
+    """The colors of the pixels text was drawn on, ignoring antialiasing."""
+    return {tuple(surface.get_at((x, y)))[:3] for x in range(surface.get_width())
+            for y in range(surface.get_height()) if surface.get_at((x, y)).a > 0}
+
+
+class TestHighlighting(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.editor = TextEditor(lexer=PythonLexer())
+        self.editor.text.lines = [list("x = 1"), list("if x:"), list("    pass")]
+
+    def test_keywords_are_colored(self):
+        self.assertEqual(colors_in(self.editor.lines.get("if")), {SYNTAX_COLORS[TokenKind.KEYWORD]})
+        self.assertEqual(colors_in(self.editor.lines.get("value")), {(0, 0, 0)})
+
+    def test_same_text_in_a_string_is_cached_apart(self):
+        self.editor.lines.get("if")
+        self.editor.lines.get("if", '"""')
+        self.assertEqual(self.editor.lines.misses, 2)
+        self.assertEqual(colors_in(self.editor.lines.get("if", '"""')), {SYNTAX_COLORS[TokenKind.STRING]})
+
+    def test_colored_line_keeps_tab_stops(self):
+        plain = LineCache(self.editor.font, (0, 0, 0))
+        width = self.editor.lines.get("\tif\tx").get_width()
+        self.assertAlmostEqual(width, plain.get("\tif\tx").get_width(), delta=2)
+
+    def test_typing_updates_following_lines(self):
+        draw(self.editor)
+        self.editor.text.cursor = Position(0, 0)
+        for character in '"""':
+            self.editor.insert_char(character)
+        self.assertEqual(self.editor.line_state(1), '"""')
+        self.assertEqual(self.editor.line_state(2), '"""')
+        misses = self.editor.lines.misses
+        draw(self.editor)
+        # every line now draws as a string
+        self.assertEqual(self.editor.lines.misses, misses + 3)
+
+    def test_joining_lines_updates_states(self):
+        self.editor.text.lines = [list('"""'), [], list('x"""'), list("y")]
+        draw(self.editor)
+        self.editor.text.cursor = Position(0, 1)
+        self.editor.remove_char()
+        self.assertEqual([self.editor.line_state(y) for y in range(3)], [None, '"""', None])
+
+    def test_load_file_resets_states(self):
+        draw(self.editor)
+        self.editor.load_file(__file__)
+        self.assertEqual(self.editor.highlighter.states, [None])
@@ -96,6 +96,34 @@ class TestTextStore(unittest.TestCase):
         self.assertEqual(self.text_store.lines[0], ['x'])
         self.assertEqual(self.text_store.cursor.x, 1)
 
+    def test_line(self):
+        self.text_store.lines = [['a', 'b'], [], ['c']]
+        self.assertEqual(self.text_store.line(0), 'ab')
+        self.assertEqual(self.text_store.line(1), '')
+        self.assertEqual(self.text_store.line(2), 'c')
+        self.assertEqual(self.text_store.line_count, 3)
+
+    def test_line_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.text_store.line(1)
+        with self.assertRaises(IndexError):
+            TextStore().insert_char('a')
+
+    def test_lines_from(self):
+        self.text_store.lines = [['a'], [], ['b', 'c']]
+        self.assertEqual(self.text_store.lines_from(0, 3), ['a', '', 'bc'])
+        self.assertEqual(self.text_store.lines_from(1, 10), ['', 'bc'])
+        self.assertEqual(self.text_store.lines_from(3, 2), [])
+
+    def test_edit_large_text(self):
+        """Test that edits deep into a large text only touch the lines edited."""
+        self.text_store.lines = [list(f'line {number}') for number in range(100000)]
+        self.text_store.cursor = Position(0, 60000)
+        self.text_store.remove_char()
+        self.assertEqual(self.text_store.line(59999), 'line 59999line 60000')
+        self.assertEqual(self.text_store.line(60000), 'line 60001')
+        self.assertEqual(self.text_store.line_count, 99999)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from pyui.timers import Timers
+
+
+class TestTimers(unittest.TestCase):
+    def setUp(self):
+        self.timers = Timers()
+
+    def test_no_timeout_when_empty(self):
+        self.assertIsNone(self.timers.next_timeout(0))
+
+    def test_timeout_to_next_deadline(self):
+        self.timers.wake_at(500)
+        self.timers.wake_at(200)
+        self.assertEqual(self.timers.next_timeout(100), 100)
+
+    def test_timeout_never_negative(self):
+        self.timers.wake_at(100)
+        self.assertEqual(self.timers.next_timeout(150), 0)
+
+    def test_duplicate_deadlines_are_merged(self):
+        self.timers.wake_at(100)
+        self.timers.wake_at(100)
+        self.assertEqual(len(self.timers.deadlines), 1)
+
+    def test_expire_removes_passed_deadlines(self):
+        self.timers.wake_at(100)
+        self.timers.wake_at(300)
+        self.assertTrue(self.timers.expire(200))
+        self.assertEqual(self.timers.deadlines, [300])
+
+    def test_expire_without_passed_deadlines(self):
+        self.timers.wake_at(300)
+        self.assertFalse(self.timers.expire(200))
+        self.assertEqual(self.timers.deadlines, [300])
+
+    def test_callback_runs_when_due(self):
+        calls = []
+        self.timers.call_at(100, lambda: calls.append(100))
+        self.assertFalse(self.timers.expire(50))
+        self.assertEqual(calls, [])
+        self.assertFalse(self.timers.expire(100))
+        self.assertEqual(calls, [100])
+        self.assertEqual(self.timers.calls, [])
+
+    def test_callbacks_run_in_order(self):
+        calls = []
+        self.timers.call_at(200, lambda: calls.append(200))
+        self.timers.call_at(100, lambda: calls.append(100))
+        self.timers.call_at(100, lambda: calls.append(101))
+        self.timers.expire(300)
+        self.assertEqual(calls, [100, 101, 200])
+
+    def test_timeout_includes_callbacks(self):
+        self.timers.wake_at(500)
+        self.timers.call_at(300, lambda: None)
+        self.assertEqual(self.timers.next_timeout(100), 200)
+
+    def test_clear_removes_callbacks(self):
+        self.timers.call_at(100, lambda: None)
+        self.timers.clear()
+        self.assertIsNone(self.timers.next_timeout(0))
@@ -2,7 +2,9 @@ import pygame
 
 from pyui.test_helper import PyuiTest
 from pyui.helpers import Size, Position
-from pyui.widgets import ColorRect
+from pyui.widgets import ColorRect, HBox, Stack, Label, Frame, NinePatchData
+from pyui.assets import get_font
+from pyui.window import Window
 
 
 class TestWidgetCaching(PyuiTest):
@@ -31,3 +33,129 @@ class TestWidgetCaching(PyuiTest):
         # The cached surface should be a different object
         self.assertNotEqual(widget.image.size, original_size)
         self.assertEqual(widget.image.size, Size(150, 150))
+
+
+class TestPaintInvalidation(PyuiTest):
+    def test_invalidate_paint_clears_cache(self):
+        widget = ColorRect(color=(255, 0, 0), size=Size(50, 50))
+        widget.render(self.mouse, pygame.Surface((100, 100)), Position(0, 0), Size(100, 100))
+        widget.invalidate_paint()
+        self.assertTrue(widget.paint_dirty)
+
+    def test_invalidate_paint_keeps_layout(self):
+        widget = ColorRect(color=(255, 0, 0), size=Size(50, 50))
+        widget.min_size
+        widget.invalidate_paint()
+        self.assertFalse(widget.layout_dirty)
+
+    def test_invalidate_paint_reaches_ancestors(self):
+        widget = ColorRect(color=(255, 0, 0), size=Size(50, 50))
+        box = HBox()
+        box.add_child(widget)
+        stack = Stack()
+        stack.add_child(box)
+        stack.image.update(pygame.Surface((10, 10)))
+        widget.invalidate_paint()
+        self.assertTrue(stack.paint_dirty)
+
+    def test_invalidate_layout_clears_cache(self):
+        widget = ColorRect(color=(255, 0, 0), size=Size(50, 50))
+        widget.render(self.mouse, pygame.Surface((100, 100)), Position(0, 0), Size(100, 100))
+        widget.invalidate_layout()
+        self.assertTrue(widget.layout_dirty)
+        self.assertTrue(widget.paint_dirty)
+
+    def test_background_change_invalidates_paint(self):
+        widget = ColorRect(color=(255, 0, 0), size=Size(50, 50))
+        widget.render(self.mouse, pygame.Surface((100, 100)), Position(0, 0), Size(100, 100))
+        widget.background = (0, 0, 255)
+        self.assertTrue(widget.paint_dirty)
+
+    def test_same_background_keeps_cache(self):
+        widget = ColorRect(color=(255, 0, 0), size=Size(50, 50), background=(0, 0, 255))
+        widget.render(self.mouse, pygame.Surface((100, 100)), Position(0, 0), Size(100, 100))
+        widget.background = (0, 0, 255)
+        self.assertFalse(widget.paint_dirty)
+
+    def test_label_same_size_text_keeps_layout(self):
+        label = Label("ab", get_font("creato.otf", 16))
+        label.min_size
+        label.set_text("ba")
+        self.assertFalse(label.layout_dirty)
+        self.assertTrue(label.paint_dirty)
+
+    def test_invalidation_reaches_window(self):
+        window = Window(Size(100, 100))
+        widget = ColorRect(color=(255, 0, 0), size=Size(50, 50))
+        box = Frame(widget, NinePatchData(top=1, bottom=1, left=1, right=1, image=pygame.Surface((3, 3))))
+        window.add_widget(box)
+        window.needs_draw = False
+        widget.invalidate_paint()
+        self.assertTrue(window.needs_draw)
+        window.clear_widgets()
+
+
+class CountingRect(ColorRect):
+    def __init__(self, **kwargs):
+        super().__init__(color=(255, 0, 0), size=Size(10, 10), **kwargs)
+        self.render_count = 0
+
+    def render(self, mouse, destination, position, size):
+        self.render_count += 1
+        super().render(mouse, destination, position, size)
+
+
+class ChangingRect(CountingRect):
+    draws_from_cache = False
+
+    def render(self, mouse, destination, position, size):
+        super().render(mouse, destination, position, size)
+        self.invalidate_paint()
+
+
+class TestCompositeCaching(PyuiTest):
+    def setUp(self):
+        super().setUp()
+        self.surface = pygame.Surface((100, 100))
+        self.patch_data = NinePatchData(top=1, bottom=1, left=1, right=1, image=pygame.Surface((3, 3)))
+
+    def render_times(self, widget, count):
+        for _ in range(count):
+            widget.render(self.mouse, self.surface, Position(0, 0), Size(100, 100))
+
+    def test_frame_does_not_rerender_child(self):
+        child = CountingRect()
+        self.render_times(Frame(child, self.patch_data), 3)
+        self.assertEqual(child.render_count, 1)
+
+    def test_stack_does_not_rerender_children(self):
+        child = CountingRect()
+        stack = Stack()
+        stack.add_child(child)
+        self.render_times(stack, 3)
+        self.assertEqual(child.render_count, 1)
+
+    def test_child_change_recomposes_frame(self):
+        child = CountingRect()
+        frame = Frame(child, self.patch_data)
+        self.render_times(frame, 1)
+        child.color = (0, 255, 0)
+        child.invalidate_paint()
+        self.render_times(frame, 1)
+        self.assertEqual(child.render_count, 2)
+        self.assertPixel(self.surface, Position(50, 50), (0, 255, 0))
+
+    def test_size_change_recomposes_stack(self):
+        child = CountingRect()
+        stack = Stack()
+        stack.add_child(child)
+        self.render_times(stack, 1)
+        stack.render(self.mouse, self.surface, Position(0, 0), Size(50, 50))
+        self.assertEqual(child.render_count, 2)
+
+    def test_invalidated_while_drawing_is_not_cached(self):
+        child = ChangingRect()
+        frame = Frame(child, self.patch_data)
+        self.render_times(frame, 3)
+        self.assertEqual(child.render_count, 3)
+        self.assertTrue(frame.paint_dirty)
@@ -1,8 +1,10 @@
+import pygame
 from unittest.mock import MagicMock, patch
 
 from pyui.test_helper import PyuiTest
 from pyui.window import Window
 from pyui.helpers import Mouse
+from pyui.timers import timers
 
 
 class TestMouseInteractions(PyuiTest):
@@ -59,3 +61,67 @@ class TestMouseInteractions(PyuiTest):
             
             # Verify clock was used with correct FPS
             mock_clock_instance.tick.assert_called_with(30)  # Using FRAMES_PER_SECOND constant
+
+
+class TestEventDrivenLoop(PyuiTest):
+    def setUp(self):
+        self.window = Window.default()
+        self.window.event_driven = True
+        self.call_order = []
+        self.window.draw = lambda: self.call_order.append('draw')
+
+    def tearDown(self):
+        self.window.running = False
+        timers.clear()
+
+    def run_once(self, event_type):
+        def mock_handle_events():
+            self.call_order.append('handle_events')
+            return False
+
+        self.window.handle_events = mock_handle_events
+        with patch('pygame.event.wait', return_value=pygame.event.Event(event_type)), \
+             patch('pygame.quit'):
+            self.window.run()
+
+    def test_idle_frame_is_not_drawn(self):
+        self.run_once(pygame.NOEVENT)
+        self.assertEqual(self.call_order, ['draw', 'handle_events'])
+
+    def test_input_frame_is_drawn(self):
+        self.run_once(pygame.MOUSEMOTION)
+        self.assertEqual(self.call_order, ['draw', 'handle_events', 'draw'])
+
+    def test_waited_event_is_handled(self):
+        self.window.needs_draw = False
+        event = pygame.event.Event(pygame.QUIT)
+        with patch('pygame.event.wait', return_value=event):
+            self.window.wait_for_activity()
+        with patch('pygame.event.get', return_value=[]):
+            self.assertFalse(self.window.handle_events())
+
+    def test_redraw_request_is_drawn(self):
+        self.window.needs_draw = False
+        self.window.request_draw()
+        self.window.draw_frame()
+        self.assertEqual(self.call_order, ['draw'])
+
+    def test_does_not_wait_with_redraw_pending(self):
+        self.window.request_draw()
+        with patch('pygame.event.wait') as wait:
+            self.window.wait_for_activity()
+        wait.assert_not_called()
+
+    def test_waits_until_next_timer(self):
+        self.window.needs_draw = False
+        timers.wake_at(pygame.time.get_ticks() + 1000)
+        with patch('pygame.event.wait', return_value=pygame.event.Event(pygame.NOEVENT)) as wait:
+            self.window.wait_for_activity()
+        self.assertLessEqual(wait.call_args[0][0], 1000)
+
+    def test_expired_timer_is_drawn(self):
+        self.window.needs_draw = False
+        timers.wake_at(0)
+        with patch('pygame.event.wait', return_value=pygame.event.Event(pygame.NOEVENT)):
+            self.window.wait_for_activity()
+        self.assertTrue(self.window.needs_draw)